@@ -0,0 +1,86 @@
+from typing import Any, Callable, Dict, List
+
+import copy
+import gzip
+import json
+import os
+import tracemalloc
+
+import yaml
+
+CASSETTES = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "cassettes", "test_farcaster"
+)
+
+
+def cassette_path(name: str) -> str:
+    return os.path.join(CASSETTES, f"{name}.yaml")
+
+
+def load_pages(name: str) -> List[bytes]:
+    """Load the raw response bodies recorded in a cassette.
+
+    Args:
+        name: The name of the cassette, without extension
+
+    Returns:
+        List[bytes]: the decompressed response bodies, in recording order
+    """
+    with open(cassette_path(name)) as f:
+        cassette = yaml.safe_load(f)
+    pages = []
+    for interaction in cassette["interactions"]:
+        body = interaction["response"]["body"]["string"]
+        if isinstance(body, str):
+            body = body.encode()
+        if body[:2] == b"\x1f\x8b":
+            body = gzip.decompress(body)
+        pages.append(body)
+    return pages
+
+
+def synthetic_page(page: bytes, attribute: str, size: int) -> bytes:
+    """Grow a recorded page to ``size`` items by repeating them with distinct keys.
+
+    Args:
+        page: A recorded response body
+        attribute: The attribute of ``result`` holding the items
+        size: The number of items of the synthetic page
+
+    Returns:
+        bytes: the synthetic response body
+    """
+    response = json.loads(page)
+    items: List[Dict[str, Any]] = response["result"][attribute]
+    grown = []
+    for i in range(size):
+        item = copy.deepcopy(items[i % len(items)])
+        if "hash" in item:
+            item["hash"] = f"0x{i:064x}"
+        elif "id" in item:
+            item["id"] = f"{i:032x}"
+        elif "fid" in item:
+            item["fid"] = i + 1
+        grown.append(item)
+    response["result"][attribute] = grown
+    return json.dumps(response).encode()
+
+
+def record_allocations(benchmark: Any, function: Callable[[], Any]) -> None:
+    """Run ``function`` once under tracemalloc and attach its allocations to the report.
+
+    Args:
+        benchmark: The pytest-benchmark fixture
+        function: The benchmarked function
+    """
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        blocks = sum(
+            stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+        )
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_kib"] = round(peak / 1024, 1)
+    benchmark.extra_info["live_blocks"] = blocks
@@ -0,0 +1,37 @@
+from typing import Any, Callable, List
+
+import pytest
+
+from farcaster.utils.dedup import BloomWindow, RingSet
+from farcaster.utils.stream_generator import BoundedSet
+
+pytest.importorskip("pytest_benchmark")
+
+WINDOW = 100_000
+PAGE = 50
+
+STRUCTURES = {
+    "bounded_set": lambda: BoundedSet(WINDOW),
+    "ring_set": lambda: RingSet(WINDOW),
+    "bloom_window": lambda: BloomWindow(WINDOW, error_rate=1e-6),
+}
+
+
+@pytest.fixture(scope="module")
+def hashes() -> List[str]:
+    return [f"0x{i:040x}" for i in range(2 * WINDOW)]
+
+
+def poll(seen: Any, hashes: List[str]) -> None:
+    # every page overlaps with the previous one, like a stream polled twice as often
+    for start in range(0, len(hashes) - PAGE, PAGE // 2):
+        for item in hashes[start : start + PAGE]:
+            if item not in seen:
+                seen.add(item)
+
+
+@pytest.mark.parametrize("name", list(STRUCTURES))
+def test_dedup(benchmark: Any, hashes: List[str], name: str) -> None:
+    """Check and add the hashes of overlapping pages over twice the window"""
+    make: Callable[[], Any] = STRUCTURES[name]
+    benchmark.pedantic(lambda: poll(make(), hashes), rounds=3)
@@ -0,0 +1,51 @@
+from typing import Any, List
+
+import heapq
+
+import pytest
+from replay import load_pages, synthetic_page
+
+from farcaster.models import CastsGetResponse
+from farcaster.utils.fast_json import validate_json
+from farcaster.utils.metrics import DEFAULT_WEIGHTS, CastMetrics
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("numpy")
+
+CASTS = 100_000
+TOP = 100
+
+
+@pytest.fixture(scope="module")
+def casts() -> List[Any]:
+    page = synthetic_page(load_pages("test_get_casts")[0], "casts", CASTS)
+    return validate_json(CastsGetResponse, page).result.casts
+
+
+def score_loop(casts: List[Any]) -> List[Any]:
+    def score(cast: Any) -> float:
+        total: float = sum(
+            weight * getattr(cast, name).count
+            for name, weight in DEFAULT_WEIGHTS.items()
+        )
+        return total
+
+    return heapq.nlargest(TOP, casts, key=score)
+
+
+def test_score_loop(benchmark: Any, casts: List[Any]) -> None:
+    """Score casts and select the top ones with a Python loop, as a baseline"""
+    assert len(benchmark(score_loop, casts)) == TOP
+
+
+def test_score_vectorized(benchmark: Any, casts: List[Any]) -> None:
+    """Extract the engagement arrays once, then score and select the top casts"""
+    assert len(benchmark(lambda: CastMetrics(casts).top_k(TOP))) == TOP
+
+
+def test_rescore_vectorized(benchmark: Any, casts: List[Any]) -> None:
+    """Score and select the top casts again over arrays extracted already"""
+    metrics = CastMetrics(casts)
+    assert (
+        len(benchmark(lambda: metrics.top_k(TOP, metrics.score(half_life=3600)))) == TOP
+    )
@@ -0,0 +1,74 @@
+from typing import Any, Dict, Tuple, Type
+
+import pytest
+from replay import load_pages, record_allocations, synthetic_page
+
+from farcaster import records
+from farcaster.models import (
+    BaseModel,
+    CastsGetResponse,
+    FollowersGetResponse,
+    MentionAndReplyNotificationsGetResponse,
+)
+from farcaster.utils.fast_json import loads, validate_json
+
+pytest.importorskip("pytest_benchmark")
+
+SYNTHETIC_SIZE = 1_000
+
+MODELS: Dict[str, Tuple[Type[BaseModel], str, str]] = {
+    "casts": (CastsGetResponse, "test_get_casts", "casts"),
+    "followers": (FollowersGetResponse, "test_get_all_followers", "users"),
+    "notifications": (
+        MentionAndReplyNotificationsGetResponse,
+        "test_stream_notifications",
+        "notifications",
+    ),
+}
+
+
+def page_of(name: str, synthetic: bool) -> bytes:
+    _, cassette, attribute = MODELS[name]
+    page = load_pages(cassette)[0]
+    return synthetic_page(page, attribute, SYNTHETIC_SIZE) if synthetic else page
+
+
+def parse_dict(model: Type[BaseModel], page: bytes) -> BaseModel:
+    return model(**loads(page))
+
+
+def parse_record(model: Type[BaseModel], page: bytes) -> Any:
+    return records.from_json(model, loads(page))
+
+
+@pytest.mark.parametrize("synthetic", [False, True], ids=["recorded", "synthetic"])
+@pytest.mark.parametrize("name", list(MODELS))
+def test_parse_dict(benchmark: Any, name: str, synthetic: bool) -> None:
+    """Decode a page to a dict, then validate it"""
+    model, _, attribute = MODELS[name]
+    page = page_of(name, synthetic)
+    result = benchmark(parse_dict, model, page)
+    benchmark.extra_info["items"] = len(getattr(result.result, attribute))
+    record_allocations(benchmark, lambda: parse_dict(model, page))
+
+
+@pytest.mark.parametrize("synthetic", [False, True], ids=["recorded", "synthetic"])
+@pytest.mark.parametrize("name", list(MODELS))
+def test_parse_json(benchmark: Any, name: str, synthetic: bool) -> None:
+    """Validate the raw bytes of a page straight into its model"""
+    model, _, attribute = MODELS[name]
+    page = page_of(name, synthetic)
+    result = benchmark(validate_json, model, page)
+    benchmark.extra_info["items"] = len(getattr(result.result, attribute))
+    record_allocations(benchmark, lambda: validate_json(model, page))
+
+
+@pytest.mark.parametrize("synthetic", [False, True], ids=["recorded", "synthetic"])
+@pytest.mark.parametrize("name", list(MODELS))
+def test_parse_record(benchmark: Any, name: str, synthetic: bool) -> None:
+    """Decode a page and build it into compact records, without validation"""
+    model, _, attribute = MODELS[name]
+    page = page_of(name, synthetic)
+    result = benchmark(parse_record, model, page)
+    benchmark.extra_info["items"] = len(getattr(result.result, attribute))
+    record_allocations(benchmark, lambda: parse_record(model, page))
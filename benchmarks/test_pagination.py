@@ -0,0 +1,90 @@
+from typing import Any, List, Optional, Tuple
+
+import itertools
+import os
+
+import pytest
+import vcr
+from replay import cassette_path, load_pages, record_allocations, synthetic_page
+
+from farcaster import Warpcast
+from farcaster.models import ApiCast, CastsGetResponse
+from farcaster.utils.fast_json import validate_json
+from farcaster.utils.pagination import PageIterator
+from farcaster.utils.stream_generator import stream_generator
+
+pytest.importorskip("pytest_benchmark")
+
+PAGES = 20
+PAGE_SIZE = 100
+STREAM_ITEMS = 5_000
+NEW_PER_POLL = 10
+
+
+@pytest.fixture(scope="module")
+def casts_pages() -> List[bytes]:
+    page = load_pages("test_get_casts")[0]
+    return [synthetic_page(page, "casts", PAGE_SIZE)] * PAGES
+
+
+def test_page_iterator(benchmark: Any, casts_pages: List[bytes]) -> None:
+    """Walk synthetic pages of casts, validating each one"""
+
+    def fetch(cursor: Optional[str]) -> Tuple[CastsGetResponse, Optional[str]]:
+        index = int(cursor or 0)
+        page = validate_json(CastsGetResponse, casts_pages[index])
+        return page, str(index + 1) if index + 1 < len(casts_pages) else None
+
+    def walk() -> int:
+        return sum(1 for _ in PageIterator(fetch, parse=lambda page: page.result.casts))
+
+    assert benchmark(walk) == PAGES * PAGE_SIZE
+    benchmark.extra_info["items"] = PAGES * PAGE_SIZE
+    record_allocations(benchmark, walk)
+
+
+def test_stream_generator(benchmark: Any) -> None:
+    """Stream a feed that gets ``NEW_PER_POLL`` new casts between polls"""
+    page = synthetic_page(load_pages("test_get_casts")[0], "casts", STREAM_ITEMS)
+    # newest first, like the API
+    feed = list(reversed(validate_json(CastsGetResponse, page).result.casts))
+
+    def stream() -> int:
+        polls = itertools.count()
+
+        def poll(cursor: Optional[str], limit: int) -> List[ApiCast]:
+            end = min(next(polls) * NEW_PER_POLL + limit, len(feed))
+            return feed[max(end - limit, 0) : end][::-1]
+
+        count = 0
+        for cast in stream_generator(poll, pause_after=-1, limit=50):
+            if cast is None:
+                if count >= len(feed):
+                    break
+                continue
+            count += 1
+        return count
+
+    benchmark.extra_info["items"] = benchmark(stream)
+    record_allocations(benchmark, stream)
+
+
+@pytest.mark.parametrize("validate_json", [True, False], ids=["bytes", "dict"])
+def test_get_all_followers(benchmark: Any, validate_json: bool) -> None:
+    """Replay the recorded walk over every follower through the client"""
+    client = Warpcast(
+        access_token=os.getenv("AUTH", "dummy"), validate_json=validate_json
+    )
+    cassette = vcr.use_cassette(
+        cassette_path("test_get_all_followers"),
+        record_mode="none",
+        allow_playback_repeats=True,
+        match_on=["method", "scheme", "host", "port", "path", "query"],
+    )
+
+    def walk() -> int:
+        with cassette:
+            return len(client.get_all_followers(fid=50).users)
+
+    benchmark.extra_info["items"] = benchmark(walk)
+    record_allocations(benchmark, walk)
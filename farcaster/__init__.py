@@ -2,6 +2,7 @@
 
 import sys
 
+from .async_client import AsyncWarpcast  # noqa
 from .client import Warpcast  # noqa
 
 if sys.version_info >= (3, 8):
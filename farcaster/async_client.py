@@ -0,0 +1,1754 @@
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import asyncio
+import logging
+import time
+
+from eth_account.signers.local import LocalAccount
+from pydantic import PositiveInt
+from urllib3.util import Retry
+
+from farcaster.client import (
+    generate_custody_auth_header,
+    get_wallet,
+    now_ms,
+    user_lookups,
+)
+from farcaster.config import *
+from farcaster.models import *
+from farcaster.utils.cache import ResponseCache, cache_key
+from farcaster.utils.concurrency import async_fan_out
+from farcaster.utils.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    request_timeouts,
+    within,
+)
+from farcaster.utils.fast_json import loads
+from farcaster.utils.interning import UserInterner, current_interner, interning
+from farcaster.utils.pagination import AsyncPageIterator
+from farcaster.utils.rate_limit import AdaptiveRateLimiter, _header_seconds
+from farcaster.utils.response_mode import (
+    build_result,
+    current_response_mode,
+    parse_response,
+)
+from farcaster.utils.singleflight import AsyncSingleFlight
+from farcaster.utils.stream_generator import (
+    StreamBatch,
+    async_batch_stream_generator,
+    async_stream_generator,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore
+
+RETRY_STATUSES = (520, 413, 429, 503)
+
+
+def _retry_after(method: str, response: "httpx.Response") -> Optional[float]:
+    """Get the seconds to wait before retrying a request, ``None`` to not retry it.
+
+    Like the urllib3 ``Retry`` of :class:`~farcaster.client.Warpcast`, idempotent
+    methods are retried on ``RETRY_STATUSES`` and other methods, such as posting a
+    cast, only when the server asks for it with a ``Retry-After`` header.
+
+    Args:
+        method: The HTTP method of the request
+        response: The response to the request
+
+    Returns:
+        Optional[float]: the ``Retry-After`` of the response, 0 without one
+    """
+    status = response.status_code
+    retry_after = _header_seconds(response.headers.get("retry-after"), time.time())
+    if status in RETRY_STATUSES and method.upper() in Retry.DEFAULT_ALLOWED_METHODS:
+        return retry_after or 0.0
+    if status in Retry.RETRY_AFTER_STATUS_CODES and retry_after is not None:
+        return retry_after
+    return None
+
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class AsyncWarpcast:
+    """The AsyncWarpcast class is an asyncio wrapper around the Farcaster API.
+    It mirrors the public methods of :class:`farcaster.client.Warpcast` as coroutines
+    and runs on a pooled ``httpx.AsyncClient``, so many requests can be in flight at
+    once. Pydantic models are used under the hood to validate the data returned from
+    the API.
+
+    Authentication with a wallet happens lazily on the first request. The client
+    should be closed with ``aclose`` or used as an async context manager.
+    """
+
+    config: ConfigurationParams
+    wallet: Optional[LocalAccount]
+    access_token: Optional[str]
+    expires_at: Optional[PositiveInt]
+    rotation_duration: PositiveInt
+    cache: Optional[ResponseCache]
+    rate_limiter: Optional[AdaptiveRateLimiter]
+    interner: Optional[UserInterner]
+    session: "httpx.AsyncClient"
+
+    def __init__(
+        self,
+        mnemonic: Optional[str] = None,
+        private_key: Optional[str] = None,
+        access_token: Optional[str] = None,
+        expires_at: Optional[PositiveInt] = None,
+        rotation_duration: PositiveInt = 10,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        interner: Optional[UserInterner] = None,
+        **data: Any,
+    ):
+        if httpx is None:  # pragma: no cover
+            raise ImportError(
+                "AsyncWarpcast requires httpx, "
+                "install it with `pip install farcaster[async]`"
+            )
+        self.config = ConfigurationParams(**data)
+        self.wallet = get_wallet(mnemonic, private_key)
+        self.access_token = access_token
+        self.expires_at = expires_at
+        self.rotation_duration = rotation_duration
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.interner = interner
+        self._flights: AsyncSingleFlight[Dict[Any, Any]] = AsyncSingleFlight()
+        self._raw_flights: AsyncSingleFlight[bytes] = AsyncSingleFlight()
+        # sized like the pools of Warpcast: pool_maxsize connections are kept alive
+        # and, with pool_block, no more than pool_maxsize per pool are opened
+        config = self.config
+        self.session = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=(
+                    config.pool_connections * config.pool_maxsize
+                    if config.pool_block
+                    else None
+                ),
+                max_keepalive_connections=config.pool_maxsize
+                if config.keep_alive
+                else 0,
+            ),
+            timeout=httpx.Timeout(
+                config.read_timeout,
+                connect=config.connect_timeout,
+                pool=config.pool_timeout,
+            ),
+        )
+        # created in the running loop, before Python 3.10 a lock binds to the loop
+        # current at its creation
+        self._auth_lock: Optional[asyncio.Lock] = None
+        if self.access_token:
+            self.session.headers.update(
+                {"Authorization": f"Bearer {self.access_token}"}
+            )
+            if not self.expires_at:
+                self.expires_at = 33228645430000  # 3000-01-01
+        elif not self.wallet:
+            raise Exception("No wallet or access token provided")
+
+    async def __aenter__(self) -> "AsyncWarpcast":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool"""
+        await self.session.aclose()
+
+    def get_base_path(self):
+        return self.config.base_path
+
+    def get_base_options(self):
+        return self.config.base_options
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> "httpx.Response":
+        # httpx encodes None as an empty value while requests drops the key
+        params = {key: value for key, value in params.items() if value is not None}
+        limiter = self.rate_limiter
+        deadline = Deadline.current()
+        for attempt in range(3):
+            if limiter is not None:
+                delay = limiter.reserve(path)
+                if deadline is not None:
+                    deadline.wait(delay)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            connect, read = request_timeouts(
+                self.config.connect_timeout, self.config.read_timeout
+            )
+            try:
+                response = await self.session.request(
+                    method,
+                    self.config.base_path + path,
+                    params=params,
+                    json=json,
+                    headers=headers,
+                    timeout=httpx.Timeout(read, connect=connect),
+                )
+            except httpx.TimeoutException as e:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded(f"{method} {path} timed out") from e
+                raise
+            if limiter is not None:
+                limiter.update(path, response.status_code, response.headers)
+            retry_after = _retry_after(method, response)
+            if retry_after is None or attempt == 2:
+                break
+            # the rate limiter already delays the retry of a 429
+            if limiter is None or response.status_code != 429:
+                backoff = max(2**attempt, retry_after)
+                if deadline is not None:
+                    deadline.wait(backoff)
+                await asyncio.sleep(backoff)
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> Dict[Any, Any]:
+        response: Dict[Any, Any] = loads(
+            await self._send_raw(method, path, params, json, headers)
+        )
+        if "errors" in response:
+            raise Exception(response["errors"])  # pragma: no cover
+        return response
+
+    async def _send_raw(
+        self,
+        method: str,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> bytes:
+        await self._check_auth_header()
+        logging.debug(f"{method} {path} {params} {json} {headers}")
+        response = await self._request(
+            method, path, params=params, json=json, headers=headers
+        )
+        return response.content
+
+    async def _get_model(
+        self,
+        path: str,
+        response_model: Type[M],
+        params: Dict[Any, Any] = {},
+    ) -> M:
+        """GET an endpoint and validate the response into its model
+
+        With ``validate_json``, the raw response bytes are handed straight to
+        ``model_validate_json``, skipping the intermediate dict. Cached endpoints
+        still go through ``_get``, the cache stores decoded responses. The response
+        mode can skip validation altogether, see :meth:`_parse`.
+
+        Args:
+            path (str): endpoint path
+            response_model (Type[M]): model of the response
+            params (Dict[Any, Any], optional): query parameters, defaults to {}
+
+        Returns:
+            M: the parsed response
+        """
+        if not self.config.validate_json or (
+            self.cache is not None and self.cache.caches(path)
+        ):
+            return self._parse(response_model, await self._get(path, params))
+
+        async def fetch() -> bytes:
+            return await self._send_raw("GET", path, params)
+
+        if self.config.coalesce_requests:
+            content = await self._raw_flights.do(cache_key(path, params), fetch)
+        else:
+            content = await fetch()
+        return self._parse(response_model, content)
+
+    def _parse(self, response_model: Type[M], response: Any) -> M:
+        """Parse a response in the current response mode
+
+        ``validate`` validates it into ``response_model``, ``construct`` builds the
+        model without validation and ``raw`` returns the decoded JSON as a
+        :class:`~farcaster.utils.response_mode.RawDict`. The mode comes from
+        :func:`~farcaster.utils.response_mode.response_mode` for the call, otherwise
+        from the ``response_mode`` of the client. Users are interned by the
+        interner of the call, see :func:`~farcaster.utils.interning.interning`,
+        otherwise by the one of the client.
+
+        Args:
+            response_model (Type[M]): model of the response
+            response (Any): raw JSON response or the decoded one
+
+        Returns:
+            M: the parsed response
+        """
+        mode = current_response_mode(self.config.response_mode)
+        if self.interner is None or current_interner() is not None:
+            return parse_response(response_model, response, mode)
+        with interning(self.interner):
+            return parse_response(response_model, response, mode)
+
+    def _result(self, model: Type[M], **fields: Any) -> M:
+        """Build a result model from parsed items in the current response mode
+
+        Args:
+            model (Type[M]): result model
+            fields (Any): fields of the result
+
+        Returns:
+            M: the result
+        """
+        return build_result(
+            model, current_response_mode(self.config.response_mode), **fields
+        )
+
+    async def _get(
+        self,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> Dict[Any, Any]:
+        cache = self.cache
+        if cache is not None and not cache.caches(path):
+            cache = None
+        # caches may block on disk or a network, they are read and written off the loop
+        if cache is not None:
+            hit = await asyncio.to_thread(cache.get, path, params)
+            if hit is not None:
+                return hit
+
+        async def fetch() -> Dict[Any, Any]:
+            response = await self._send("GET", path, params, json, headers)
+            if cache is not None:
+                await asyncio.to_thread(cache.set, path, params, response)
+            return response
+
+        # identical concurrent GETs share a single round-trip
+        if self.config.coalesce_requests and not json and not headers:
+            return await self._flights.do(cache_key(path, params), fetch)
+        return await fetch()
+
+    async def _post(
+        self,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> Dict[Any, Any]:
+        return await self._send("POST", path, params, json, headers)
+
+    async def _put(
+        self,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> Dict[Any, Any]:
+        return await self._send("PUT", path, params, json, headers)
+
+    async def _delete(
+        self,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> Dict[Any, Any]:
+        return await self._send("DELETE", path, params, json, headers)
+
+    async def _check_auth_header(self):
+        if self.expires_at and self.expires_at >= now_ms() + 1000:
+            return
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            # another task may have rotated the token while we were waiting
+            if not self.expires_at or self.expires_at < now_ms() + 1000:
+                await self.create_new_auth_token(expires_in=self.rotation_duration)
+
+    def _paginate(
+        self,
+        path: str,
+        params: Dict[Any, Any],
+        response_model: Type[BaseModel],
+        attribute: str,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[Any]:
+        """Lazily walk a paginated endpoint by following the next cursors
+
+        Args:
+            path (str): endpoint path
+            params (Dict[Any, Any]): query parameters, without cursor and limit
+            response_model (Type[BaseModel]): model of a page of the endpoint
+            attribute (str): attribute of the page result holding the items
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): items per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[Any]: async iterator over the items of the endpoint
+        """
+
+        async def fetch(cursor: Optional[str]) -> Tuple[Any, Optional[str]]:
+            page: Any = await self._get_model(
+                path,
+                response_model,
+                params={**params, "cursor": cursor, "limit": page_size},
+            )
+            return page, page.next.cursor if page.next else None
+
+        def parse(page: Any) -> List[Any]:
+            return getattr(page.result, attribute) or []
+
+        return AsyncPageIterator(fetch, cursor, parse, prefetch)
+
+    async def get_healthcheck(self) -> bool:
+        """Check if API is up and running
+
+        Returns:
+            bool: Status of the API
+        """
+        response = await self.session.get("https://api.warpcast.com/healthcheck")
+        return response.is_success
+
+    async def get_asset(self, token_id: int) -> AssetResult:
+        """Get asset information
+
+        Args:
+            token_id (int): token ID
+
+        Returns:
+            AssetResult: token information
+        """
+        response = await self._get_model(
+            "asset", AssetGetResponse, {"token_id": token_id}
+        )
+        return response.result
+
+    async def get_asset_events(
+        self,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+    ) -> IterableEventsResult:
+        """Get events for a given asset
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): events to receive, defaults
+                to 25
+
+        Returns:
+            IterableEventsResult: Returns the EventsResult model with an optional cursor
+        """
+        response = await self._get_model(
+            "asset-events",
+            AssetEventsGetResponse,
+            params={"cursor": cursor, "limit": limit},
+        )
+        return self._result(
+            IterableEventsResult,
+            events=response.result.events,
+            cursor=getattr(response.next, "cursor", None),
+        )
+
+    def iter_asset_events(
+        self,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiAssetEvent]:
+        """Lazily iterate over asset events page by page
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): events per request, defaults to 25
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiAssetEvent]: iterator over the events with the resume cursor
+        """
+        return self._paginate(
+            "asset-events",
+            {},
+            AssetEventsGetResponse,
+            "events",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def put_auth(self, auth_params: AuthParams) -> TokenResult:
+        """Generate a custody bearer token and use it to generate an access token
+
+        Args:
+            auth_params (AuthParams): authorization parameters
+
+        Returns:
+            TokenResult: the new access token
+        """
+        header = self.generate_custody_auth_header(auth_params)
+        body = AuthPutRequest(params=auth_params)
+        response = (
+            await self._request(
+                "PUT",
+                "auth",
+                json=body.model_dump(by_alias=True, exclude_none=True),
+                headers={"Authorization": header},
+            )
+        ).json()
+        return self._parse(AuthPutResponse, response).result
+
+    async def delete_auth(self) -> StatusContent:
+        """Delete an access token
+
+        Returns:
+            StatusContent: Status of the deletion
+        """
+        timestamp = now_ms()
+        body = AuthDeleteRequest(params=Timestamp(timestamp=timestamp))
+        response = await self._delete(
+            "auth",
+            json=body.model_dump(by_alias=True, exclude_none=True),
+        )
+        return self._parse(StatusResponse, response).result
+
+    def iter_cast_likes(
+        self,
+        cast_hash: str,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiCastReaction]:
+        """Lazily iterate over the likes for a given cast page by page
+
+        Args:
+            cast_hash (str): cast hash
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): likes per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiCastReaction]: iterator over the likes with the resume cursor
+        """
+        return self._paginate(
+            "cast-likes",
+            {"castHash": cast_hash},
+            CastReactionsGetResponse,
+            "likes",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_cast_likes(
+        self,
+        cast_hash: str,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableReactionsResult:
+        """Get the likes for a given cast
+
+        Args:
+            cast_hash (str): cast hash
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableReactionsResult: Model containing the likes with an optional cursor
+        """
+        async with self.iter_cast_likes(
+            cast_hash, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableReactionsResult,
+                likes=await pages.take(limit),
+                cursor=pages.cursor,
+            )
+
+    async def like_cast(self, cast_hash: str) -> ReactionsPutResult:
+        """Like a given cast
+
+        Args:
+            cast_hash (str): hash of the cast to like
+
+        Returns:
+            ReactionsPutResult: Result of liking the cast
+        """
+        body = CastHash(cast_hash=cast_hash)
+        response = await self._put(
+            "cast-likes",
+            json=body.model_dump(by_alias=True, exclude_none=True),
+        )
+        return self._parse(CastReactionsPutResponse, response).result
+
+    async def delete_cast_likes(self, cast_hash: str) -> StatusContent:
+        """Remove a like from a cast
+
+        Args:
+            cast_hash (str): hash of the cast to unlike
+
+        Returns:
+            StatusContent: Status of the deletion
+        """
+        body = CastHash(cast_hash=cast_hash)
+        response = await self._delete(
+            "cast-likes",
+            json=body.model_dump(by_alias=True, exclude_none=True),
+        )
+        return self._parse(StatusResponse, response).result
+
+    def iter_cast_recasters(
+        self,
+        cast_hash: str,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiUser]:
+        """Lazily iterate over the recasters for a given cast page by page
+
+        Args:
+            cast_hash (str): cast hash
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): recasters per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiUser]: iterator over the recasters with the resume cursor
+        """
+        return self._paginate(
+            "cast-recasters",
+            {"castHash": cast_hash},
+            CastRecastersGetResponse,
+            "users",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_cast_recasters(
+        self,
+        cast_hash: str,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableUsersResult:
+        """Get the recasters for a given cast
+
+        Args:
+            cast_hash (str): cast hash
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableUsersResult: Model containing the recasters with an optional cursor
+        """
+        async with self.iter_cast_recasters(
+            cast_hash, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=await pages.take(limit), cursor=pages.cursor
+            )
+
+    async def get_cast(
+        self,
+        hash: str,
+    ) -> CastContent:
+        """Get a specific cast
+
+        Args:
+            hash (str): cast hash
+
+        Returns:
+            CastContent: The cast content
+        """
+        response = await self._get_model("cast", CastGetResponse, params={"hash": hash})
+        return response.result
+
+    async def get_all_casts_in_thread(
+        self,
+        thread_hash: str,
+    ) -> CastsResult:
+        """Get all casts in a thread
+
+        Args:
+            thread_hash (str): hash of the thread
+
+        Returns:
+            CastsResult: Model containing the casts
+        """
+        response = await self._get_model(
+            "all-casts-in-thread", CastsGetResponse, params={"threadHash": thread_hash}
+        )
+        return response.result
+
+    def iter_casts(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiCast]:
+        """Lazily iterate over the casts for a given fid of a user page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): casts per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiCast]: iterator over the casts with the resume cursor
+        """
+        return self._paginate(
+            "casts",
+            {"fid": fid},
+            CastsGetResponse,
+            "casts",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_casts(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableCastsResult:
+        """Get the casts for a given fid of a user
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableCastsResult: Model containing the casts with an optional cursor
+        """
+        async with self.iter_casts(
+            fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableCastsResult, casts=await pages.take(limit), cursor=pages.cursor
+            )
+
+    async def post_cast(
+        self,
+        text: str,
+        embeds: Optional[List[str]] = None,
+        parent: Optional[Parent] = None,
+        channel_key: Optional[str] = None,
+    ) -> CastContent:
+        """Post a cast to Farcaster
+
+        Args:
+            text (str): text of the cast
+            embeds (Optional[List[str]], optional): list of embeds, defaults to None
+            parent (Optional[Parent], optional): parent of the cast, defaults to None
+            channel_key (Optional[str], optional): channel of the cast, defaults to None
+
+        Returns:
+            CastContent: The result of posting the cast
+        """
+        body = CastsPostRequest(
+            text=text, embeds=embeds, parent=parent, channel_key=channel_key
+        )
+        response = await self._post(
+            "casts",
+            json=body.model_dump(by_alias=True, exclude_none=True),
+        )
+        return self._parse(CastsPostResponse, response).result
+
+    async def delete_cast(self, cast_hash: str) -> StatusContent:
+        """Delete a cast
+
+        Args:
+            cast_hash (str): the hash of the cast to delete
+
+        Returns:
+            StatusContent: Status of the deletion
+        """
+        body = CastHash(cast_hash=cast_hash)
+        response = await self._delete(
+            "casts",
+            json=body.model_dump(by_alias=True, exclude_none=True),
+        )
+        return self._parse(StatusResponse, response).result
+
+    def iter_collection_owners(
+        self,
+        collection_id: str,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiUser]:
+        """Lazily iterate over the owners of an OpenSea collection page by page
+
+        Args:
+            collection_id (str): OpenSea collection ID
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): owners per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiUser]: iterator over the owners with the resume cursor
+        """
+        return self._paginate(
+            "collection-owners",
+            {"collectionId": collection_id},
+            CollectionOwnersGetResponse,
+            "users",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_collection_owners(
+        self,
+        collection_id: str,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableUsersResult:
+        """Get the owners of an OpenSea collection
+
+        Args:
+            collection_id (str): OpenSea collection ID
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableUsersResult: model containing users with an optional cursor
+        """
+        async with self.iter_collection_owners(
+            collection_id, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=await pages.take(limit), cursor=pages.cursor
+            )
+
+    def iter_followers(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiUser]:
+        """Lazily iterate over the followers of a user page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): followers per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiUser]: iterator over the followers with the resume cursor
+        """
+        return self._paginate(
+            "followers",
+            {"fid": fid},
+            FollowersGetResponse,
+            "users",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_followers(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableUsersResult:
+        """Get the followers of a user
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableUsersResult: model containing users with an optional cursor
+        """
+        async with self.iter_followers(
+            fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=await pages.take(limit), cursor=pages.cursor
+            )
+
+    async def get_all_followers(
+        self,
+        fid: Optional[int] = None,
+        prefetch: int = 0,
+        deadline: Optional[float] = None,
+    ) -> UsersResult:
+        """Get all followers of a user by iterating through the next cursors
+
+        Args:
+            fid (int): Farcaster ID of the user
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+            deadline (Optional[float], optional): seconds to complete the walk in, defaults to None
+
+        Returns:
+            UsersResult: model containing users, and the cursor to resume from when
+            the deadline was hit
+        """
+        if fid is None:
+            fid = (await self.get_me()).fid
+        with within(deadline):
+            async with self.iter_followers(fid, prefetch=prefetch) as pages:
+                users = [user async for user in pages]
+        return self._result(UsersResult, users=users, cursor=pages.cursor)
+
+    def iter_following(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiUser]:
+        """Lazily iterate over the users a user is following page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): users per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiUser]: iterator over the users with the resume cursor
+        """
+        return self._paginate(
+            "following",
+            {"fid": fid},
+            FollowingGetResponse,
+            "users",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_following(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableUsersResult:
+        """Get the users a user is following
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableUsersResult: model containing users with an optional cursor
+        """
+        async with self.iter_following(
+            fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=await pages.take(limit), cursor=pages.cursor
+            )
+
+    async def get_all_following(
+        self,
+        fid: Optional[int] = None,
+        prefetch: int = 0,
+        deadline: Optional[float] = None,
+    ) -> UsersResult:
+        """Get all the users a user is following by iterating through the next cursors
+
+        Args:
+            fid (int): Farcaster ID of the user
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+            deadline (Optional[float], optional): seconds to complete the walk in, defaults to None
+
+        Returns:
+            UsersResult: model containing users, and the cursor to resume from when
+            the deadline was hit
+        """
+        if fid is None:
+            fid = (await self.get_me()).fid
+        with within(deadline):
+            async with self.iter_following(fid, prefetch=prefetch) as pages:
+                users = [user async for user in pages]
+        return self._result(UsersResult, users=users, cursor=pages.cursor)
+
+    async def follow_user(self, fid: PositiveInt) -> StatusContent:
+        """Follow a user
+
+        Args:
+            fid (PositiveInt): Farcaster ID of the user to follow
+
+        Returns:
+            StatusContent: Status of the follow
+        """
+        body = FollowsPutRequest(target_fid=fid)
+        response = await self._put(
+            "follows",
+            json=body.model_dump(by_alias=True, exclude_none=True),
+        )
+        return self._parse(StatusResponse, response).result
+
+    async def unfollow_user(self, fid: PositiveInt) -> StatusContent:
+        """Unfollow a user
+
+        Args:
+            fid (PositiveInt): Farcaster ID of the user to unfollow
+
+        Returns:
+            StatusContent: Status of the unfollow
+        """
+        body = FollowsDeleteRequest(target_fid=fid)
+        response = await self._delete(
+            "follows",
+            json=body.model_dump(by_alias=True, exclude_none=True),
+        )
+        return self._parse(StatusResponse, response).result
+
+    async def get_me(self) -> ApiUser:
+        """Get the current user
+
+        Returns:
+            ApiUser: model containing the current user
+        """
+        response = await self._get_model("me", MeGetResponse)
+        response_model = response.result
+        self.config.username = response_model.user.username
+        return response_model.user
+
+    def iter_mention_and_reply_notifications(
+        self,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[Union[MentionNotification, ReplyNotification]]:
+        """Lazily iterate over mention and reply notifications page by page
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): notifications per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[Union[MentionNotification, ReplyNotification]]: iterator over the notifications with the resume cursor
+        """
+        return self._paginate(
+            "mention-and-reply-notifications",
+            {},
+            MentionAndReplyNotificationsGetResponse,
+            "notifications",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_mention_and_reply_notifications(
+        self,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableNotificationsResult:
+        """Get mention and reply notifications
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableNotificationsResult: model containing notifications with an optional cursor
+        """
+        async with self.iter_mention_and_reply_notifications(
+            cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableNotificationsResult,
+                notifications=await pages.take(limit),
+                cursor=pages.cursor,
+            )
+
+    async def _recent_notifications_list(
+        self,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+    ) -> List[Union[MentionNotification, ReplyNotification]]:
+        """Get mention and reply notifications as a list
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25
+
+        Returns:
+            List[Union[MentionNotification, ReplyNotification]]: list of notifications
+        """
+        return (
+            await self.get_mention_and_reply_notifications(cursor=cursor, limit=limit)
+        ).notifications
+
+    def stream_notifications(
+        self, **stream_options: Any
+    ) -> AsyncGenerator[Optional[Union[MentionNotification, ReplyNotification]], None]:
+        """Stream all recent notifications
+
+        Accepts the same stream options as ``Warpcast.stream_notifications``.
+
+        Args:
+            **stream_options: stream options
+
+        Returns:
+            AsyncGenerator[Optional[Union[MentionNotification, ReplyNotification]], None]: async generator of notifications, close it to save its checkpoint. Returns none if pause_after is reached
+        """
+        return async_stream_generator(
+            **self._stream_source("notifications"), **stream_options
+        )
+
+    async def recast(self, cast_hash: str) -> CastHash:
+        """Recast a cast
+
+        Args:
+            cast_hash (str): the cast hash
+
+        Returns:
+            CastHash: model containing the cast hash
+        """
+        body = CastHash(cast_hash=cast_hash)
+        response = await self._put(
+            "recasts",
+            json=body.model_dump(by_alias=True, exclude_none=True),
+        )
+        return self._parse(RecastsPutResponse, response).result
+
+    async def delete_recast(self, cast_hash: str) -> StatusContent:
+        """Delete a recast
+
+        Args:
+            cast_hash (str): the cast hash
+
+        Returns:
+            StatusContent: Status of the recast deletion
+        """
+        body = CastHash(cast_hash=cast_hash)
+        response = await self._delete(
+            "recasts",
+            json=body.model_dump(by_alias=True, exclude_none=True),
+        )
+        return self._parse(StatusResponse, response).result
+
+    async def get_user(self, fid: int) -> ApiUser:
+        """Get a user
+
+        Args:
+            fid (int): Farcaster ID of the user
+
+        Returns:
+            ApiUser: model containing the user
+        """
+        response = await self._get_model("user", UserGetResponse, params={"fid": fid})
+        return response.result.user
+
+    async def get_user_by_username(
+        self,
+        username: str,
+    ) -> ApiUser:
+        """Get a user by username
+
+        Args:
+            username (str): username of the user
+
+        Returns:
+            ApiUser: model containing the user
+        """
+        response = await self._get_model(
+            "user-by-username", UserByUsernameGetResponse, params={"username": username}
+        )
+        return response.result.user
+
+    async def get_user_by_verification(
+        self,
+        address: str,
+    ) -> ApiUser:
+        """Get a user by verification address
+
+        Args:
+            address (str): address of the user
+
+        Returns:
+            ApiUser: model containing the user
+        """
+        response = await self._get_model(
+            "user-by-verification",
+            UserByUsernameGetResponse,
+            params={"address": address},
+        )
+        return response.result.user
+
+    async def get_users(
+        self,
+        fids: Iterable[int],
+        concurrency: PositiveInt = 8,
+    ) -> UserLookupsResult:
+        """Get many users by Farcaster IDs with concurrent lookups
+
+        Duplicate Farcaster IDs are looked up once and lookups run behind a semaphore of
+        ``concurrency`` slots. A failed lookup is reported in its result instead of
+        failing the whole batch.
+
+        Args:
+            fids (Iterable[int]): Farcaster IDs of the users
+            concurrency (PositiveInt, optional): lookups running at once, defaults to 8
+
+        Returns:
+            UserLookupsResult: one result per input key, in input order
+        """
+        return user_lookups(
+            await async_fan_out(self.get_user, fids, concurrency),
+            current_response_mode(self.config.response_mode),
+        )
+
+    async def get_users_by_username(
+        self,
+        usernames: Iterable[str],
+        concurrency: PositiveInt = 8,
+    ) -> UserLookupsResult:
+        """Get many users by usernames with concurrent lookups
+
+        Duplicate usernames are looked up once and lookups run behind a semaphore of
+        ``concurrency`` slots. Usernames are compared case-insensitively. A failed
+        lookup is reported in its result instead of failing the whole batch.
+
+        Args:
+            usernames (Iterable[str]): usernames of the users
+            concurrency (PositiveInt, optional): lookups running at once, defaults to 8
+
+        Returns:
+            UserLookupsResult: one result per input key, in input order
+        """
+        return user_lookups(
+            await async_fan_out(
+                self.get_user_by_username, usernames, concurrency, normalize=str.lower
+            ),
+            current_response_mode(self.config.response_mode),
+        )
+
+    async def get_users_by_verification(
+        self,
+        addresses: Iterable[str],
+        concurrency: PositiveInt = 8,
+    ) -> UserLookupsResult:
+        """Get many users by verification addresses with concurrent lookups
+
+        Duplicate verification addresses are looked up once and lookups run behind a
+        semaphore of ``concurrency`` slots. Verification addresses are compared case-
+        insensitively. A failed lookup is reported in its result instead of failing the
+        whole batch.
+
+        Args:
+            addresses (Iterable[str]): verification addresses of the users
+            concurrency (PositiveInt, optional): lookups running at once, defaults to 8
+
+        Returns:
+            UserLookupsResult: one result per input key, in input order
+        """
+        return user_lookups(
+            await async_fan_out(
+                self.get_user_by_verification,
+                addresses,
+                concurrency,
+                normalize=str.lower,
+            ),
+            current_response_mode(self.config.response_mode),
+        )
+
+    def iter_user_collections(
+        self,
+        owner_fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiAssetCollection]:
+        """Lazily iterate over the collections of a user page by page
+
+        Args:
+            owner_fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): collections per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiAssetCollection]: iterator over the collections with the resume cursor
+        """
+        return self._paginate(
+            "user-collections",
+            {"ownerFid": owner_fid},
+            UserCollectionsGetResponse,
+            "collections",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_user_collections(
+        self,
+        owner_fid: int,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableCollectionsResult:
+        """Get the collections of a user
+
+        Args:
+            owner_fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableCollectionsResult: model containing collections with an optional cursor
+        """
+        async with self.iter_user_collections(
+            owner_fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableCollectionsResult,
+                collections=await pages.take(limit),
+                cursor=pages.cursor,
+            )
+
+    def iter_verifications(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiVerification]:
+        """Lazily iterate over the verifications of a user page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): verifications per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiVerification]: iterator over the verifications with the resume cursor
+        """
+        return self._paginate(
+            "verifications",
+            {"fid": fid},
+            VerificationsGetResponse,
+            "verifications",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_verifications(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+    ) -> IterableVerificationsResult:
+        """Get the verifications of a user
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25
+
+        Returns:
+            IterableVerificationsResult: model containing verifications with an optional cursor
+        """
+        response = await self._get_model(
+            "verifications",
+            VerificationsGetResponse,
+            params={"fid": fid, "cursor": cursor, "limit": limit},
+        )
+        return self._result(
+            IterableVerificationsResult,
+            verifications=response.result.verifications,
+            cursor=getattr(response.next, "cursor", None),
+        )
+
+    def iter_recent_users(
+        self,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiUser]:
+        """Lazily iterate over recent users page by page
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): users per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiUser]: iterator over the users with the resume cursor
+        """
+        return self._paginate(
+            "recent-users", {}, UsersGetResponse, "users", cursor, page_size, prefetch
+        )
+
+    async def get_recent_users(
+        self,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableUsersResult:
+        """Get recent users
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableUsersResult: model containing users with an optional cursor
+        """
+        async with self.iter_recent_users(
+            cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=await pages.take(limit), cursor=pages.cursor
+            )
+
+    async def _recent_users_list(
+        self,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+    ) -> List[ApiUser]:
+        """Get recent users as a list
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25
+
+        Returns:
+            List[ApiUser]: list of users
+        """
+        return (await self.get_recent_users(cursor=cursor, limit=limit)).users
+
+    def stream_users(
+        self, **stream_options: Any
+    ) -> AsyncGenerator[Optional[ApiUser], None]:
+        """Stream all recent users
+
+        Accepts the same stream options as ``Warpcast.stream_users``.
+
+        Args:
+            **stream_options: stream options
+
+        Returns:
+            AsyncGenerator[Optional[ApiUser], None]: async generator of users, close it to save its checkpoint. Returns none if pause_after is reached
+        """
+        return async_stream_generator(**self._stream_source("users"), **stream_options)
+
+    async def get_custody_address(
+        self,
+        username: Optional[str] = None,
+        fid: Optional[int] = None,
+    ) -> CustodyAddress:
+        """Get the custody address of a user
+
+        Args:
+            username (Optional[str], optional): username of a user, defaults
+                to None
+            fid (Optional[int], optional): Farcaster ID, defaults to
+                None
+
+        Returns:
+            CustodyAddress: model containing the custody address
+        """
+        assert username or fid, "fname or fid must be provided"
+        response = await self._get_model(
+            "custody-address",
+            CustodyAddressGetResponse,
+            params={"fname": username, "fid": fid},
+        )
+        return response.result
+
+    def iter_user_cast_likes(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiCastReaction]:
+        """Lazily iterate over the likes of a user page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): likes per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiCastReaction]: iterator over the likes with the resume cursor
+        """
+        return self._paginate(
+            "user-cast-likes",
+            {"fid": fid},
+            UserCastLikesGetResponse,
+            "likes",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
+    async def get_user_cast_likes(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> IterableLikes:
+        """Get the likes of a user
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableLikes: model containing likes with an optional cursor
+        """
+        async with self.iter_user_cast_likes(
+            fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableLikes, likes=await pages.take(limit), cursor=pages.cursor
+            )
+
+    def iter_recent_casts(
+        self,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> AsyncPageIterator[ApiCast]:
+        """Lazily iterate over all recent casts page by page
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): casts per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            AsyncPageIterator[ApiCast]: iterator over the casts with the resume cursor
+        """
+        return self._paginate(
+            "recent-casts", {}, CastsGetResponse, "casts", cursor, page_size, prefetch
+        )
+
+    async def get_recent_casts(
+        self,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> IterableCastsResult:
+        """Get all recent casts
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background task, defaults to 0
+
+        Returns:
+            IterableCastsResult: model containing casts with an optional cursor
+        """
+        async with self.iter_recent_casts(
+            cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableCastsResult, casts=await pages.take(limit), cursor=pages.cursor
+            )
+
+    async def _recent_casts_lists(
+        self,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 100,
+    ) -> List[ApiCast]:
+        """Get all recent casts and return them as a list
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 100
+
+        Returns:
+            List[ApiCast]: list of casts
+        """
+        return (await self.get_recent_casts(cursor=cursor, limit=limit)).casts
+
+    async def _recent_casts_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 100,
+    ) -> Tuple[List[ApiCast], Optional[str]]:
+        """Get recent casts as a list, with the cursor of the older casts
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 100
+
+        Returns:
+            Tuple[List[ApiCast], Optional[str]]: list of casts and the cursor
+        """
+        result = await self.get_recent_casts(cursor=cursor, limit=limit)
+        return result.casts, result.cursor
+
+    def stream_casts(
+        self, **stream_options: Any
+    ) -> AsyncGenerator[Optional[ApiCast], None]:
+        """Stream all recent casts
+
+        Accepts the same stream options as ``Warpcast.stream_casts``.
+
+        Args:
+            **stream_options: stream options
+
+        Returns:
+            AsyncGenerator[Optional[ApiCast], None]: async generator of casts, close it to save its checkpoint. Returns none if pause_after is reached
+        """
+        return async_stream_generator(**self._stream_source("casts"), **stream_options)
+
+    def _stream_source(self, stream: str) -> Dict[str, Any]:
+        """Get how to poll a stream
+
+        Args:
+            stream (str): ``casts``, ``users`` or ``notifications``
+
+        Raises:
+            ValueError: the stream is unknown
+
+        Returns:
+            Dict[str, Any]: the polling function and the options of the stream
+        """
+        sources: Dict[str, Dict[str, Any]] = {
+            "casts": dict(
+                function=self._recent_casts_lists,
+                backfill=self._recent_casts_page,
+                attribute_name="hash",
+                order_attribute_name="timestamp",
+                limit=50,
+            ),
+            "users": dict(
+                function=self._recent_users_list,
+                attribute_name="fid",
+                order_attribute_name="fid",
+                limit=20,
+            ),
+            "notifications": dict(
+                function=self._recent_notifications_list,
+                attribute_name="id",
+                order_attribute_name="timestamp",
+                limit=20,
+            ),
+        }
+        if stream not in sources:
+            raise ValueError(
+                f"Unknown stream {stream!r}, expected one of {list(sources)}"
+            )
+        return sources[stream]
+
+    def stream_batches(
+        self, stream: str = "casts", **stream_options: Any
+    ) -> AsyncGenerator[StreamBatch, None]:
+        """Stream recent casts, users or notifications in batches
+
+        Accepts the same arguments as ``Warpcast.stream_batches``.
+
+        Args:
+            stream (str): ``casts``, ``users`` or ``notifications``, defaults to ``casts``
+            **stream_options: stream options
+
+        Returns:
+            AsyncGenerator[StreamBatch, None]: async generator of batches, close it to save its checkpoint
+        """
+        return async_batch_stream_generator(
+            **self._stream_source(stream), **stream_options
+        )
+
+    async def create_new_auth_token(self, expires_in: PositiveInt = 10) -> str:
+        """Create a new access token for a user from the wallet credentials
+
+        Args:
+            expires_in (PositiveInt): Expiration length of the token in minutes,
+                defaults to 10 minutes
+
+        Returns:
+            str: access token
+        """
+        now = int(time.time())
+        auth_params = AuthParams(
+            timestamp=now * 1000, expires_at=(now + (expires_in * 60)) * 1000
+        )
+        logging.debug(f"Creating new auth token with params: {auth_params}")
+        response = await self.put_auth(auth_params)
+        self.access_token = response.token.secret
+        self.expires_at = auth_params.expires_at
+        self.rotation_duration = expires_in
+
+        self.session.headers.update({"Authorization": f"Bearer {self.access_token}"})
+
+        return self.access_token
+
+    def generate_custody_auth_header(self, params: AuthParams) -> str:
+        """Generate a custody authorization header. Usually invoked from create_new_auth_token.
+
+        Args:
+            params (AuthParams): authorization parameters
+
+        Raises:
+            Exception: Wallet is required
+
+        Returns:
+            str: custody authorization header
+        """
+        if not self.wallet:
+            raise Exception("Wallet not set")
+        return generate_custody_auth_header(self.wallet, params)
@@ -1,7 +1,18 @@
-from typing import Any, Dict, Iterator, Optional
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 import base64
 import logging
+import threading
 import time
 
 import canonicaljson
@@ -11,12 +22,38 @@ from eth_account.datastructures import SignedMessage
 from eth_account.messages import encode_defunct
 from eth_account.signers.local import LocalAccount
 from pydantic import PositiveInt
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
 
 from farcaster.config import *
 from farcaster.models import *
-from farcaster.utils.stream_generator import stream_generator
+from farcaster.utils.cache import ResponseCache, cache_key
+from farcaster.utils.concurrency import Outcome, fan_out
+from farcaster.utils.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    DeadlineRetry,
+    request_timeouts,
+    within,
+)
+from farcaster.utils.fast_json import loads
+from farcaster.utils.interning import UserInterner, current_interner, interning
+from farcaster.utils.pagination import PageIterator
+from farcaster.utils.pool import PooledHTTPAdapter
+from farcaster.utils.rate_limit import AdaptiveRateLimiter
+from farcaster.utils.response_mode import (
+    build_result,
+    current_response_mode,
+    parse_response,
+)
+from farcaster.utils.singleflight import SingleFlight
+from farcaster.utils.stream_generator import (
+    StreamBatch,
+    batch_stream_generator,
+    stream_generator,
+)
+
+RATE_LIMIT_RETRIES = 2
+
+M = TypeVar("M", bound=BaseModel)
 
 
 class Warpcast:
@@ -30,7 +67,11 @@ class Warpcast:
     access_token: Optional[str]
     expires_at: Optional[PositiveInt]
     rotation_duration: PositiveInt
+    cache: Optional[ResponseCache]
+    rate_limiter: Optional[AdaptiveRateLimiter]
+    interner: Optional[UserInterner]
     session: requests.Session
+    adapter: PooledHTTPAdapter
 
     def __init__(
         self,
@@ -39,6 +80,9 @@ class Warpcast:
         access_token: Optional[str] = None,
         expires_at: Optional[PositiveInt] = None,
         rotation_duration: PositiveInt = 10,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        interner: Optional[UserInterner] = None,
         **data: Any,
     ):
         self.config = ConfigurationParams(**data)
@@ -46,15 +90,30 @@ class Warpcast:
         self.access_token = access_token
         self.expires_at = expires_at
         self.rotation_duration = rotation_duration
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.interner = interner
+        self._flights: SingleFlight[Dict[Any, Any]] = SingleFlight()
+        self._raw_flights: SingleFlight[bytes] = SingleFlight()
+        self._auth_lock = threading.Lock()
         self.session = requests.Session()
-        self.session.mount(
-            self.config.base_path,
-            HTTPAdapter(
-                max_retries=Retry(
-                    total=2, backoff_factor=1, status_forcelist=[520, 413, 429, 503]
-                )
+        self.adapter = PooledHTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+            pool_timeout=self.config.pool_timeout,
+            max_retries=DeadlineRetry(
+                total=2,
+                backoff_factor=1,
+                # the rate limiter handles 429s itself, without retry storms
+                status_forcelist=[520, 413, 503]
+                if rate_limiter
+                else [520, 413, 429, 503],
             ),
         )
+        self.session.mount(self.config.base_path, self.adapter)
+        if not self.config.keep_alive:
+            self.session.headers["Connection"] = "close"
         if self.access_token:
             self.session.headers.update(
                 {"Authorization": f"Bearer {self.access_token}"}
@@ -70,25 +129,188 @@ class Warpcast:
     def get_base_path(self):
         return self.config.base_path
 
+    def pool_stats(self) -> Dict[str, int]:
+        """Get the usage of the connection pool, to size ``pool_maxsize``
+
+        Returns:
+            Dict[str, int]: connections ``in_use``, ``idle``, ``created`` and
+            ``discarded`` because the pool was full, plus ``checkouts`` and the peak
+            ``max_in_use``
+        """
+        return self.adapter.pool_stats()
+
     def get_base_options(self):
         return self.config.base_options
 
-    def _get(
+    def _request(
         self,
+        method: str,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> requests.Response:
+        limiter = self.rate_limiter
+        deadline = Deadline.current()
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            if limiter is not None:
+                delay = limiter.reserve(path)
+                if deadline is not None:
+                    deadline.wait(delay)
+                if delay > 0:
+                    time.sleep(delay)
+            try:
+                response: requests.Response = getattr(self.session, method.lower())(
+                    self.config.base_path + path,
+                    params=params,
+                    json=json,
+                    headers=headers,
+                    timeout=request_timeouts(
+                        self.config.connect_timeout, self.config.read_timeout
+                    ),
+                )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                # requests wraps the DeadlineExceeded raised by DeadlineRetry
+                if e.args and isinstance(e.args[0], DeadlineExceeded):
+                    raise e.args[0] from e
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded(f"{method} {path} timed out") from e
+                raise
+            if limiter is None:
+                break
+            limiter.update(path, response.status_code, response.headers)
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                break
+        return response
+
+    def _send(
+        self,
+        method: str,
         path: str,
         params: Dict[Any, Any] = {},
         json: Dict[Any, Any] = {},
         headers: Dict[Any, Any] = {},
     ) -> Dict[Any, Any]:
-        self._check_auth_header()
-        logging.debug(f"GET {path} {params} {json} {headers}")
-        response: Dict[Any, Any] = self.session.get(
-            self.config.base_path + path, params=params, json=json, headers=headers
-        ).json()
+        response: Dict[Any, Any] = loads(
+            self._send_raw(method, path, params, json, headers)
+        )
         if "errors" in response:
             raise Exception(response["errors"])  # pragma: no cover
         return response
 
+    def _send_raw(
+        self,
+        method: str,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> bytes:
+        self._check_auth_header()
+        logging.debug(f"{method} {path} {params} {json} {headers}")
+        return self._request(
+            method, path, params=params, json=json, headers=headers
+        ).content
+
+    def _get_model(
+        self,
+        path: str,
+        response_model: Type[M],
+        params: Dict[Any, Any] = {},
+    ) -> M:
+        """GET an endpoint and validate the response into its model
+
+        With ``validate_json``, the raw response bytes are handed straight to
+        ``model_validate_json``, skipping the intermediate dict. Cached endpoints
+        still go through ``_get``, the cache stores decoded responses. The response
+        mode can skip validation altogether, see :meth:`_parse`.
+
+        Args:
+            path (str): endpoint path
+            response_model (Type[M]): model of the response
+            params (Dict[Any, Any], optional): query parameters, defaults to {}
+
+        Returns:
+            M: the parsed response
+        """
+        if not self.config.validate_json or (
+            self.cache is not None and self.cache.caches(path)
+        ):
+            return self._parse(response_model, self._get(path, params))
+
+        def fetch() -> bytes:
+            return self._send_raw("GET", path, params)
+
+        if self.config.coalesce_requests:
+            content = self._raw_flights.do(cache_key(path, params), fetch)
+        else:
+            content = fetch()
+        return self._parse(response_model, content)
+
+    def _parse(self, response_model: Type[M], response: Any) -> M:
+        """Parse a response in the current response mode
+
+        ``validate`` validates it into ``response_model``, ``construct`` builds the
+        model without validation and ``raw`` returns the decoded JSON as a
+        :class:`~farcaster.utils.response_mode.RawDict`. The mode comes from
+        :func:`~farcaster.utils.response_mode.response_mode` for the call, otherwise
+        from the ``response_mode`` of the client. Users are interned by the
+        interner of the call, see :func:`~farcaster.utils.interning.interning`,
+        otherwise by the one of the client.
+
+        Args:
+            response_model (Type[M]): model of the response
+            response (Any): raw JSON response or the decoded one
+
+        Returns:
+            M: the parsed response
+        """
+        mode = current_response_mode(self.config.response_mode)
+        if self.interner is None or current_interner() is not None:
+            return parse_response(response_model, response, mode)
+        with interning(self.interner):
+            return parse_response(response_model, response, mode)
+
+    def _result(self, model: Type[M], **fields: Any) -> M:
+        """Build a result model from parsed items in the current response mode
+
+        Args:
+            model (Type[M]): result model
+            fields (Any): fields of the result
+
+        Returns:
+            M: the result
+        """
+        return build_result(
+            model, current_response_mode(self.config.response_mode), **fields
+        )
+
+    def _get(
+        self,
+        path: str,
+        params: Dict[Any, Any] = {},
+        json: Dict[Any, Any] = {},
+        headers: Dict[Any, Any] = {},
+    ) -> Dict[Any, Any]:
+        cache = self.cache
+        if cache is not None and not cache.caches(path):
+            cache = None
+        if cache is not None:
+            hit = cache.get(path, params)
+            if hit is not None:
+                return hit
+
+        def fetch() -> Dict[Any, Any]:
+            response = self._send("GET", path, params, json, headers)
+            if cache is not None:
+                cache.set(path, params, response)
+            return response
+
+        # identical concurrent GETs share a single round-trip
+        if self.config.coalesce_requests and not json and not headers:
+            return self._flights.do(cache_key(path, params), fetch)
+        return fetch()
+
     def _post(
         self,
         path: str,
@@ -96,14 +318,7 @@ class Warpcast:
         json: Dict[Any, Any] = {},
         headers: Dict[Any, Any] = {},
     ) -> Dict[Any, Any]:
-        self._check_auth_header()
-        logging.debug(f"POST {path} {params} {json} {headers}")
-        response: Dict[Any, Any] = self.session.post(
-            self.config.base_path + path, params=params, json=json, headers=headers
-        ).json()
-        if "errors" in response:
-            raise Exception(response["errors"])  # pragma: no cover
-        return response
+        return self._send("POST", path, params, json, headers)
 
     def _put(
         self,
@@ -112,14 +327,7 @@ class Warpcast:
         json: Dict[Any, Any] = {},
         headers: Dict[Any, Any] = {},
     ) -> Dict[Any, Any]:
-        self._check_auth_header()
-        logging.debug(f"PUT {path} {params} {json} {headers}")
-        response: Dict[Any, Any] = self.session.put(
-            self.config.base_path + path, params=params, json=json, headers=headers
-        ).json()
-        if "errors" in response:
-            raise Exception(response["errors"])  # pragma: no cover
-        return response
+        return self._send("PUT", path, params, json, headers)
 
     def _delete(
         self,
@@ -128,19 +336,54 @@ class Warpcast:
         json: Dict[Any, Any] = {},
         headers: Dict[Any, Any] = {},
     ) -> Dict[Any, Any]:
-        self._check_auth_header()
-        logging.debug(f"DELETE {path} {params} {json} {headers}")
-        response: Dict[Any, Any] = self.session.delete(
-            self.config.base_path + path, params=params, json=json, headers=headers
-        ).json()
-        if "errors" in response:
-            raise Exception(response["errors"])  # pragma: no cover
-        return response
+        return self._send("DELETE", path, params, json, headers)
 
     def _check_auth_header(self):
         assert self.expires_at
         if self.expires_at < now_ms() + 1000:
-            self.create_new_auth_token(expires_in=self.rotation_duration)
+            with self._auth_lock:
+                # another thread may have rotated the token while we were waiting
+                if self.expires_at < now_ms() + 1000:
+                    self.create_new_auth_token(expires_in=self.rotation_duration)
+
+    def _paginate(
+        self,
+        path: str,
+        params: Dict[Any, Any],
+        response_model: Type[BaseModel],
+        attribute: str,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[Any]:
+        """Lazily walk a paginated endpoint by following the next cursors
+
+        Args:
+            path (str): endpoint path
+            params (Dict[Any, Any]): query parameters, without cursor and limit
+            response_model (Type[BaseModel]): model of a page of the endpoint
+            attribute (str): attribute of the page result holding the items
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): items per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[Any]: iterator over the items of the endpoint
+        """
+
+        def fetch(cursor: Optional[str]) -> Tuple[Any, Optional[str]]:
+            # pages are validated here, on the prefetch worker when prefetching
+            page: Any = self._get_model(
+                path,
+                response_model,
+                params={**params, "cursor": cursor, "limit": page_size},
+            )
+            return page, page.next.cursor if page.next else None
+
+        def parse(page: Any) -> List[Any]:
+            return getattr(page.result, attribute) or []
+
+        return PageIterator(fetch, cursor, parse, prefetch)
 
     def get_healthcheck(self) -> bool:
         """Check if API is up and running
@@ -160,8 +403,8 @@ class Warpcast:
         Returns:
             AssetResult: token information
         """
-        response = self._get("asset", {"token_id": token_id})
-        return AssetGetResponse(**response).result
+        response = self._get_model("asset", AssetGetResponse, {"token_id": token_id})
+        return response.result
 
     def get_asset_events(
         self,
@@ -178,14 +421,41 @@ class Warpcast:
         Returns:
             IterableEventsResult: Returns the EventsResult model with an optional cursor
         """
-        response = AssetEventsGetResponse(
-            **self._get(
-                "asset-events",
-                params={"cursor": cursor, "limit": limit},
-            )
+        response = self._get_model(
+            "asset-events",
+            AssetEventsGetResponse,
+            params={"cursor": cursor, "limit": limit},
         )
-        return IterableEventsResult(
-            events=response.result.events, cursor=getattr(response.next, "cursor", None)
+        return self._result(
+            IterableEventsResult,
+            events=response.result.events,
+            cursor=getattr(response.next, "cursor", None),
+        )
+
+    def iter_asset_events(
+        self,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 25,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiAssetEvent]:
+        """Lazily iterate over asset events page by page
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): events per request, defaults to 25
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiAssetEvent]: iterator over the events with the resume cursor
+        """
+        return self._paginate(
+            "asset-events",
+            {},
+            AssetEventsGetResponse,
+            "events",
+            cursor,
+            page_size,
+            prefetch,
         )
 
     def put_auth(self, auth_params: AuthParams) -> TokenResult:
@@ -199,12 +469,15 @@ class Warpcast:
         """
         header = self.generate_custody_auth_header(auth_params)
         body = AuthPutRequest(params=auth_params)
-        response = requests.put(
-            self.config.base_path + "auth",
+        # through the session, so the refresh has the timeouts, retries, rate limiter
+        # and deadline of any other request
+        response = self._request(
+            "PUT",
+            "auth",
             json=body.model_dump(by_alias=True, exclude_none=True),
             headers={"Authorization": header},
         ).json()
-        return AuthPutResponse(**response).result
+        return self._parse(AuthPutResponse, response).result
 
     def delete_auth(self) -> StatusContent:
         """Delete an access token
@@ -218,13 +491,42 @@ class Warpcast:
             "auth",
             json=body.model_dump(by_alias=True, exclude_none=True),
         )
-        return StatusResponse(**response).result
+        return self._parse(StatusResponse, response).result
+
+    def iter_cast_likes(
+        self,
+        cast_hash: str,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiCastReaction]:
+        """Lazily iterate over the likes for a given cast page by page
+
+        Args:
+            cast_hash (str): cast hash
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): likes per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiCastReaction]: iterator over the likes with the resume cursor
+        """
+        return self._paginate(
+            "cast-likes",
+            {"castHash": cast_hash},
+            CastReactionsGetResponse,
+            "likes",
+            cursor,
+            page_size,
+            prefetch,
+        )
 
     def get_cast_likes(
         self,
         cast_hash: str,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableReactionsResult:
         """Get the likes for a given cast
 
@@ -232,29 +534,17 @@ class Warpcast:
             cast_hash (str): cast hash
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableReactionsResult: Model containing the likes with an optional cursor
         """
-        likes: List[ApiCastReaction] = []
-        while True:
-            response = self._get(
-                "cast-likes",
-                params={
-                    "castHash": cast_hash,
-                    "cursor": cursor,
-                    "limit": min(limit, 100),
-                },
+        with self.iter_cast_likes(
+            cast_hash, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableReactionsResult, likes=pages.take(limit), cursor=pages.cursor
             )
-            response_model = CastReactionsGetResponse(**response)
-            if response_model.result.likes:
-                likes = response_model.result.likes
-            if not response_model.next or len(likes) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableReactionsResult(
-            likes=likes[:limit], cursor=getattr(response_model.next, "cursor", None)
-        )
 
     def like_cast(self, cast_hash: str) -> ReactionsPutResult:
         """Like a given cast
@@ -270,7 +560,7 @@ class Warpcast:
             "cast-likes",
             json=body.model_dump(by_alias=True, exclude_none=True),
         )
-        return CastReactionsPutResponse(**response).result
+        return self._parse(CastReactionsPutResponse, response).result
 
     def delete_cast_likes(self, cast_hash: str) -> StatusContent:
         """Remove a like from a cast
@@ -286,13 +576,42 @@ class Warpcast:
             "cast-likes",
             json=body.model_dump(by_alias=True, exclude_none=True),
         )
-        return StatusResponse(**response).result
+        return self._parse(StatusResponse, response).result
+
+    def iter_cast_recasters(
+        self,
+        cast_hash: str,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiUser]:
+        """Lazily iterate over the recasters for a given cast page by page
+
+        Args:
+            cast_hash (str): cast hash
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): recasters per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiUser]: iterator over the recasters with the resume cursor
+        """
+        return self._paginate(
+            "cast-recasters",
+            {"castHash": cast_hash},
+            CastRecastersGetResponse,
+            "users",
+            cursor,
+            page_size,
+            prefetch,
+        )
 
     def get_cast_recasters(
         self,
         cast_hash: str,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableUsersResult:
         """Get the recasters for a given cast
 
@@ -300,28 +619,17 @@ class Warpcast:
             cast_hash (str): cast hash
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableUsersResult: Model containing the recasters with an optional cursor
         """
-        users: List[ApiUser] = []
-        while True:
-            response = self._get(
-                "cast-recasters",
-                params={
-                    "castHash": cast_hash,
-                    "cursor": cursor,
-                    "limit": min(limit, 100),
-                },
+        with self.iter_cast_recasters(
+            cast_hash, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=pages.take(limit), cursor=pages.cursor
             )
-            response_model = CastRecastersGetResponse(**response)
-            if response_model.result.users:
-                users.extend(response_model.result.users)
-            if not response_model.next or len(users) >= limit:
-                break
-        return IterableUsersResult(
-            users=users, cursor=getattr(response_model.next, "cursor", None)
-        )
 
     def get_cast(
         self,
@@ -335,11 +643,8 @@ class Warpcast:
         Returns:
             CastContent: The cast content
         """
-        response = self._get(
-            "cast",
-            params={"hash": hash},
-        )
-        return CastGetResponse(**response).result
+        response = self._get_model("cast", CastGetResponse, params={"hash": hash})
+        return response.result
 
     def get_all_casts_in_thread(
         self,
@@ -353,17 +658,45 @@ class Warpcast:
         Returns:
             CastsResult: Model containing the casts
         """
-        response = self._get(
-            "all-casts-in-thread",
-            params={"threadHash": thread_hash},
+        response = self._get_model(
+            "all-casts-in-thread", CastsGetResponse, params={"threadHash": thread_hash}
+        )
+        return response.result
+
+    def iter_casts(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiCast]:
+        """Lazily iterate over the casts for a given fid of a user page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): casts per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiCast]: iterator over the casts with the resume cursor
+        """
+        return self._paginate(
+            "casts",
+            {"fid": fid},
+            CastsGetResponse,
+            "casts",
+            cursor,
+            page_size,
+            prefetch,
         )
-        return CastsGetResponse(**response).result
 
     def get_casts(
         self,
         fid: int,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableCastsResult:
         """Get the casts for a given fid of a user
 
@@ -371,25 +704,17 @@ class Warpcast:
             fid (int): Farcaster ID of the user
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableCastsResult: Model containing the casts with an optional cursor
         """
-        casts: List[ApiCast] = []
-        while True:
-            response = self._get(
-                "casts",
-                params={"fid": fid, "cursor": cursor, "limit": min(limit, 100)},
+        with self.iter_casts(
+            fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableCastsResult, casts=pages.take(limit), cursor=pages.cursor
             )
-            response_model = CastsGetResponse(**response)
-            if response_model.result.casts:
-                casts.extend(response_model.result.casts)
-            if not response_model.next or len(casts) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableCastsResult(
-            casts=casts[:limit], cursor=getattr(response_model.next, "cursor", None)
-        )
 
     def post_cast(
         self,
@@ -416,7 +741,7 @@ class Warpcast:
             "casts",
             json=body.model_dump(by_alias=True, exclude_none=True),
         )
-        return CastsPostResponse(**response).result
+        return self._parse(CastsPostResponse, response).result
 
     def delete_cast(self, cast_hash: str) -> StatusContent:
         """Delete a cast
@@ -432,13 +757,42 @@ class Warpcast:
             "casts",
             json=body.model_dump(by_alias=True, exclude_none=True),
         )
-        return StatusResponse(**response).result
+        return self._parse(StatusResponse, response).result
+
+    def iter_collection_owners(
+        self,
+        collection_id: str,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiUser]:
+        """Lazily iterate over the owners of an OpenSea collection page by page
+
+        Args:
+            collection_id (str): OpenSea collection ID
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): owners per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiUser]: iterator over the owners with the resume cursor
+        """
+        return self._paginate(
+            "collection-owners",
+            {"collectionId": collection_id},
+            CollectionOwnersGetResponse,
+            "users",
+            cursor,
+            page_size,
+            prefetch,
+        )
 
     def get_collection_owners(
         self,
         collection_id: str,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableUsersResult:
         """Get the owners of an OpenSea collection
 
@@ -446,28 +800,44 @@ class Warpcast:
             collection_id (str): OpenSea collection ID
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableUsersResult: model containing users with an optional cursor
         """
-        users: List[ApiUser] = []
-        while True:
-            response = self._get(
-                "collection-owners",
-                params={
-                    "collectionId": collection_id,
-                    "cursor": cursor,
-                    "limit": min(limit, 100),
-                },
+        with self.iter_collection_owners(
+            collection_id, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=pages.take(limit), cursor=pages.cursor
             )
-            response_model = CollectionOwnersGetResponse(**response)
-            if response_model.result.users:
-                users.extend(response_model.result.users)
-            if not response_model.next or len(users) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableUsersResult(
-            users=users[:limit], cursor=getattr(response_model.next, "cursor", None)
+
+    def iter_followers(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiUser]:
+        """Lazily iterate over the followers of a user page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): followers per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiUser]: iterator over the followers with the resume cursor
+        """
+        return self._paginate(
+            "followers",
+            {"fid": fid},
+            FollowersGetResponse,
+            "users",
+            cursor,
+            page_size,
+            prefetch,
         )
 
     def get_followers(
@@ -475,6 +845,7 @@ class Warpcast:
         fid: int,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableUsersResult:
         """Get the followers of a user
 
@@ -482,56 +853,72 @@ class Warpcast:
             fid (int): Farcaster ID of the user
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableUsersResult: model containing users with an optional cursor
         """
-        users: List[ApiUser] = []
-        while True:
-            response = self._get(
-                "followers",
-                params={"fid": fid, "cursor": cursor, "limit": min(limit, 100)},
+        with self.iter_followers(
+            fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=pages.take(limit), cursor=pages.cursor
             )
-            response_model = FollowersGetResponse(**response)
-            if response_model.result.users:
-                users.extend(response_model.result.users)
-            if not response_model.next or len(users) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableUsersResult(
-            users=users[:limit], cursor=getattr(response_model.next, "cursor", None)
-        )
 
-    def get_all_followers(self, fid: Optional[int] = None) -> UsersResult:
+    def get_all_followers(
+        self,
+        fid: Optional[int] = None,
+        prefetch: int = 0,
+        deadline: Optional[float] = None,
+    ) -> UsersResult:
         """Get all followers of a user by iterating through the next cursors
         Args:
             fid (int): Farcaster ID of the user
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+            deadline (Optional[float], optional): seconds to complete the walk in, defaults to None
         Returns:
-            UsersResult: model containing users
+            UsersResult: model containing users, and the cursor to resume from when
+            the deadline was hit
         """
-        users: List[ApiUser] = []
-        cursor = None
-        limit = 100
         if fid is None:
             fid = self.get_me().fid
-        while True:
-            response = self._get(
-                "followers",
-                params={"fid": fid, "cursor": cursor, "limit": limit},
-            )
-            response_model = FollowersGetResponse(**response)
-            if response_model.result.users:
-                users.extend(response_model.result.users)
-            if response_model.next is None:
-                break
-            cursor = response_model.next.cursor
-        return UsersResult(users=users)
+        with within(deadline), self.iter_followers(fid, prefetch=prefetch) as pages:
+            return self._result(UsersResult, users=list(pages), cursor=pages.cursor)
+
+    def iter_following(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiUser]:
+        """Lazily iterate over the users a user is following page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): users per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiUser]: iterator over the users with the resume cursor
+        """
+        return self._paginate(
+            "following",
+            {"fid": fid},
+            FollowingGetResponse,
+            "users",
+            cursor,
+            page_size,
+            prefetch,
+        )
 
     def get_following(
         self,
         fid: int,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableUsersResult:
         """Get the users a user is following
 
@@ -539,52 +926,39 @@ class Warpcast:
             fid (int): Farcaster ID of the user
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableUsersResult: model containing users with an optional cursor
         """
-        users: List[ApiUser] = []
-        while True:
-            response = self._get(
-                "following",
-                params={"fid": fid, "cursor": cursor, "limit": min(limit, 100)},
+        with self.iter_following(
+            fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=pages.take(limit), cursor=pages.cursor
             )
-            response_model = FollowingGetResponse(**response)
-            if response_model.result.users:
-                users.extend(response_model.result.users)
-            if not response_model.next or len(users) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableUsersResult(
-            users=users[:limit], cursor=getattr(response_model.next, "cursor", None)
-        )
 
-    def get_all_following(self, fid: Optional[int] = None) -> UsersResult:
+    def get_all_following(
+        self,
+        fid: Optional[int] = None,
+        prefetch: int = 0,
+        deadline: Optional[float] = None,
+    ) -> UsersResult:
         """Get all the users a user is following by iterating through the next cursors
 
         Args:
             fid (int): Farcaster ID of the user
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+            deadline (Optional[float], optional): seconds to complete the walk in, defaults to None
 
         Returns:
-            UsersResult: model containing users
+            UsersResult: model containing users, and the cursor to resume from when
+            the deadline was hit
         """
-        users: List[ApiUser] = []
-        cursor = None
-        limit = 100
         if fid is None:
             fid = self.get_me().fid
-        while True:
-            response = self._get(
-                "following",
-                params={"fid": fid, "cursor": cursor, "limit": limit},
-            )
-            response_model = FollowingGetResponse(**response)
-            if response_model.result.users:
-                users.extend(response_model.result.users)
-            if response_model.next is None:
-                break
-            cursor = response_model.next.cursor
-        return UsersResult(users=users)
+        with within(deadline), self.iter_following(fid, prefetch=prefetch) as pages:
+            return self._result(UsersResult, users=list(pages), cursor=pages.cursor)
 
     def follow_user(self, fid: PositiveInt) -> StatusContent:
         """Follow a user
@@ -600,7 +974,7 @@ class Warpcast:
             "follows",
             json=body.model_dump(by_alias=True, exclude_none=True),
         )
-        return StatusResponse(**response).result
+        return self._parse(StatusResponse, response).result
 
     def unfollow_user(self, fid: PositiveInt) -> StatusContent:
         """Unfollow a user
@@ -616,7 +990,7 @@ class Warpcast:
             "follows",
             json=body.model_dump(by_alias=True, exclude_none=True),
         )
-        return StatusResponse(**response).result
+        return self._parse(StatusResponse, response).result
 
     def get_me(self) -> ApiUser:
         """Get the current user
@@ -624,43 +998,61 @@ class Warpcast:
         Returns:
             ApiUser: model containing the current user
         """
-        response = self._get(
-            "me",
-        )
-        response_model = MeGetResponse(**response).result
+        response = self._get_model("me", MeGetResponse)
+        response_model = response.result
         self.config.username = response_model.user.username
         return response_model.user
 
+    def iter_mention_and_reply_notifications(
+        self,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[Union[MentionNotification, ReplyNotification]]:
+        """Lazily iterate over mention and reply notifications page by page
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): notifications per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[Union[MentionNotification, ReplyNotification]]: iterator over the notifications with the resume cursor
+        """
+        return self._paginate(
+            "mention-and-reply-notifications",
+            {},
+            MentionAndReplyNotificationsGetResponse,
+            "notifications",
+            cursor,
+            page_size,
+            prefetch,
+        )
+
     def get_mention_and_reply_notifications(
         self,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableNotificationsResult:
         """Get mention and reply notifications
 
         Args:
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableNotificationsResult: model containing notifications with an optional cursor
         """
-        notifications: List[Union[MentionNotification, ReplyNotification]] = []
-        while True:
-            response = self._get(
-                "mention-and-reply-notifications",
-                params={"cursor": cursor, "limit": min(limit, 100)},
+        with self.iter_mention_and_reply_notifications(
+            cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableNotificationsResult,
+                notifications=pages.take(limit),
+                cursor=pages.cursor,
             )
-            response_model = MentionAndReplyNotificationsGetResponse(**response)
-            if response_model.result.notifications:
-                notifications.extend(response_model.result.notifications)
-            if not response_model.next or len(notifications) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableNotificationsResult(
-            notifications=notifications[:limit],
-            cursor=getattr(response_model.next, "cursor", None),
-        )
 
     def _recent_notifications_list(
         self,
@@ -682,7 +1074,7 @@ class Warpcast:
 
     def stream_notifications(
         self, **stream_options: Any
-    ) -> Iterator[Optional[Union[MentionNotification, ReplyNotification]]]:
+    ) -> Generator[Optional[Union[MentionNotification, ReplyNotification]], None, None]:
         """Stream all recent notifications
 
         Possible stream options:
@@ -692,17 +1084,20 @@ class Warpcast:
 
             ``max_counter``: ``PositiveInt`` = ``16``, The maximum number of seconds to wait between calls to the API
 
+            ``checkpoint``: ``Optional[StreamCheckpoint]`` = ``None``, Where to save the position of the stream, to resume it after a restart
+
+            ``schedule``: ``Optional[PollSchedule]`` = ``None``, Adapts the poll interval and page size to the arrival rate of items and counts the items possibly missed
+
+            ``dedup``: ``Optional[DedupSet]`` = ``None``, Remembers the items seen, a ``RingSet`` of the last 301 by default or a ``BloomWindow`` for millions of them
+
         Args:
             **stream_options: stream options
 
         Returns:
-            Iterator[Optional[Union[MentionNotification, ReplyNotification]]]: iterator of notifications. Returns none if pause_after is reached
+            Generator[Optional[Union[MentionNotification, ReplyNotification]], None, None]: generator of notifications, close it to save its checkpoint. Returns none if pause_after is reached
         """
         return stream_generator(
-            self._recent_notifications_list,
-            attribute_name="id",
-            limit=20,
-            **stream_options,
+            **self._stream_source("notifications"), **stream_options
         )
 
     def recast(self, cast_hash: str) -> CastHash:
@@ -719,7 +1114,7 @@ class Warpcast:
             "recasts",
             json=body.model_dump(by_alias=True, exclude_none=True),
         )
-        return RecastsPutResponse(**response).result
+        return self._parse(RecastsPutResponse, response).result
 
     def delete_recast(self, cast_hash: str) -> StatusContent:
         """Delete a recast
@@ -735,7 +1130,7 @@ class Warpcast:
             "recasts",
             json=body.model_dump(by_alias=True, exclude_none=True),
         )
-        return StatusResponse(**response).result
+        return self._parse(StatusResponse, response).result
 
     def get_user(self, fid: int) -> ApiUser:
         """Get a user
@@ -746,11 +1141,8 @@ class Warpcast:
         Returns:
             ApiUser: model containing the user
         """
-        response = self._get(
-            "user",
-            params={"fid": fid},
-        )
-        return UserGetResponse(**response).result.user
+        response = self._get_model("user", UserGetResponse, params={"fid": fid})
+        return response.result.user
 
     def get_user_by_username(
         self,
@@ -764,11 +1156,10 @@ class Warpcast:
         Returns:
             ApiUser: model containing the user
         """
-        response = self._get(
-            "user-by-username",
-            params={"username": username},
+        response = self._get_model(
+            "user-by-username", UserByUsernameGetResponse, params={"username": username}
         )
-        return UserByUsernameGetResponse(**response).result.user
+        return response.result.user
 
     def get_user_by_verification(
         self,
@@ -782,17 +1173,124 @@ class Warpcast:
         Returns:
             ApiUser: model containing the user
         """
-        response = self._get(
+        response = self._get_model(
             "user-by-verification",
+            UserByUsernameGetResponse,
             params={"address": address},
         )
-        return UserByUsernameGetResponse(**response).result.user
+        return response.result.user
+
+    def get_users(
+        self,
+        fids: Iterable[int],
+        concurrency: PositiveInt = 8,
+    ) -> UserLookupsResult:
+        """Get many users by Farcaster IDs with concurrent lookups
+
+        Duplicate Farcaster IDs are looked up once and lookups run on a thread pool of
+        ``concurrency`` workers. A failed lookup is reported in its result instead of
+        failing the whole batch.
+
+        Args:
+            fids (Iterable[int]): Farcaster IDs of the users
+            concurrency (PositiveInt, optional): lookups running at once, defaults to 8
+
+        Returns:
+            UserLookupsResult: one result per input key, in input order
+        """
+        return user_lookups(
+            fan_out(self.get_user, fids, concurrency),
+            current_response_mode(self.config.response_mode),
+        )
+
+    def get_users_by_username(
+        self,
+        usernames: Iterable[str],
+        concurrency: PositiveInt = 8,
+    ) -> UserLookupsResult:
+        """Get many users by usernames with concurrent lookups
+
+        Duplicate usernames are looked up once and lookups run on a thread pool of
+        ``concurrency`` workers. Usernames are compared case-insensitively. A failed
+        lookup is reported in its result instead of failing the whole batch.
+
+        Args:
+            usernames (Iterable[str]): usernames of the users
+            concurrency (PositiveInt, optional): lookups running at once, defaults to 8
+
+        Returns:
+            UserLookupsResult: one result per input key, in input order
+        """
+        return user_lookups(
+            fan_out(
+                self.get_user_by_username, usernames, concurrency, normalize=str.lower
+            ),
+            current_response_mode(self.config.response_mode),
+        )
+
+    def get_users_by_verification(
+        self,
+        addresses: Iterable[str],
+        concurrency: PositiveInt = 8,
+    ) -> UserLookupsResult:
+        """Get many users by verification addresses with concurrent lookups
+
+        Duplicate verification addresses are looked up once and lookups run on a thread
+        pool of ``concurrency`` workers. Verification addresses are compared case-
+        insensitively. A failed lookup is reported in its result instead of failing the
+        whole batch.
+
+        Args:
+            addresses (Iterable[str]): verification addresses of the users
+            concurrency (PositiveInt, optional): lookups running at once, defaults to 8
+
+        Returns:
+            UserLookupsResult: one result per input key, in input order
+        """
+        return user_lookups(
+            fan_out(
+                self.get_user_by_verification,
+                addresses,
+                concurrency,
+                normalize=str.lower,
+            ),
+            current_response_mode(self.config.response_mode),
+        )
+
+    def iter_user_collections(
+        self,
+        owner_fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiAssetCollection]:
+        """Lazily iterate over the collections of a user page by page
+
+        Args:
+            owner_fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): collections per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiAssetCollection]: iterator over the collections with the resume cursor
+        """
+        return self._paginate(
+            "user-collections",
+            {"ownerFid": owner_fid},
+            UserCollectionsGetResponse,
+            "collections",
+            cursor,
+            page_size,
+            prefetch,
+        )
 
     def get_user_collections(
         self,
         owner_fid: int,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableCollectionsResult:
         """Get the collections of a user
 
@@ -800,29 +1298,46 @@ class Warpcast:
             owner_fid (int): Farcaster ID of the user
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableCollectionsResult: model containing collections with an optional cursor
         """
-        collections: List[ApiAssetCollection] = []
-        while True:
-            response = self._get(
-                "user-collections",
-                params={
-                    "ownerFid": owner_fid,
-                    "cursor": cursor,
-                    "limit": min(limit, 100),
-                },
+        with self.iter_user_collections(
+            owner_fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableCollectionsResult,
+                collections=pages.take(limit),
+                cursor=pages.cursor,
             )
-            response_model = UserCollectionsGetResponse(**response)
-            if response_model.result.collections:
-                collections.extend(response_model.result.collections)
-            if not response_model.next or len(collections) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableCollectionsResult(
-            collections=collections[:limit],
-            cursor=getattr(response_model.next, "cursor", None),
+
+    def iter_verifications(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiVerification]:
+        """Lazily iterate over the verifications of a user page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): verifications per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiVerification]: iterator over the verifications with the resume cursor
+        """
+        return self._paginate(
+            "verifications",
+            {"fid": fid},
+            VerificationsGetResponse,
+            "verifications",
+            cursor,
+            page_size,
+            prefetch,
         )
 
     def get_verifications(
@@ -841,46 +1356,59 @@ class Warpcast:
         Returns:
             IterableVerificationsResult: model containing verifications with an optional cursor
         """
-        response = VerificationsGetResponse(
-            **self._get(
-                "verifications",
-                params={"fid": fid, "cursor": cursor, "limit": limit},
-            )
+        response = self._get_model(
+            "verifications",
+            VerificationsGetResponse,
+            params={"fid": fid, "cursor": cursor, "limit": limit},
         )
-        return IterableVerificationsResult(
+        return self._result(
+            IterableVerificationsResult,
             verifications=response.result.verifications,
             cursor=getattr(response.next, "cursor", None),
         )
 
+    def iter_recent_users(
+        self,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiUser]:
+        """Lazily iterate over recent users page by page
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): users per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiUser]: iterator over the users with the resume cursor
+        """
+        return self._paginate(
+            "recent-users", {}, UsersGetResponse, "users", cursor, page_size, prefetch
+        )
+
     def get_recent_users(
         self,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableUsersResult:
         """Get recent users
 
         Args:
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableUsersResult: model containing users with an optional cursor
         """
-        users: List[ApiUser] = []
-        while True:
-            response = self._get(
-                "recent-users",
-                params={"cursor": cursor, "limit": min(limit, 100)},
+        with self.iter_recent_users(
+            cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableUsersResult, users=pages.take(limit), cursor=pages.cursor
             )
-            response_model = UsersGetResponse(**response)
-            if response_model.result.users:
-                users.extend(response_model.result.users)
-            if not response_model.next or len(users) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableUsersResult(
-            users=users[:limit], cursor=getattr(response_model.next, "cursor", None)
-        )
 
     def _recent_users_list(
         self,
@@ -898,7 +1426,9 @@ class Warpcast:
         """
         return self.get_recent_users(cursor=cursor, limit=limit).users
 
-    def stream_users(self, **stream_options: Any) -> Iterator[Optional[ApiUser]]:
+    def stream_users(
+        self, **stream_options: Any
+    ) -> Generator[Optional[ApiUser], None, None]:
         """Stream all recent users.
 
         Possible stream options:
@@ -908,16 +1438,20 @@ class Warpcast:
 
             ``max_counter``: ``PositiveInt`` = ``16``, The maximum number of seconds to wait between calls to the API
 
+            ``checkpoint``: ``Optional[StreamCheckpoint]`` = ``None``, Where to save the position of the stream, to resume it after a restart
+
+            ``schedule``: ``Optional[PollSchedule]`` = ``None``, Adapts the poll interval and page size to the arrival rate of items and counts the items possibly missed
+
+            ``dedup``: ``Optional[DedupSet]`` = ``None``, Remembers the items seen, a ``RingSet`` of the last 301 by default or a ``BloomWindow`` for millions of them
+
         Args:
             **stream_options: stream options
 
 
         Returns:
-            Iterator[Optional[ApiUser]]: iterator of users. Returns none if pause_after is reached
+            Generator[Optional[ApiUser], None, None]: generator of users, close it to save its checkpoint. Returns none if pause_after is reached
         """
-        return stream_generator(
-            self._recent_users_list, attribute_name="fid", limit=20, **stream_options
-        )
+        return stream_generator(**self._stream_source("users"), **stream_options)
 
     def get_custody_address(
         self,
@@ -936,17 +1470,47 @@ class Warpcast:
             CustodyAddress: model containing the custody address
         """
         assert username or fid, "fname or fid must be provided"
-        response = self._get(
+        response = self._get_model(
             "custody-address",
+            CustodyAddressGetResponse,
             params={"fname": username, "fid": fid},
         )
-        return CustodyAddressGetResponse(**response).result
+        return response.result
+
+    def iter_user_cast_likes(
+        self,
+        fid: int,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiCastReaction]:
+        """Lazily iterate over the likes of a user page by page
+
+        Args:
+            fid (int): Farcaster ID of the user
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): likes per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiCastReaction]: iterator over the likes with the resume cursor
+        """
+        return self._paginate(
+            "user-cast-likes",
+            {"fid": fid},
+            UserCastLikesGetResponse,
+            "likes",
+            cursor,
+            page_size,
+            prefetch,
+        )
 
     def get_user_cast_likes(
         self,
         fid: int,
         cursor: Optional[str] = None,
         limit: PositiveInt = 25,
+        prefetch: int = 0,
     ) -> IterableLikes:
         """Get the likes of a user
 
@@ -954,55 +1518,60 @@ class Warpcast:
             fid (int): Farcaster ID of the user
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 25, otherwise min(limit, 100)
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableLikes: model containing likes with an optional cursor
         """
-        likes: List[ApiCastReaction] = []
-        while True:
-            response = self._get(
-                "user-cast-likes",
-                params={"fid": fid, "cursor": cursor, "limit": min(limit, 100)},
+        with self.iter_user_cast_likes(
+            fid, cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableLikes, likes=pages.take(limit), cursor=pages.cursor
             )
-            response_model = UserCastLikesGetResponse(**response)
-            if response_model.result.likes:
-                likes.extend(response_model.result.likes)
-            if not response_model.next or len(likes) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableLikes(
-            likes=likes[:limit], cursor=getattr(response_model.next, "cursor", None)
+
+    def iter_recent_casts(
+        self,
+        cursor: Optional[str] = None,
+        page_size: PositiveInt = 100,
+        prefetch: int = 0,
+    ) -> PageIterator[ApiCast]:
+        """Lazily iterate over all recent casts page by page
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            page_size (PositiveInt, optional): casts per request, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
+
+        Returns:
+            PageIterator[ApiCast]: iterator over the casts with the resume cursor
+        """
+        return self._paginate(
+            "recent-casts", {}, CastsGetResponse, "casts", cursor, page_size, prefetch
         )
 
     def get_recent_casts(
         self,
         cursor: Optional[str] = None,
         limit: PositiveInt = 100,
+        prefetch: int = 0,
     ) -> IterableCastsResult:
         """Get all recent casts
 
         Args:
             cursor (Optional[str], optional): cursor, defaults to None
             limit (PositiveInt, optional): limit, defaults to 100
+            prefetch (int, optional): pages to fetch ahead on a background thread, defaults to 0
 
         Returns:
             IterableCastsResult: model containing casts with an optional cursor
         """
-        casts: List[ApiCast] = []
-        while True:
-            response = self._get(
-                "recent-casts",
-                params={"cursor": cursor, "limit": min(limit, 100)},
+        with self.iter_recent_casts(
+            cursor=cursor, page_size=min(limit, 100), prefetch=prefetch
+        ) as pages:
+            return self._result(
+                IterableCastsResult, casts=pages.take(limit), cursor=pages.cursor
             )
-            response_model = CastsGetResponse(**response)
-            if response_model.result.casts:
-                casts.extend(response_model.result.casts)
-            if not response_model.next or len(casts) >= limit:
-                break
-            cursor = response_model.next.cursor
-        return IterableCastsResult(
-            casts=casts[:limit], cursor=getattr(response_model.next, "cursor", None)
-        )
 
     def _recent_casts_lists(
         self,
@@ -1020,7 +1589,26 @@ class Warpcast:
         """
         return self.get_recent_casts(cursor=cursor, limit=limit).casts
 
-    def stream_casts(self, **stream_options: Any) -> Iterator[Optional[ApiCast]]:
+    def _recent_casts_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: PositiveInt = 100,
+    ) -> Tuple[List[ApiCast], Optional[str]]:
+        """Get recent casts as a list, with the cursor of the older casts
+
+        Args:
+            cursor (Optional[str], optional): cursor, defaults to None
+            limit (PositiveInt, optional): limit, defaults to 100
+
+        Returns:
+            Tuple[List[ApiCast], Optional[str]]: list of casts and the cursor
+        """
+        result = self.get_recent_casts(cursor=cursor, limit=limit)
+        return result.casts, result.cursor
+
+    def stream_casts(
+        self, **stream_options: Any
+    ) -> Generator[Optional[ApiCast], None, None]:
         """Stream all recent casts
 
         Possible stream options:
@@ -1030,15 +1618,84 @@ class Warpcast:
 
             ``max_counter``: ``PositiveInt`` = ``16``, The maximum number of seconds to wait between calls to the API
 
+            ``checkpoint``: ``Optional[StreamCheckpoint]`` = ``None``, Where to save the position of the stream, to resume it after a restart
+
+            ``schedule``: ``Optional[PollSchedule]`` = ``None``, Adapts the poll interval and page size to the arrival rate of items and counts the items possibly missed
+
+            ``dedup``: ``Optional[DedupSet]`` = ``None``, Remembers the items seen, a ``RingSet`` of the last 301 by default or a ``BloomWindow`` for millions of them
+
+            ``max_backfill``: ``int`` = ``10``, The maximum number of older pages requested when casts arrived faster than they were polled, 0 disables backfilling
+
         Args:
             **stream_options: stream options
 
         Returns:
-            Iterator[Optional[ApiCast]]: iterator of casts. Returns none if pause_after is reached
+            Generator[Optional[ApiCast], None, None]: generator of casts, close it to save its checkpoint. Returns none if pause_after is reached
         """
-        return stream_generator(
-            self._recent_casts_lists, attribute_name="hash", limit=50, **stream_options
-        )
+        return stream_generator(**self._stream_source("casts"), **stream_options)
+
+    def _stream_source(self, stream: str) -> Dict[str, Any]:
+        """Get how to poll a stream
+
+        Args:
+            stream (str): ``casts``, ``users`` or ``notifications``
+
+        Raises:
+            ValueError: the stream is unknown
+
+        Returns:
+            Dict[str, Any]: the polling function and the options of the stream
+        """
+        sources: Dict[str, Dict[str, Any]] = {
+            "casts": dict(
+                function=self._recent_casts_lists,
+                backfill=self._recent_casts_page,
+                attribute_name="hash",
+                order_attribute_name="timestamp",
+                limit=50,
+            ),
+            "users": dict(
+                function=self._recent_users_list,
+                attribute_name="fid",
+                order_attribute_name="fid",
+                limit=20,
+            ),
+            "notifications": dict(
+                function=self._recent_notifications_list,
+                attribute_name="id",
+                order_attribute_name="timestamp",
+                limit=20,
+            ),
+        }
+        if stream not in sources:
+            raise ValueError(
+                f"Unknown stream {stream!r}, expected one of {list(sources)}"
+            )
+        return sources[stream]
+
+    def stream_batches(
+        self, stream: str = "casts", **stream_options: Any
+    ) -> Generator[StreamBatch, None, None]:
+        """Stream recent casts, users or notifications in batches, to write them in bulk
+
+        Each batch holds the new items of a poll, or of several polls with the
+        ``max_items`` and ``max_wait`` stream options, along with the number of polls,
+        their latency and the cursor of older items. A pausing stream yields the items
+        gathered so far instead of ``None``.
+
+        Possible stream options, besides the ones of the item streams:
+            ``max_items``: ``Optional[int]`` = ``None``, The maximum number of items per batch
+
+            ``max_wait``: ``Optional[float]`` = ``None``, The maximum number of seconds an item waits for its batch
+
+        Args:
+            stream (str): ``casts``, ``users`` or ``notifications``, defaults to ``casts``
+            **stream_options: stream options
+
+        Returns:
+            Generator[StreamBatch, None, None]: generator of batches, close it to save its checkpoint
+        """
+        return batch_stream_generator(**self._stream_source(stream), **stream_options)
 
     def create_new_auth_token(self, expires_in: PositiveInt = 10) -> str:
         """Create a new access token for a user from the wallet credentials
@@ -1078,14 +1735,7 @@ class Warpcast:
         """
         if not self.wallet:
             raise Exception("Wallet not set")
-        auth_put_request = AuthPutRequest(params=params)
-        payload = auth_put_request.model_dump(by_alias=True, exclude_none=True)
-        encoded_payload = canonicaljson.encode_canonical_json(payload)
-        signable_message = encode_defunct(primitive=encoded_payload)
-        signed_message: SignedMessage = self.wallet.sign_message(signable_message)
-        data_hex_array = bytearray(signed_message.signature)
-        encoded = base64.b64encode(data_hex_array).decode()
-        return f"Bearer eip191:{encoded}"
+        return generate_custody_auth_header(self.wallet, params)
 
 
 def get_wallet(
@@ -1111,6 +1761,55 @@ def get_wallet(
     return None
 
 
+def generate_custody_auth_header(wallet: LocalAccount, params: AuthParams) -> str:
+    """Sign the canonical auth request with the custody wallet
+
+    Args:
+        wallet (LocalAccount): custody wallet
+        params (AuthParams): authorization parameters
+
+    Returns:
+        str: custody authorization header
+    """
+    auth_put_request = AuthPutRequest(params=params)
+    payload = auth_put_request.model_dump(by_alias=True, exclude_none=True)
+    encoded_payload = canonicaljson.encode_canonical_json(payload)
+    signable_message = encode_defunct(primitive=encoded_payload)
+    signed_message: SignedMessage = wallet.sign_message(signable_message)
+    data_hex_array = bytearray(signed_message.signature)
+    encoded = base64.b64encode(data_hex_array).decode()
+    return f"Bearer eip191:{encoded}"
+
+
+def user_lookups(
+    outcomes: List[Outcome[Any, ApiUser]], mode: str = "validate"
+) -> UserLookupsResult:
+    """Build the result of a bulk user lookup
+
+    Args:
+        outcomes (List[Outcome[Any, ApiUser]]): key, user and exception of every lookup
+        mode (str, optional): response mode the users were parsed in, defaults to
+            "validate"
+
+    Returns:
+        UserLookupsResult: one result per lookup
+    """
+    return build_result(
+        UserLookupsResult,
+        mode,
+        results=[
+            build_result(
+                UserLookup,
+                mode,
+                key=key,
+                user=user,
+                error=None if error is None else str(error),
+            )
+            for key, user, error in outcomes
+        ],
+    )
+
+
 def now_ms() -> int:
     """Get the current time in milliseconds
 
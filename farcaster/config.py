@@ -1,6 +1,7 @@
 from typing import Any, Dict, Optional
 
 from farcaster.models import *
+from farcaster.utils.response_mode import ResponseMode
 
 FARCASTER_API_BASE_URL = "https://api.warpcast.com/v2/"
 
@@ -10,6 +11,16 @@ class ConfigurationParams(BaseModel):
     password: Optional[str] = None
     base_path: str = FARCASTER_API_BASE_URL
     base_options: Optional[Dict[Any, Any]] = None
+    coalesce_requests: bool = True
+    validate_json: bool = True
+    response_mode: ResponseMode = "validate"
+    pool_connections: PositiveInt = 10
+    pool_maxsize: PositiveInt = 10
+    pool_block: bool = False
+    pool_timeout: Optional[float] = None
+    keep_alive: bool = True
+    connect_timeout: Optional[float] = 10.0
+    read_timeout: Optional[float] = 30.0
 
 
 class Configuration(BaseModel):
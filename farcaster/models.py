@@ -615,6 +615,7 @@ class CastReactionsDeleteRequest(BaseModel):
 
 class UsersResult(BaseModel):
     users: List[ApiUser]
+    cursor: Optional[str] = None
 
 
 class IterableUsersResult(BaseModel):
@@ -749,6 +750,16 @@ class UserByUsernameGetResponse(BaseModel):
     result: UserResult
 
 
+class UserLookup(BaseModel):
+    key: Union[int, str]
+    user: Optional[ApiUser] = None
+    error: Optional[str] = None
+
+
+class UserLookupsResult(BaseModel):
+    results: List[UserLookup]
+
+
 class VerificationsResult(BaseModel):
     verifications: List[ApiVerification]
 
@@ -0,0 +1,233 @@
+"""Compact, immutable records built from the schema of the Pydantic models.
+
+A record is a named tuple with the fields of its model, nested models become records
+and lists become tuples. Records carry no validation state or ``__dict__``, so they
+take a fraction of the memory of the models and are much cheaper to build, which
+matters when keeping millions of casts in memory. They are read with the same
+attributes as the models, ``cast.author.display_name``.
+
+Records are built from decoded JSON without validating it, use the ``record``
+response mode of the clients or :func:`from_json`, or converted from models with
+:func:`from_model`.
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+import functools
+import inspect
+from collections import namedtuple
+
+from pydantic import BaseModel, RootModel
+
+from farcaster import models
+from farcaster.utils.interning import intern_user
+
+Converter = Optional[Callable[[Any], Any]]
+
+
+class _Field(NamedTuple):
+    name: str
+    alias: str
+    default: Any
+    convert: Converter
+
+
+def _is_model(annotation: Any) -> bool:
+    return inspect.isclass(annotation) and issubclass(annotation, BaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def record_type(model: Type[BaseModel]) -> Type[Any]:
+    """Get the record type of a model.
+
+    Args:
+        model: The Pydantic model
+
+    Returns:
+        Type[Any]: a named tuple type with the fields of the model
+    """
+    base = namedtuple(model.__name__, list(model.model_fields))  # type: ignore[misc]
+    return type(
+        model.__name__,
+        (base,),
+        {"__slots__": (), "__module__": __name__, "__doc__": model.__doc__},
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _plan(model: Type[BaseModel]) -> List[_Field]:
+    return [
+        _Field(
+            name,
+            field.alias or name,
+            None if field.is_required() else field.get_default(),
+            _converter(field.annotation),
+        )
+        for name, field in model.model_fields.items()
+    ]
+
+
+def _converter(annotation: Any) -> Converter:
+    origin = get_origin(annotation)
+    if origin is Union:
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(members) == 1:
+            return _converter(members[0])
+        choices = [member for member in members if _is_model(member)]
+        return functools.partial(_from_union, choices) if choices else None
+    if origin in (list, List, tuple, Tuple):
+        item = _converter(get_args(annotation)[0]) if get_args(annotation) else None
+        if item is None:
+            return tuple
+        return lambda values: tuple([item(v) for v in values])
+    if _is_model(annotation):
+        if issubclass(annotation, RootModel):
+            return _converter(annotation.model_fields["root"].annotation)
+        return _record_builder(annotation)
+    return None
+
+
+def _record_builder(model: Type[BaseModel]) -> Callable[[Dict[str, Any]], Any]:
+    if issubclass(model, RootModel):
+        return functools.partial(from_json, model)
+    if issubclass(model, models.ApiUser):
+        kind = record_type(model)
+        return lambda data: intern_user(kind, data, _builder(model))
+    # resolved on first use, nested models may not be planned yet
+    return lambda data: _builder(model)(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _required_aliases(model: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(
+        field.alias or name
+        for name, field in model.model_fields.items()
+        if field.is_required()
+    )
+
+
+def _from_union(choices: List[Type[BaseModel]], data: Any) -> Any:
+    if not isinstance(data, dict):
+        return data
+    # the first model whose required fields are all present, like smart unions
+    for model in choices:
+        if all(alias in data for alias in _required_aliases(model)):
+            return _record_builder(model)(data)
+    return _record_builder(choices[0])(data)
+
+
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=None)
+def _builder(model: Type[BaseModel]) -> Callable[[Dict[str, Any]], Any]:
+    # the fields are read in one pass of data.get, only the aliased fields missing
+    # from data and the converted ones are revisited, a closure per field is slower
+    kind = record_type(model)
+    plan = _plan(model)
+    keys = [field.alias for field in plan]
+    defaults = [
+        _MISSING if field.alias != field.name else field.default for field in plan
+    ]
+    aliased = [
+        (i, field.name, field.default)
+        for i, field in enumerate(plan)
+        if field.alias != field.name
+    ]
+    converted = [
+        (i, field.convert) for i, field in enumerate(plan) if field.convert is not None
+    ]
+
+    def build(data: Dict[str, Any]) -> Any:
+        values = list(map(data.get, keys, defaults))
+        for i, name, default in aliased:
+            if values[i] is _MISSING:
+                values[i] = data.get(name, default)
+        for i, convert in converted:
+            if values[i] is not None:
+                values[i] = convert(values[i])
+        return tuple.__new__(kind, values)
+
+    return build
+
+
+def from_json(model: Type[BaseModel], data: Dict[str, Any]) -> Any:
+    """Build the record of a model from decoded JSON, without validating it.
+
+    Missing fields take the default of the model field, or ``None`` when it is
+    required.
+
+    Args:
+        model: The Pydantic model describing ``data``
+        data: The decoded JSON object, with camelCase or snake_case keys
+
+    Returns:
+        Any: the record
+    """
+    if issubclass(model, RootModel):
+        convert = _converter(model.model_fields["root"].annotation)
+        return convert(data) if convert is not None else data
+    return _record_builder(model)(data)
+
+
+def from_model(instance: BaseModel) -> Any:
+    """Convert a Pydantic model to its record.
+
+    Args:
+        instance: The model
+
+    Returns:
+        Any: the record
+    """
+    if isinstance(instance, RootModel):
+        return _record_value(instance.root)
+    return tuple.__new__(
+        record_type(type(instance)),
+        [
+            _record_value(getattr(instance, name))
+            for name in type(instance).model_fields
+        ],
+    )
+
+
+def _record_value(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return from_model(value)
+    if isinstance(value, list):
+        return tuple([_record_value(item) for item in value])
+    return value
+
+
+def make(model: Type[BaseModel], **fields: Any) -> Any:
+    """Build the record of a model from field values that are records already.
+
+    Args:
+        model: The Pydantic model
+        fields: The values of the fields, missing ones take their default
+
+    Returns:
+        Any: the record
+    """
+    return tuple.__new__(
+        record_type(model),
+        [fields.get(field.name, field.default) for field in _plan(model)],
+    )
+
+
+ApiUser = record_type(models.ApiUser)
+ApiCast = record_type(models.ApiCast)
+ApiCastReaction = record_type(models.ApiCastReaction)
+MentionNotification = record_type(models.MentionNotification)
+ReplyNotification = record_type(models.ReplyNotification)
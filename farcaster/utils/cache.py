@@ -0,0 +1,334 @@
+from typing import Any, Dict, Iterator, List, Optional
+from typing import OrderedDict as OrderedDictType
+from typing import Tuple
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import canonicaljson
+
+MINUTE = 60
+DAY = 24 * 60 * MINUTE
+
+# Seconds each endpoint may be served from the cache. Casts are immutable once
+# published, only their reaction counters drift, while profiles change often.
+DEFAULT_TTLS: Dict[str, float] = {
+    "cast": 30 * DAY,
+    "user": MINUTE,
+    "user-by-username": MINUTE,
+    "user-by-verification": MINUTE,
+    "custody-address": DAY,
+    "verifications": 5 * MINUTE,
+}
+
+
+def cache_key(path: str, params: Dict[Any, Any]) -> str:
+    """Build the cache key of a request from its path and canonicalized params.
+
+    Parameters set to ``None`` are dropped, like ``requests`` does when encoding them.
+
+    Args:
+        path: The endpoint path
+        params: The query parameters
+
+    Returns:
+        str: the cache key
+    """
+    params = {str(k): v for k, v in params.items() if v is not None}
+    return f"{path}?{canonicaljson.encode_canonical_json(params).decode()}"
+
+
+class ResponseCache(ABC):
+    """Base class of the caches that can be put in front of ``Warpcast._get``.
+
+    Only endpoints with a TTL in ``ttls`` are cached. Subclasses implement the storage
+    through ``_load``, ``_store``, ``_delete``, ``clear`` and ``__len__``.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None):
+        """Initialize a :class:`.ResponseCache` instance.
+
+        Args:
+            ttls: Seconds each endpoint path may be cached, defaults to ``DEFAULT_TTLS``
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def caches(self, path: str) -> bool:
+        """Test if responses of ``path`` are cached."""
+        return bool(self.ttls.get(path))
+
+    def get(self, path: str, params: Dict[Any, Any]) -> Optional[Dict[Any, Any]]:
+        """Return the cached response of a request if it is still fresh.
+
+        Args:
+            path: The endpoint path
+            params: The query parameters
+
+        Returns:
+            Optional[Dict[Any, Any]]: the cached response or ``None`` on a miss
+        """
+        value = self._load(cache_key(path, params), time.time())
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, path: str, params: Dict[Any, Any], value: Dict[Any, Any]) -> None:
+        """Cache the response of a request for the TTL of its path.
+
+        Args:
+            path: The endpoint path
+            params: The query parameters
+            value: The decoded response
+        """
+        if self.caches(path):
+            self._store(cache_key(path, params), value, time.time() + self.ttls[path])
+
+    def invalidate(self, path: str, params: Dict[Any, Any]) -> None:
+        """Drop the cached response of a single request.
+
+        Args:
+            path: The endpoint path
+            params: The query parameters
+        """
+        self._delete(cache_key(path, params))
+
+    @abstractmethod
+    def _load(self, key: str, now: float) -> Optional[Dict[Any, Any]]:
+        ...
+
+    @abstractmethod
+    def _store(self, key: str, value: Dict[Any, Any], expires_at: float) -> None:
+        ...
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every cached response."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryCache(ResponseCache):
+    """An in-memory, thread-safe response cache with TTLs and LRU eviction."""
+
+    _entries: OrderedDictType[str, Tuple[float, Dict[Any, Any]]]
+
+    def __init__(
+        self, max_items: int = 10_000, ttls: Optional[Dict[str, float]] = None
+    ):
+        """Initialize a :class:`.MemoryCache` instance.
+
+        Args:
+            max_items: The maximum number of responses kept before evicting the least
+                recently used one
+            ttls: Seconds each endpoint path may be cached, defaults to ``DEFAULT_TTLS``
+        """
+        super().__init__(ttls)
+        self.max_items = max_items
+        self._entries = OrderedDict()
+
+    def _load(self, key: str, now: float) -> Optional[Dict[Any, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: str, value: Dict[Any, Any], expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(ResponseCache):
+    """A persistent response cache stored in a SQLite database.
+
+    The database runs in WAL mode with a busy timeout, so several processes on the same
+    machine can share one file. Threads check out connections from a small pool, so
+    short-lived threads do not leave connections open behind them. Expired entries are
+    skipped on reads and deleted by a background compaction thread, which also trims
+    the entries closest to expiry once ``max_items`` is exceeded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_items: Optional[int] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        compact_interval: Optional[float] = 300.0,
+        busy_timeout: float = 5.0,
+        pool_size: int = 4,
+    ):
+        """Initialize a :class:`.SQLiteCache` instance.
+
+        Args:
+            path: The path of the database file, created if missing
+            max_items: The maximum number of responses kept after a compaction,
+                defaults to unbounded
+            ttls: Seconds each endpoint path may be cached, defaults to ``DEFAULT_TTLS``
+            compact_interval: Seconds between two background compactions, ``None``
+                disables the background thread
+            busy_timeout: Seconds to wait for a lock held by another connection
+            pool_size: The maximum number of idle connections kept open
+        """
+        super().__init__(ttls)
+        self.path = path
+        self.max_items = max_items
+        self.busy_timeout = busy_timeout
+        self.pool_size = pool_size
+        self._idle: List[sqlite3.Connection] = []
+        self._closed = threading.Event()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_expires_at "
+                "ON responses (expires_at)"
+            )
+        self._compactor: Optional[threading.Thread] = None
+        if compact_interval:
+            self._compactor = threading.Thread(
+                target=self._compact_forever, args=(compact_interval,), daemon=True
+            )
+            self._compactor.start()
+
+    def __enter__(self) -> "SQLiteCache":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path, timeout=self.busy_timeout, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            connection = self._connect()
+        try:
+            with connection:
+                yield connection
+        finally:
+            with self._lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+
+    def _compact_forever(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.compact()
+            except sqlite3.Error as e:  # pragma: no cover
+                logging.warning(f"Cache compaction failed: {e}")
+
+    def compact(self) -> int:
+        """Delete the expired entries and trim the cache down to ``max_items``.
+
+        Returns:
+            int: the number of deleted entries
+        """
+        with self._connection() as connection:
+            deleted = connection.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            if self.max_items is not None:
+                evicted = connection.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                    "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_items,),
+                ).rowcount
+                with self._lock:
+                    self.evictions += evicted
+                deleted += evicted
+        return deleted
+
+    def _load(self, key: str, now: float) -> Optional[Dict[Any, Any]]:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _store(self, key: str, value: Dict[Any, Any], expires_at: float) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Stop the compaction thread and close the idle connections."""
+        self._closed.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        with self._lock:
+            for connection in self._idle:
+                connection.close()
+            self._idle.clear()
+
+    def __len__(self) -> int:
+        with self._connection() as connection:
+            row = connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return int(row[0])
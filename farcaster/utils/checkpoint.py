@@ -0,0 +1,250 @@
+from typing import Any, Callable, List, Optional, Tuple
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from pydantic import BaseModel
+
+
+class StreamState(BaseModel):
+    """The saved position of a stream.
+
+    ``seen`` holds the attribute and the order value of the most recently handled items,
+    oldest first. The order value is the timestamp of casts and notifications and the
+    fid of users. ``high_water`` is the newest order value and ``floor`` the oldest one
+    in ``seen``: a resumed stream drops anything older, it was handled before.
+    """
+
+    seen: List[Tuple[Any, Optional[int]]] = []
+    high_water: Optional[int] = None
+    floor: Optional[int] = None
+    saved_at: float = 0.0
+
+
+class CheckpointStore(ABC):
+    """A place to save the state of streams, by stream name."""
+
+    @abstractmethod
+    def load(self, name: str) -> Optional[StreamState]:
+        """Load the state of a stream.
+
+        Args:
+            name: The name of the stream
+
+        Returns:
+            Optional[StreamState]: the state, ``None`` if it was never saved
+        """
+
+    @abstractmethod
+    def save(self, name: str, state: StreamState) -> None:
+        """Save the state of a stream, replacing the previous one.
+
+        Args:
+            name: The name of the stream
+            state: The state to save
+        """
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Checkpoints saved as one JSON file per stream in a directory.
+
+    Files are replaced atomically, a crash while saving leaves the previous checkpoint.
+    """
+
+    def __init__(self, directory: str):
+        """Initialize a :class:`.FileCheckpointStore` instance.
+
+        Args:
+            directory: The directory of the checkpoint files, created if missing
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, name: str) -> Optional[StreamState]:
+        try:
+            with open(self._path(name), "rb") as file:
+                return StreamState.model_validate_json(file.read())
+        except FileNotFoundError:
+            return None
+
+    def save(self, name: str, state: StreamState) -> None:
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                file.write(state.model_dump_json())
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self._path(name))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Checkpoints saved in a SQLite database, one row per stream.
+
+    Like :class:`~farcaster.utils.cache.SQLiteCache`, the database runs in WAL mode
+    with a busy timeout, so several processes can keep their checkpoints in one file.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        """Initialize a :class:`.SQLiteCheckpointStore` instance.
+
+        Args:
+            path: The path of the database file, created if missing
+            busy_timeout: Seconds to wait for a lock held by another connection
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=busy_timeout, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA busy_timeout={int(busy_timeout * 1000)}")
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "name TEXT PRIMARY KEY, state TEXT NOT NULL, saved_at REAL NOT NULL)"
+            )
+
+    def __enter__(self) -> "SQLiteCheckpointStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def load(self, name: str) -> Optional[StreamState]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT state FROM checkpoints WHERE name = ?", (name,)
+            ).fetchone()
+        return None if row is None else StreamState.model_validate_json(row[0])
+
+    def save(self, name: str, state: StreamState) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO checkpoints (name, state, saved_at) "
+                "VALUES (?, ?, ?)",
+                (name, state.model_dump_json(), state.saved_at),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class StreamCheckpoint:
+    """Periodically saves the position of a stream so a restarted consumer resumes it.
+
+    Pass it to a stream with the ``checkpoint`` stream option. An item counts as
+    handled once the consumer asks for the next one, so the checkpoint never skips an
+    item that was not handled. It is saved every ``interval`` seconds and when the
+    stream is closed: a stopped consumer resumes with the last item it received, a
+    crashed one with the items received since the last save.
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        name: str,
+        interval: float = 5.0,
+        window: int = 301,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a :class:`.StreamCheckpoint` instance.
+
+        Args:
+            store: Where the checkpoint is saved
+            name: The name of the stream in the store
+            interval: Seconds between two saves, 0 saves after every item
+            window: The number of recent item attributes saved, like the stream keeps
+            clock: A monotonic clock in seconds
+        """
+        self.store = store
+        self.name = name
+        self.interval = interval
+        self.window = window
+        self.high_water: Optional[int] = None
+        self.saves = 0
+        self._clock = clock
+        self._recent: "OrderedDict[Any, Optional[int]]" = OrderedDict()
+        self._floor: Optional[int] = None
+        self._restored_floor: Optional[int] = None
+        self._saved_at = clock()
+        self._dirty = False
+
+    def restore(self) -> Optional[StreamState]:
+        """Load the saved position of the stream.
+
+        Returns:
+            Optional[StreamState]: the saved state, ``None`` for a new stream
+        """
+        state = self.store.load(self.name)
+        if state is not None:
+            self._recent = OrderedDict(state.seen)
+            self.high_water = state.high_water
+            self._floor = self._restored_floor = state.floor
+        return state
+
+    @property
+    def seen(self) -> List[Any]:
+        """The attributes of the recently handled items, oldest first."""
+        return list(self._recent)
+
+    def behind(self, order: Optional[int]) -> bool:
+        """Test if an item is older than everything the restored checkpoint remembers.
+
+        Args:
+            order: The order value of the item
+
+        Returns:
+            bool: ``True`` if it was handled before the checkpoint was saved
+        """
+        floor = self._restored_floor
+        return floor is not None and order is not None and order < floor
+
+    def handled(self, attribute: Any, order: Optional[int]) -> None:
+        """Record that an item was handled, saving the checkpoint when it is due.
+
+        Args:
+            attribute: The attribute identifying the item
+            order: The order value of the item
+        """
+        self._recent[attribute] = order
+        self._recent.move_to_end(attribute)
+        if len(self._recent) > self.window:
+            self._recent.popitem(last=False)
+        if order is not None and (self.high_water is None or order > self.high_water):
+            self.high_water = order
+        self._dirty = True
+        if self._clock() - self._saved_at >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        """Save the checkpoint now, if anything changed since the last save."""
+        self._saved_at = self._clock()
+        if not self._dirty:
+            return
+        orders = [order for order in self._recent.values() if order is not None]
+        if orders:
+            self._floor = min(orders)
+        self.store.save(
+            self.name,
+            StreamState(
+                seen=list(self._recent.items()),
+                high_water=self.high_water,
+                floor=self._floor,
+                saved_at=time.time(),
+            ),
+        )
+        self._dirty = False
+        self.saves += 1
@@ -0,0 +1,178 @@
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import os
+from operator import attrgetter
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+Column = Tuple[str, str, Callable[[Any], Any]]
+
+
+def _getter(path: str) -> Callable[[Any], Any]:
+    get = attrgetter(path)
+
+    def getter(item: Any) -> Any:
+        try:
+            return get(item)
+        except AttributeError:  # a missing optional parent, like parent_author
+            return None
+
+    return getter
+
+
+def _column(name: str, alias: str, path: Optional[str] = None) -> Column:
+    return name, alias, _getter(path or name)
+
+
+CAST_COLUMNS: List[Column] = [
+    _column("hash", "string"),
+    _column("thread_hash", "string"),
+    _column("parent_hash", "string"),
+    _column("author_fid", "int64", "author.fid"),
+    _column("author_username", "string", "author.username"),
+    _column("author_display_name", "string", "author.display_name"),
+    _column("author_follower_count", "int64", "author.follower_count"),
+    _column("author_following_count", "int64", "author.following_count"),
+    _column("parent_author_fid", "int64", "parent_author.fid"),
+    _column("text", "string"),
+    _column("timestamp", "timestamp[ms]"),
+    _column("replies", "int64", "replies.count"),
+    _column("reactions", "int64", "reactions.count"),
+    _column("recasts", "int64", "recasts.count"),
+    _column("watches", "int64", "watches.count"),
+    _column("recast", "bool"),
+    _column("deleted", "bool"),
+]
+
+USER_COLUMNS: List[Column] = [
+    _column("fid", "int64"),
+    _column("username", "string"),
+    _column("display_name", "string"),
+    _column("registered_at", "timestamp[ms]"),
+    _column("pfp_url", "string", "pfp.url"),
+    _column("pfp_verified", "bool", "pfp.verified"),
+    _column("bio", "string", "profile.bio.text"),
+    _column("follower_count", "int64"),
+    _column("following_count", "int64"),
+    _column("referrer_username", "string"),
+]
+
+
+def _require_pyarrow() -> None:
+    if pa is None:  # pragma: no cover
+        raise ImportError(
+            "Columnar export requires pyarrow, "
+            "install it with `pip install farcaster[arrow]`"
+        )
+
+
+def schema(columns: List[Column] = CAST_COLUMNS) -> "pa.Schema":
+    """Get the Arrow schema of columns.
+
+    Args:
+        columns: The columns, :data:`CAST_COLUMNS` or :data:`USER_COLUMNS`
+
+    Returns:
+        pa.Schema: the schema
+    """
+    _require_pyarrow()
+    return pa.schema([(name, pa.type_for_alias(alias)) for name, alias, _ in columns])
+
+
+def record_batches(
+    items: Iterable[Any],
+    columns: List[Column] = CAST_COLUMNS,
+    batch_size: int = 10_000,
+) -> Iterator["pa.RecordBatch"]:
+    """Flatten items into Arrow record batches of at most ``batch_size`` rows.
+
+    Items are consumed lazily, so any paginated iterator like ``iter_casts`` or a
+    stream like ``stream_casts`` can be exported with bounded memory. The ``None``
+    a stream yields when it pauses flushes the rows gathered so far. Models, records
+    and raw responses are all read through their attributes.
+
+    Args:
+        items: The casts or users
+        columns: The columns to flatten them into, :data:`CAST_COLUMNS` or
+            :data:`USER_COLUMNS`
+        batch_size: The maximum number of rows per batch
+
+    Yields:
+        pa.RecordBatch: the next batch
+    """
+    _require_pyarrow()
+    batch_schema = schema(columns)
+    rows: List[Any] = []
+    for item in items:
+        if item is not None:
+            rows.append(item)
+            if len(rows) < batch_size:
+                continue
+        if rows:
+            yield _record_batch(rows, columns, batch_schema)
+            rows = []
+    if rows:
+        yield _record_batch(rows, columns, batch_schema)
+
+
+def _record_batch(
+    rows: List[Any], columns: List[Column], batch_schema: "pa.Schema"
+) -> "pa.RecordBatch":
+    arrays = [
+        pa.array([get(row) for row in rows], type=field.type)
+        for (_, _, get), field in zip(columns, batch_schema)
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=batch_schema)
+
+
+def to_table(
+    items: Iterable[Any],
+    columns: List[Column] = CAST_COLUMNS,
+    batch_size: int = 10_000,
+) -> "pa.Table":
+    """Flatten items into an Arrow table, ready for ``to_pandas()``.
+
+    Args:
+        items: The casts or users
+        columns: The columns to flatten them into
+        batch_size: The number of rows flattened at once
+
+    Returns:
+        pa.Table: the table
+    """
+    return pa.Table.from_batches(
+        record_batches(items, columns, batch_size), schema=schema(columns)
+    )
+
+
+def write_parquet(
+    items: Iterable[Any],
+    where: Union[str, "os.PathLike[str]"],
+    columns: List[Column] = CAST_COLUMNS,
+    batch_size: int = 10_000,
+    **options: Any,
+) -> int:
+    """Stream items into a Parquet file, one row group per batch.
+
+    Args:
+        items: The casts or users
+        where: The path of the Parquet file
+        columns: The columns to flatten them into
+        batch_size: The maximum number of rows held in memory and per row group
+        options: Options of ``pyarrow.parquet.ParquetWriter``, like ``compression``
+
+    Returns:
+        int: the number of rows written
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    written = 0
+    with pq.ParquetWriter(where, schema(columns), **options) as writer:
+        for batch in record_batches(items, columns, batch_size):
+            writer.write_table(pa.Table.from_batches([batch]))
+            written += batch.num_rows
+    return written
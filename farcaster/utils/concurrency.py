@@ -0,0 +1,107 @@
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+K = TypeVar("K")
+R = TypeVar("R")
+
+Outcome = Tuple[K, Optional[R], Optional[BaseException]]
+
+
+def _identity(key: Any) -> Any:
+    return key
+
+
+def _unique(
+    keys: Iterable[K], normalize: Callable[[K], Hashable]
+) -> Tuple[List[K], Dict[Hashable, K]]:
+    ordered: List[K] = list(keys)
+    unique: Dict[Hashable, K] = {}
+    for key in ordered:
+        unique.setdefault(normalize(key), key)
+    return ordered, unique
+
+
+def fan_out(
+    function: Callable[[K], R],
+    keys: Iterable[K],
+    concurrency: int = 8,
+    normalize: Callable[[K], Hashable] = _identity,
+) -> List[Outcome[K, R]]:
+    """Call ``function`` once per distinct key on a bounded thread pool.
+
+    Duplicate keys (after ``normalize``) are only looked up once and share their
+    outcome. A failing key does not fail the batch, its exception is returned instead.
+
+    Args:
+        function: A function that looks up a single key
+        keys: The keys to look up
+        concurrency: The maximum number of lookups running at once
+        normalize: A function mapping a key to the value used to drop duplicates
+
+    Returns:
+        List[Outcome[K, R]]: ``(key, result, exception)`` for every key, in input order
+    """
+    ordered, unique = _unique(keys, normalize)
+    outcomes: Dict[Hashable, Tuple[Optional[R], Optional[BaseException]]] = {}
+    if unique:
+        with ThreadPoolExecutor(
+            max_workers=max(min(concurrency, len(unique)), 1)
+        ) as pool:
+            futures = {
+                # every lookup runs in a copy of the caller's context
+                normalized: pool.submit(contextvars.copy_context().run, function, key)
+                for normalized, key in unique.items()
+            }
+            for normalized, future in futures.items():
+                exception = future.exception()
+                outcomes[normalized] = (
+                    None if exception else future.result(),
+                    exception,
+                )
+    return [(key, *outcomes[normalize(key)]) for key in ordered]
+
+
+async def async_fan_out(
+    function: Callable[[K], Awaitable[R]],
+    keys: Iterable[K],
+    concurrency: int = 8,
+    normalize: Callable[[K], Hashable] = _identity,
+) -> List[Outcome[K, R]]:
+    """The ``asyncio`` counterpart of :func:`fan_out`, bounded by a semaphore.
+
+    Args:
+        function: A coroutine function that looks up a single key
+        keys: The keys to look up
+        concurrency: The maximum number of lookups running at once
+        normalize: A function mapping a key to the value used to drop duplicates
+
+    Returns:
+        List[Outcome[K, R]]: ``(key, result, exception)`` for every key, in input order
+    """
+    ordered, unique = _unique(keys, normalize)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def call(key: K) -> Tuple[Optional[R], Optional[BaseException]]:
+        async with semaphore:
+            try:
+                return await function(key), None
+            except Exception as e:  # pylint: disable=broad-except
+                return None, e
+
+    results = await asyncio.gather(*(call(key) for key in unique.values()))
+    outcomes = dict(zip(unique.keys(), results))
+    return [(key, *outcomes[normalize(key)]) for key in ordered]
@@ -0,0 +1,433 @@
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import contextvars
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+DIRECTIONS = ("followers", "following")
+
+Edge = Tuple[int, int]
+CursorKey = Tuple[int, str]
+
+
+class CrawlState:
+    """The saved progress of a crawl.
+
+    ``nodes`` maps every fid discovered to its depth, ``done`` holds the fids crawled
+    completely and ``cursors`` the cursor of the next page of a fid in a direction,
+    ``None`` once that direction is complete.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[int, int] = {}
+        self.done: Set[int] = set()
+        self.cursors: Dict[CursorKey, Optional[str]] = {}
+
+
+class CrawlStore(ABC):
+    """Where a crawl saves its edges and its progress, so it can be resumed.
+
+    The edges of a page, the fids it discovered and the cursor of the next page are
+    saved together: a resumed crawl repeats at most the page that was in flight.
+    """
+
+    @abstractmethod
+    def restore(self) -> CrawlState:
+        """Load the progress of the crawl.
+
+        Returns:
+            CrawlState: the progress, empty for a new crawl
+        """
+
+    @abstractmethod
+    def add_page(
+        self,
+        fid: int,
+        direction: str,
+        edges: List[Edge],
+        discovered: List[Tuple[int, int]],
+        cursor: Optional[str],
+    ) -> None:
+        """Save a crawled page.
+
+        Args:
+            fid: The fid being crawled
+            direction: ``followers`` or ``following``
+            edges: The ``(follower, followee)`` edges of the page
+            discovered: The ``(fid, depth)`` of the fids first seen in the page
+            cursor: The cursor of the next page, ``None`` for the last one
+        """
+
+    @abstractmethod
+    def add_nodes(self, nodes: List[Tuple[int, int]]) -> None:
+        """Save fids to crawl, like the seeds of the crawl.
+
+        Args:
+            nodes: The ``(fid, depth)`` of the fids
+        """
+
+    @abstractmethod
+    def finish(self, fid: int) -> None:
+        """Mark a fid as crawled completely.
+
+        Args:
+            fid: The fid
+        """
+
+    @abstractmethod
+    def edges(self) -> Iterator[Edge]:
+        """Iterate over the edges saved.
+
+        Yields:
+            Edge: the next ``(follower, followee)`` edge
+        """
+
+
+class SQLiteCrawlStore(CrawlStore):
+    """A crawl saved in a SQLite database.
+
+    Like :class:`~farcaster.utils.checkpoint.SQLiteCheckpointStore`, the database runs
+    in WAL mode with one connection shared by the workers. Every page is saved in one
+    transaction and edges are unique, so a repeated page adds nothing.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        """Initialize a :class:`.SQLiteCrawlStore` instance.
+
+        Args:
+            path: The path of the database file, created if missing
+            busy_timeout: Seconds to wait for a lock held by another connection
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=busy_timeout, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA busy_timeout={int(busy_timeout * 1000)}")
+        with self._lock, self._connection:
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS nodes ("
+                "fid INTEGER PRIMARY KEY, depth INTEGER NOT NULL, "
+                "done INTEGER NOT NULL DEFAULT 0);"
+                "CREATE TABLE IF NOT EXISTS cursors ("
+                "fid INTEGER NOT NULL, direction TEXT NOT NULL, cursor TEXT, "
+                "PRIMARY KEY (fid, direction));"
+                "CREATE TABLE IF NOT EXISTS edges ("
+                "follower INTEGER NOT NULL, followee INTEGER NOT NULL, "
+                "PRIMARY KEY (follower, followee)) WITHOUT ROWID;"
+            )
+
+    def __enter__(self) -> "SQLiteCrawlStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def restore(self) -> CrawlState:
+        state = CrawlState()
+        with self._lock:
+            for fid, depth, done in self._connection.execute(
+                "SELECT fid, depth, done FROM nodes ORDER BY depth, rowid"
+            ):
+                state.nodes[fid] = depth
+                if done:
+                    state.done.add(fid)
+            for fid, direction, cursor in self._connection.execute(
+                "SELECT fid, direction, cursor FROM cursors"
+            ):
+                state.cursors[(fid, direction)] = cursor
+        return state
+
+    def add_page(
+        self,
+        fid: int,
+        direction: str,
+        edges: List[Edge],
+        discovered: List[Tuple[int, int]],
+        cursor: Optional[str],
+    ) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO edges (follower, followee) VALUES (?, ?)", edges
+            )
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO nodes (fid, depth) VALUES (?, ?)", discovered
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cursors (fid, direction, cursor) "
+                "VALUES (?, ?, ?)",
+                (fid, direction, cursor),
+            )
+
+    def add_nodes(self, nodes: List[Tuple[int, int]]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO nodes (fid, depth) VALUES (?, ?)", nodes
+            )
+
+    def finish(self, fid: int) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE nodes SET done = 1 WHERE fid = ?", (fid,))
+
+    def edges(self) -> Iterator[Edge]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT follower, followee FROM edges"
+            ).fetchall()
+        yield from rows
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class EdgeListCrawlStore(CrawlStore):
+    """A crawl saved as a tab separated edge list and a journal of its progress.
+
+    ``edges.tsv`` gets one ``follower<TAB>followee`` line per edge and ``crawl.log``
+    one JSON line per change of the progress, replayed to resume. Both are only
+    appended to, so an edge may be written twice: when both directions are crawled, it
+    is found in the followers of the followee and the following of the follower, and a
+    crash repeats the edges of the page that was in flight, written before its cursor.
+    :meth:`edges` skips the repeated lines.
+    """
+
+    def __init__(self, directory: str):
+        """Initialize an :class:`.EdgeListCrawlStore` instance.
+
+        Args:
+            directory: The directory of the files, created if missing
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.edges_path = os.path.join(directory, "edges.tsv")
+        self.log_path = os.path.join(directory, "crawl.log")
+        self._lock = threading.Lock()
+        self._edges = open(self.edges_path, "a")
+        self._log = open(self.log_path, "a")
+
+    def __enter__(self) -> "EdgeListCrawlStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def restore(self) -> CrawlState:
+        state = CrawlState()
+        with self._lock, open(self.log_path) as log:
+            for line in log:
+                try:
+                    entry = json.loads(line)
+                except ValueError:  # the last line of a crash
+                    continue
+                if entry[0] == "node":
+                    state.nodes.setdefault(entry[1], entry[2])
+                elif entry[0] == "cursor":
+                    state.cursors[(entry[1], entry[2])] = entry[3]
+                elif entry[0] == "done":
+                    state.done.add(entry[1])
+        return state
+
+    def _append(self, entries: Iterable[List[Any]]) -> None:
+        self._log.writelines(f"{json.dumps(entry)}\n" for entry in entries)
+        self._log.flush()
+
+    def add_page(
+        self,
+        fid: int,
+        direction: str,
+        edges: List[Edge],
+        discovered: List[Tuple[int, int]],
+        cursor: Optional[str],
+    ) -> None:
+        with self._lock:
+            self._edges.writelines(f"{a}\t{b}\n" for a, b in edges)
+            self._edges.flush()
+            self._append(
+                [
+                    *(["node", node, depth] for node, depth in discovered),
+                    ["cursor", fid, direction, cursor],
+                ]
+            )
+
+    def add_nodes(self, nodes: List[Tuple[int, int]]) -> None:
+        with self._lock:
+            self._append(["node", fid, depth] for fid, depth in nodes)
+
+    def finish(self, fid: int) -> None:
+        with self._lock:
+            self._append([["done", fid]])
+
+    def edges(self) -> Iterator[Edge]:
+        with self._lock:
+            self._edges.flush()
+        seen: Set[Edge] = set()
+        with open(self.edges_path) as edges:
+            for line in edges:
+                follower, followee = line.split("\t")
+                edge = (int(follower), int(followee))
+                if edge not in seen:
+                    seen.add(edge)
+                    yield edge
+
+    def close(self) -> None:
+        """Close the files."""
+        with self._lock:
+            self._edges.close()
+            self._log.close()
+
+
+class GraphCrawler:
+    """Crawls the follower graph breadth first from seed fids.
+
+    Fids wait in a breadth first frontier and up to ``concurrency`` of them are crawled
+    at once on a thread pool, each one page by page through ``iter_followers`` and
+    ``iter_following``. Every page is saved to the store with the cursor of the next
+    one, so a crawl stopped by an error, an interruption or a crash resumes where it
+    was by running a crawler on the same store again.
+
+    A fid that fails is logged, counted in ``failed`` and left in the store to be
+    retried by the next run. The client's rate limiter and retries apply to every
+    request, pass one to the client to share the API quota among the workers.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: CrawlStore,
+        seeds: Iterable[int] = (),
+        max_depth: Optional[int] = None,
+        directions: Iterable[str] = DIRECTIONS,
+        concurrency: int = 8,
+        page_size: int = 100,
+    ):
+        """Initialize a :class:`.GraphCrawler` instance.
+
+        Args:
+            client: The :class:`~farcaster.client.Warpcast` client to crawl with
+            store: Where the edges and the progress are saved
+            seeds: The fids to start from, added to the ones of a resumed crawl
+            max_depth: The depth of the last fids crawled, the seeds being at depth 0,
+                no limit by default
+            directions: The edges to follow, ``followers``, ``following`` or both
+            concurrency: The maximum number of fids crawled at once
+            page_size: The number of users per request
+
+        Raises:
+            ValueError: A direction is unknown
+        """
+        self.client = client
+        self.store = store
+        self.max_depth = max_depth
+        self.directions = tuple(directions)
+        for direction in self.directions:
+            if direction not in DIRECTIONS:
+                raise ValueError(
+                    f"Unknown direction {direction!r}, expected one of {DIRECTIONS}"
+                )
+        self.concurrency = max(concurrency, 1)
+        self.page_size = page_size
+        self.crawled = 0
+        self.pages = 0
+        self.edges = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._state = store.restore()
+        self._seen: Set[int] = set(self._state.nodes)
+        self._frontier: Deque[Tuple[int, int]] = deque(
+            (fid, depth)
+            for fid, depth in self._state.nodes.items()
+            if fid not in self._state.done
+        )
+        new_seeds = [(fid, 0) for fid in dict.fromkeys(seeds) if fid not in self._seen]
+        if new_seeds:
+            store.add_nodes(new_seeds)
+            self._seen.update(fid for fid, _ in new_seeds)
+            self._frontier.extend(new_seeds)
+
+    @property
+    def queued(self) -> int:
+        """The number of fids waiting in the frontier."""
+        return len(self._frontier)
+
+    def stop(self) -> None:
+        """Ask the workers to stop after their current page, :meth:`run` returns."""
+        self._stop.set()
+
+    def run(self) -> int:
+        """Crawl until the frontier is empty or the crawl is stopped.
+
+        Returns:
+            int: the number of fids crawled completely by this run
+        """
+        crawled = self.crawled
+        running: Set["Future[None]"] = set()
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            try:
+                while not self._stop.is_set() and (self._frontier or running):
+                    while self._frontier and len(running) < self.concurrency:
+                        fid, depth = self._frontier.popleft()
+                        running.add(
+                            pool.submit(
+                                contextvars.copy_context().run, self._crawl, fid, depth
+                            )
+                        )
+                    # wake up for the fids discovered by the running workers too
+                    _, running = wait(running, timeout=0.1, return_when=FIRST_COMPLETED)
+            finally:
+                self._stop.set()
+        self._stop.clear()
+        return self.crawled - crawled
+
+    def _crawl(self, fid: int, depth: int) -> None:
+        try:
+            for direction in self.directions:
+                if not self._crawl_direction(fid, depth, direction):
+                    return
+            self.store.finish(fid)
+            with self._lock:
+                self.crawled += 1
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning(f"Crawling fid {fid} failed: {e!r}")
+            with self._lock:
+                self.failed += 1
+
+    def _crawl_direction(self, fid: int, depth: int, direction: str) -> bool:
+        key = (fid, direction)
+        if key in self._state.cursors and self._state.cursors[key] is None:
+            return True
+        users = getattr(self.client, f"iter_{direction}")(
+            fid, cursor=self._state.cursors.get(key), page_size=self.page_size
+        )
+        with users:
+            for page in users.pages():
+                fids = [user.fid for user in page]
+                edges = (
+                    [(other, fid) for other in fids]
+                    if direction == "followers"
+                    else [(fid, other) for other in fids]
+                )
+                discovered: List[Tuple[int, int]] = []
+                if self.max_depth is None or depth < self.max_depth:
+                    with self._lock:
+                        for other in fids:
+                            if other not in self._seen:
+                                self._seen.add(other)
+                                discovered.append((other, depth + 1))
+                self.store.add_page(fid, direction, edges, discovered, users.cursor)
+                self._frontier.extend(discovered)
+                with self._lock:
+                    self.pages += 1
+                    self.edges += len(edges)
+                if self._stop.is_set():
+                    return False
+        return True
@@ -0,0 +1,185 @@
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import math
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, Token
+
+from urllib3.util import Retry
+
+R = TypeVar("R")
+
+_current: ContextVar[Optional["Deadline"]] = ContextVar(
+    "farcaster_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request cannot complete before the deadline of its call."""
+
+
+class Deadline:
+    """A point in time by which a call, and every request it makes, must complete.
+
+    Entering a deadline makes it the current one for the thread or task: request
+    timeouts, rate limiter waits and retry backoffs are clamped to the time left, and
+    page iterators stop at the next page boundary once it expires, keeping the cursor to
+    resume from. Deadlines nest, an inner deadline never outlives the outer one.
+
+    ::
+
+        with Deadline(5) as deadline:
+            followers = client.get_all_followers(fid)
+        if deadline.expired:
+            resume_from = followers.cursor
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        """Initialize a :class:`.Deadline` instance.
+
+        Args:
+            seconds: The time budget from now, ``None`` only inherits the current
+                deadline
+        """
+        parent = _current.get()
+        expires_at = math.inf if seconds is None else time.monotonic() + seconds
+        if parent is not None:
+            expires_at = min(expires_at, parent.expires_at)
+        self.expires_at: float = expires_at
+        self._tokens: List[Token[Optional[Deadline]]] = []
+
+    @staticmethod
+    def current() -> Optional["Deadline"]:
+        """Return the deadline of the running call, if any."""
+        return _current.get()
+
+    def __enter__(self) -> "Deadline":
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        _current.reset(self._tokens.pop())
+
+    @contextmanager
+    def applied(self) -> Iterator["Deadline"]:
+        """Make this deadline the current one, safe to use from several threads."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at <= time.monotonic()
+
+    def clamp(self, timeout: Optional[float]) -> Optional[float]:
+        """Bound a timeout by the time left.
+
+        Args:
+            timeout: A timeout in seconds, ``None`` for unbounded
+
+        Raises:
+            DeadlineExceeded: The deadline has already expired
+
+        Returns:
+            Optional[float]: the smallest of ``timeout`` and the time left, ``None``
+            when both are unbounded
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("deadline exceeded")
+        if timeout is None:
+            return None if math.isinf(remaining) else remaining
+        return min(timeout, remaining)
+
+    def wait(self, seconds: float) -> None:
+        """Check that waiting ``seconds`` ends before the deadline.
+
+        Args:
+            seconds: The duration of the wait
+
+        Raises:
+            DeadlineExceeded: The wait would end past the deadline
+        """
+        if seconds >= self.remaining():
+            raise DeadlineExceeded(f"waiting {seconds:.2f}s would exceed the deadline")
+
+    def wrap(self, function: Callable[..., R]) -> Callable[..., R]:
+        """Run ``function`` under this deadline, e.g. on a worker thread."""
+
+        def wrapped(*args: Any, **kwargs: Any) -> R:
+            with self.applied():
+                return function(*args, **kwargs)
+
+        return wrapped
+
+    def wrap_async(
+        self, function: Callable[..., Awaitable[R]]
+    ) -> Callable[..., Awaitable[R]]:
+        """Run the coroutine function ``function`` under this deadline."""
+
+        async def wrapped(*args: Any, **kwargs: Any) -> R:
+            with self.applied():
+                return await function(*args, **kwargs)
+
+        return wrapped
+
+
+def within(seconds: Optional[float]) -> ContextManager[Optional[Deadline]]:
+    """Run the block under a deadline of ``seconds``, or leave it unbounded.
+
+    Args:
+        seconds: The time budget from now, ``None`` for no deadline of its own
+
+    Returns:
+        ContextManager[Optional[Deadline]]: the deadline to enter, a no-op for ``None``
+    """
+    if seconds is None:
+        return nullcontext()
+    return Deadline(seconds)
+
+
+def request_timeouts(
+    connect: Optional[float], read: Optional[float]
+) -> Tuple[Optional[float], Optional[float]]:
+    """Clamp the connect and read timeouts of a request by the current deadline.
+
+    Args:
+        connect: The connect timeout in seconds, ``None`` for unbounded
+        read: The read timeout in seconds, ``None`` for unbounded
+
+    Returns:
+        Tuple[Optional[float], Optional[float]]: the connect and read timeouts
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return connect, read
+    return deadline.clamp(connect), deadline.clamp(read)
+
+
+class DeadlineRetry(Retry):
+    """A urllib3 ``Retry`` that gives up instead of backing off past the deadline."""
+
+    def sleep(self, response: Any = None) -> None:
+        deadline = _current.get()
+        if deadline is not None:
+            backoff = self.get_backoff_time()
+            if response is not None and self.respect_retry_after_header:
+                backoff = max(backoff, self.get_retry_after(response) or 0)
+            deadline.wait(backoff)
+        super().sleep(response)
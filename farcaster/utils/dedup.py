@@ -0,0 +1,197 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import hashlib
+import math
+import time
+from abc import ABC, abstractmethod
+
+
+class DedupSet(ABC):
+    """The recently seen items of a stream, remembering a bounded window of them."""
+
+    @abstractmethod
+    def __contains__(self, item: Any) -> bool:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def add(self, item: Any) -> None:
+        """Remember an item, forgetting the oldest ones beyond the window.
+
+        Args:
+            item: The item, hashable
+        """
+
+
+class RingSet(DedupSet):
+    """Exact membership of the last ``max_items`` items.
+
+    Items are kept in a fixed ring next to a dict of their positions, so an addition
+    overwrites the oldest slot and lookups never reorder anything.
+    """
+
+    def __init__(self, max_items: int = 301):
+        """Initialize a :class:`.RingSet` instance.
+
+        Args:
+            max_items: The number of most recent items remembered
+        """
+        self.max_items = max(max_items, 1)
+        self._ring: List[Any] = []
+        self._positions: Dict[Any, int] = {}
+        self._next = 0
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def add(self, item: Any) -> None:
+        if item in self._positions:
+            return
+        if len(self._ring) < self.max_items:
+            self._ring.append(item)
+        else:
+            del self._positions[self._ring[self._next]]
+            self._ring[self._next] = item
+        self._positions[item] = self._next
+        self._next = (self._next + 1) % self.max_items
+
+
+class _BloomFilter:
+    def __init__(self, bits: int, hashes: int, created_at: float):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray((bits + 7) // 8)
+        self.count = 0
+        self.created_at = created_at
+
+    def contains(self, first: int, second: int) -> bool:
+        array, bits = self.array, self.bits
+        for i in range(self.hashes):
+            p = (first + i * second) % bits
+            if not array[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def add(self, first: int, second: int) -> None:
+        array, bits = self.array, self.bits
+        for i in range(self.hashes):
+            p = (first + i * second) % bits
+            array[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+def _hash(item: Any) -> Tuple[int, int]:
+    digest = hashlib.blake2b(repr(item).encode(), digest_size=16).digest()
+    # double hashing, the second hash is odd to reach every bit
+    return (
+        int.from_bytes(digest[:8], "little"),
+        int.from_bytes(digest[8:], "little") | 1,
+    )
+
+
+class BloomWindow(DedupSet):
+    """Approximate membership of the last ``capacity`` items in constant memory.
+
+    The window is split into ``generations`` Bloom filters. New items go into the
+    newest one, which is retired once it holds its share of ``capacity`` items or is
+    older than ``window`` seconds, replacing the oldest one. Items of the window are
+    always found. An item never added is reported as seen with probability at most
+    ``error_rate``, and so dropped by a stream.
+
+    Each filter is sized for ``error_rate / generations``: a window of a million
+    items at a rate of one in a million takes about 7 MB.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 1e-6,
+        window: Optional[float] = None,
+        generations: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a :class:`.BloomWindow` instance.
+
+        Args:
+            capacity: The number of most recent items always remembered
+            error_rate: The maximum false positive rate, between 0 and 1
+            window: Seconds after which items may be forgotten, ``None`` to only
+                forget items beyond ``capacity``
+            generations: The number of filters the window is split into, at least 2
+            clock: A monotonic clock in seconds
+
+        Raises:
+            ValueError: The error rate is not between 0 and 1, or there are less than
+                2 generations
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError(
+                f"The error rate must be between 0 and 1, not {error_rate}"
+            )
+        if generations < 2:
+            raise ValueError(f"At least 2 generations are needed, not {generations}")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.window = window
+        self.generations = generations
+        # the newest filter fills up while the others cover the rest of the window
+        self.per_generation = max(math.ceil(capacity / (generations - 1)), 1)
+        rate = error_rate / generations
+        self.bits = max(
+            math.ceil(-self.per_generation * math.log(rate) / math.log(2) ** 2), 8
+        )
+        self.hashes = max(round(self.bits / self.per_generation * math.log(2)), 1)
+        self._clock = clock
+        self._filters = [self._new_filter()]
+        self._last: Optional[Tuple[Any, int, int]] = None
+
+    def _new_filter(self) -> _BloomFilter:
+        return _BloomFilter(self.bits, self.hashes, self._clock())
+
+    @property
+    def nbytes(self) -> int:
+        """The memory taken by the filters, in bytes."""
+        return sum(len(f.array) for f in self._filters)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """The current false positive rate, estimated from the fill of the filters."""
+        clear = 1.0
+        for f in self._filters:
+            clear *= 1 - (1 - math.exp(-f.hashes * f.count / f.bits)) ** f.hashes
+        return 1 - clear
+
+    def _hashes(self, item: Any) -> Tuple[int, int]:
+        # a stream looks an item up right before adding it
+        if self._last is None or self._last[0] != item:
+            self._last = (item, *_hash(item))
+        return self._last[1], self._last[2]
+
+    def __contains__(self, item: Any) -> bool:
+        first, second = self._hashes(item)
+        return any(f.contains(first, second) for f in reversed(self._filters))
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self._filters)
+
+    def add(self, item: Any) -> None:
+        if item in self:
+            return
+        newest = self._filters[-1]
+        expired = (
+            self.window is not None
+            and self._clock() - newest.created_at
+            >= self.window / (self.generations - 1)
+        )
+        if newest.count >= self.per_generation or expired:
+            newest = self._new_filter()
+            self._filters.append(newest)
+            if len(self._filters) > self.generations:
+                self._filters.pop(0)
+        newest.add(*self._hashes(item))
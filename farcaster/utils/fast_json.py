@@ -0,0 +1,54 @@
+from typing import Any, Type, TypeVar, Union
+
+import json
+
+from pydantic import BaseModel, ValidationError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+HAS_ORJSON: bool = orjson is not None
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """Decode a JSON document, with orjson when it is installed.
+
+    orjson decodes integers beyond 64 bits as floats, the API sends such values, like
+    token IDs, as strings.
+
+    Args:
+        content: The JSON document
+
+    Returns:
+        Any: the decoded document
+    """
+    if HAS_ORJSON:
+        return orjson.loads(content)
+    else:  # pragma: no cover
+        return json.loads(content)
+
+
+def validate_json(response_model: Type[M], content: Union[bytes, str]) -> M:
+    """Validate a raw response straight into its model, without building a dict first.
+
+    Args:
+        response_model: The model of the response
+        content: The raw JSON response
+
+    Raises:
+        Exception: The API returned errors instead of a result
+
+    Returns:
+        M: the validated response
+    """
+    try:
+        return response_model.model_validate_json(content)
+    except ValidationError:
+        response = loads(content)
+        if isinstance(response, dict) and "errors" in response:
+            raise Exception(response["errors"])  # pragma: no cover
+        raise
@@ -0,0 +1,118 @@
+from typing import Any, Callable, Hashable, Iterator, Optional, Tuple
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current: ContextVar[Optional["UserInterner"]] = ContextVar(
+    "farcaster_user_interner", default=None
+)
+
+
+class UserInterner:
+    """An identity map of users keyed by fid.
+
+    While an interner is active, every user parsed from a response is looked up by its
+    fid first, and all the occurrences of a user, as cast author, mention, parent
+    author, reactor or notification actor, share the instance built for the first one.
+    Those occurrences skip validation, which cuts the memory taken by feed and thread
+    walks. Responses are walked for their users before validation, so the default
+    path, without an interner, pays nothing.
+
+    The first occurrence wins, later ones with fresher counts are dropped until the user
+    leaves the map: scope interners to a call, or bound them with ``max_users``. The
+    shared instances must be treated as read-only.
+    """
+
+    def __init__(self, max_users: Optional[int] = None):
+        """Initialize a :class:`.UserInterner` instance.
+
+        Args:
+            max_users: The maximum number of users kept, the least recently seen ones
+                are dropped first. Unbounded by default.
+        """
+        self.max_users = max_users
+        self.hits = 0
+        self.misses = 0
+        self._users: "OrderedDict[Tuple[type, Hashable], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def intern(self, kind: type, fid: Hashable, build: Callable[[], Any]) -> Any:
+        """Get the shared user of ``kind`` for ``fid``, building it on the first sight.
+
+        Args:
+            kind: The type of the user, models and records are interned apart
+            fid: The Farcaster ID of the user
+            build: A function building the user
+
+        Returns:
+            Any: the shared user
+        """
+        key = (kind, fid)
+        with self._lock:
+            user = self._users.get(key)
+            if user is not None:
+                self.hits += 1
+                self._users.move_to_end(key)
+                return user
+        user = build()
+        with self._lock:
+            # another thread may have built it meanwhile, keep the first one
+            user = self._users.setdefault(key, user)
+            self.misses += 1
+            if self.max_users is not None and len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return user
+
+    def clear(self) -> None:
+        """Drop every user."""
+        with self._lock:
+            self._users.clear()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+
+@contextmanager
+def interning(interner: Optional[UserInterner] = None) -> Iterator[UserInterner]:
+    """Intern the users parsed by every client in the block.
+
+    Args:
+        interner: The identity map to use, a new one scoped to the block by default
+
+    Yields:
+        UserInterner: the active identity map
+    """
+    if interner is None:
+        interner = UserInterner()
+    token = _current.set(interner)
+    try:
+        yield interner
+    finally:
+        _current.reset(token)
+
+
+def current_interner() -> Optional[UserInterner]:
+    """Return the interner set with :func:`interning`, if any."""
+    return _current.get()
+
+
+def intern_user(kind: type, data: Any, build: Callable[[Any], Any]) -> Any:
+    """Build a user from decoded JSON through the active interner, if any.
+
+    Args:
+        kind: The type of the user
+        data: The decoded user
+        build: A function building the user from ``data``
+
+    Returns:
+        Any: the user
+    """
+    interner = _current.get()
+    if interner is None or type(data) is not dict:
+        return build(data)
+    fid = data.get("fid")
+    if fid is None:
+        return build(data)
+    return interner.intern(kind, fid, lambda: build(data))
@@ -0,0 +1,185 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import time
+
+try:
+    import numpy as np
+    from numpy.typing import NDArray
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+FIELDS = ("timestamp", "replies", "reactions", "recasts", "watches")
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "reactions": 1.0,
+    "recasts": 2.0,
+    "replies": 3.0,
+    "watches": 0.5,
+}
+
+
+class CastMetrics:
+    """Engagement of a cast collection as NumPy arrays, for vectorized analytics.
+
+    The timestamp and the reply, reaction, recast and watch counts of every cast are
+    pulled out once, then scoring, percentiles, time bucketing and top-k selection run
+    over whole arrays instead of Python loops. Casts can be models, records or raw
+    responses.
+    """
+
+    def __init__(self, casts: Iterable[Any]):
+        """Initialize a :class:`.CastMetrics` instance.
+
+        Args:
+            casts: The casts, iterated over once
+
+        Raises:
+            ImportError: numpy is not installed
+        """
+        if np is None:  # pragma: no cover
+            raise ImportError(
+                "CastMetrics requires numpy, "
+                "install it with `pip install farcaster[metrics]`"
+            )
+        self.casts: List[Any] = list(casts)
+        rows = [
+            (
+                cast.timestamp,
+                cast.replies.count,
+                cast.reactions.count,
+                cast.recasts.count,
+                cast.watches.count,
+            )
+            for cast in self.casts
+        ]
+        columns = np.array(rows, dtype=np.int64).reshape(-1, len(FIELDS)).T
+        # one contiguous array per field
+        self.timestamp, self.replies, self.reactions, self.recasts, self.watches = (
+            np.ascontiguousarray(column) for column in columns
+        )
+
+    def __len__(self) -> int:
+        return len(self.casts)
+
+    def field(self, name: str) -> "NDArray[np.int64]":
+        """Get the array of a field.
+
+        Args:
+            name: One of ``timestamp``, ``replies``, ``reactions``, ``recasts`` and
+                ``watches``
+
+        Raises:
+            ValueError: The field is unknown
+
+        Returns:
+            NDArray[np.int64]: the values of the field, one per cast
+        """
+        if name not in FIELDS:
+            raise ValueError(f"Unknown field {name!r}, expected one of {FIELDS}")
+        return getattr(self, name)  # type: ignore[no-any-return]
+
+    def age(self, now: Optional[float] = None) -> "NDArray[np.float64]":
+        """Get the age of every cast in seconds.
+
+        Args:
+            now: The current time in seconds since the epoch, defaults to now
+
+        Returns:
+            NDArray[np.float64]: the ages, never negative
+        """
+        now_ms = (time.time() if now is None else now) * 1000
+        ages: "NDArray[np.float64]" = np.maximum(now_ms - self.timestamp, 0) / 1000
+        return ages
+
+    def score(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        half_life: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> "NDArray[np.float64]":
+        """Score every cast by its weighted engagement, optionally decayed by age.
+
+        Args:
+            weights: The weight of each count, defaults to :data:`DEFAULT_WEIGHTS`
+            half_life: The age in seconds at which a score is halved, no decay by
+                default
+            now: The current time in seconds since the epoch, defaults to now
+
+        Returns:
+            NDArray[np.float64]: the scores, one per cast
+        """
+        scores = np.zeros(len(self), dtype=np.float64)
+        for name, weight in (DEFAULT_WEIGHTS if weights is None else weights).items():
+            scores += weight * self.field(name)
+        if half_life is not None:
+            scores *= np.exp2(-self.age(now) / half_life)
+        return scores
+
+    def percentiles(
+        self,
+        values: Union[str, "NDArray[np.int64]", "NDArray[np.float64]"],
+        q: Sequence[float] = (50, 90, 99),
+    ) -> Dict[float, float]:
+        """Get percentiles of a field or of scores.
+
+        Args:
+            values: A field name or an array with one value per cast, like scores
+            q: The percentiles to compute, between 0 and 100
+
+        Returns:
+            Dict[float, float]: the value of every percentile, NaN without casts
+        """
+        values = self.field(values) if isinstance(values, str) else values
+        if not len(values):
+            return {p: float("nan") for p in q}
+        return dict(zip(q, np.percentile(values, q).tolist()))
+
+    def buckets(
+        self,
+        interval: float,
+        values: Union[str, "NDArray[np.int64]", "NDArray[np.float64]", None] = None,
+    ) -> Tuple["NDArray[np.int64]", "NDArray[np.intp]", "NDArray[np.float64]"]:
+        """Bucket the casts by time.
+
+        Args:
+            interval: The width of a bucket in seconds
+            values: A field name or an array with one value per cast to sum per bucket,
+                defaults to the score
+
+        Returns:
+            Tuple[NDArray[np.int64], NDArray[np.intp], NDArray[np.float64]]: the start
+            of every non-empty bucket in milliseconds since the epoch in ascending
+            order, the number of casts and the sum of ``values`` in each
+        """
+        if values is None:
+            values = self.score()
+        elif isinstance(values, str):
+            values = self.field(values)
+        width = int(interval * 1000)
+        starts, index = np.unique(self.timestamp // width, return_inverse=True)
+        counts = np.bincount(index, minlength=len(starts))
+        sums = np.bincount(index, weights=values, minlength=len(starts))
+        # weighted counts are floats
+        return starts * width, counts, sums.astype(np.float64, copy=False)
+
+    def top_k(
+        self, k: int, scores: Optional["NDArray[np.float64]"] = None
+    ) -> List[Any]:
+        """Select the ``k`` casts with the highest scores.
+
+        Only the top ``k`` are sorted, in ``O(n + k log k)``.
+
+        Args:
+            k: The number of casts
+            scores: One score per cast, defaults to :meth:`score`
+
+        Returns:
+            List[Any]: the casts, highest score first
+        """
+        scores = self.score() if scores is None else scores
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [self.casts[i] for i in top.tolist()]
@@ -0,0 +1,370 @@
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import asyncio
+import contextvars
+import queue
+import threading
+
+from farcaster.utils.deadline import Deadline, DeadlineExceeded
+
+T = TypeVar("T")
+
+Fetched = Tuple[Any, Optional[str]]
+# the cursor of a page, its raw response and the cursor of the next page
+Prefetched = Tuple[Optional[str], Any, Optional[str]]
+
+
+def _identity(raw: Any) -> Any:
+    return raw
+
+
+class Prefetcher:
+    """Fetch pages ahead of the consumer on a background thread.
+
+    The worker follows the next cursors on its own and keeps at most ``depth`` pages
+    buffered, blocking until the consumer catches up. Errors are handed over to the
+    consumer and re-raised by :meth:`get`.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[str]], Fetched],
+        cursor: Optional[str],
+        depth: int,
+    ):
+        """Initialize a :class:`.Prefetcher` instance and start its worker.
+
+        Args:
+            fetch: A function that takes a cursor and returns the raw page together with
+                the cursor of the next page
+            cursor: The cursor of the first page to fetch
+            depth: The maximum number of pages buffered ahead of the consumer
+        """
+        self._fetch = fetch
+        self._queue: "queue.Queue[Union[Prefetched, BaseException]]" = queue.Queue(
+            maxsize=max(depth, 1)
+        )
+        self._stopped = threading.Event()
+        # the worker sees the caller's context, like its deadline and response mode
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._run, cursor),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, cursor: Optional[str]) -> None:
+        try:
+            while not self._stopped.is_set():
+                raw, next_cursor = self._fetch(cursor)
+                if not self._put((cursor, raw, next_cursor)) or next_cursor is None:
+                    return
+                cursor = next_cursor
+        except BaseException as e:  # pylint: disable=broad-except
+            self._put(e)
+
+    def _put(self, item: Union[Prefetched, BaseException]) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self) -> Prefetched:
+        """Wait for the next prefetched page.
+
+        Raises:
+            BaseException: The error raised by the worker while fetching
+
+        Returns:
+            Prefetched: the cursor, raw page and next cursor
+        """
+        item = self._queue.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def close(self) -> None:
+        """Stop the worker and drop the buffered pages."""
+        self._stopped.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+
+class PageIterator(Generic[T]):
+    """Lazily iterate over the items of a paginated endpoint.
+
+    Pages are fetched on demand and only the current page is kept in memory, so the
+    first item is available after the first round-trip and memory stays constant no
+    matter how long the walk is.
+
+    Two cursors are exposed while iterating:
+
+    - ``page_cursor``: the cursor that fetched the page currently being consumed.
+      Resuming from it repeats the rest of that page.
+    - ``cursor``: the cursor of the next page, ``None`` once the walk is exhausted.
+      Resuming from it is exact when a page has been fully consumed.
+
+    With ``prefetch`` set, a background worker requests the next pages as soon as their
+    cursor is known, so network latency overlaps with ``parse`` and with the consumer.
+    Call :meth:`close` (or use the iterator as a context manager) when stopping early.
+
+    Under a :class:`.Deadline`, the walk stops at the first page that cannot be fetched
+    in time: ``timed_out`` is set and ``cursor`` resumes right after the last page.
+
+    Either iterate over items or over ``pages()``, not both on the same instance.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[str]], Fetched],
+        cursor: Optional[str] = None,
+        parse: Callable[[Any], List[T]] = _identity,
+        prefetch: int = 0,
+        deadline: Optional[Deadline] = None,
+    ):
+        """Initialize a :class:`.PageIterator` instance.
+
+        Args:
+            fetch: A function that takes a cursor and returns the raw page together with
+                the cursor of the next page
+            cursor: The cursor of the first page to fetch
+            parse: A function that turns a raw page into its items, defaults to identity
+            prefetch: The number of pages to fetch ahead on a background thread,
+                defaults to 0 (disabled)
+            deadline: The deadline of the walk, defaults to the current deadline
+        """
+        self.deadline = deadline if deadline is not None else Deadline.current()
+        if self.deadline is not None:
+            # the prefetch worker does not inherit the deadline of the caller
+            fetch = self.deadline.wrap(fetch)
+        self._fetch = fetch
+        self._parse = parse
+        self.prefetch = prefetch
+        self.page_cursor: Optional[str] = cursor
+        self.cursor: Optional[str] = cursor
+        self.exhausted = False
+        self.timed_out = False
+        self._prefetcher: Optional[Prefetcher] = None
+        self._items = self._iter_items()
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        return next(self._items)
+
+    def __enter__(self) -> "PageIterator[T]":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def _iter_items(self) -> Iterator[T]:
+        for page in self.pages():
+            yield from page
+
+    def _next_raw(self) -> Prefetched:
+        if not self.prefetch:
+            raw, next_cursor = self._fetch(self.cursor)
+            return self.cursor, raw, next_cursor
+        if self._prefetcher is None:
+            self._prefetcher = Prefetcher(self._fetch, self.cursor, self.prefetch)
+        return self._prefetcher.get()
+
+    def pages(self) -> Iterator[List[T]]:
+        """Yield the items of the endpoint one page at a time.
+
+        Yields:
+            List[T]: the items of the next page
+        """
+        while not self.exhausted:
+            try:
+                if self.deadline is not None and self.deadline.expired:
+                    raise DeadlineExceeded("deadline exceeded")
+                page_cursor, raw, next_cursor = self._next_raw()
+            except DeadlineExceeded:
+                self.timed_out = True
+                break
+            self.page_cursor = page_cursor
+            self.cursor = next_cursor
+            self.exhausted = next_cursor is None
+            yield self._parse(raw)
+        self.close()
+
+    def take(self, limit: int) -> List[T]:
+        """Consume up to ``limit`` items, fetching no more pages than needed.
+
+        Args:
+            limit: The maximum number of items to return
+
+        Returns:
+            List[T]: the consumed items
+        """
+        items: List[T] = []
+        if limit <= 0:
+            return items
+        for item in self:
+            items.append(item)
+            if len(items) >= limit:
+                break
+        return items
+
+    def close(self) -> None:
+        """Stop prefetching, pages that were fetched ahead are discarded."""
+        prefetcher = getattr(self, "_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.close()
+            self._prefetcher = None
+
+
+class AsyncPageIterator(Generic[T]):
+    """The ``asyncio`` counterpart of :class:`.PageIterator`.
+
+    With ``prefetch`` set, the next pages are requested by a background task.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[str]], Awaitable[Fetched]],
+        cursor: Optional[str] = None,
+        parse: Callable[[Any], List[T]] = _identity,
+        prefetch: int = 0,
+        deadline: Optional[Deadline] = None,
+    ):
+        """Initialize an :class:`.AsyncPageIterator` instance.
+
+        Args:
+            fetch: A coroutine function that takes a cursor and returns the raw page
+                together with the cursor of the next page
+            cursor: The cursor of the first page to fetch
+            parse: A function that turns a raw page into its items, defaults to identity
+            prefetch: The number of pages to fetch ahead on a background task,
+                defaults to 0 (disabled)
+            deadline: The deadline of the walk, defaults to the current deadline
+        """
+        self.deadline = deadline if deadline is not None else Deadline.current()
+        if self.deadline is not None:
+            fetch = self.deadline.wrap_async(fetch)
+        self._fetch = fetch
+        self._parse = parse
+        self.prefetch = prefetch
+        self.page_cursor: Optional[str] = cursor
+        self.cursor: Optional[str] = cursor
+        self.exhausted = False
+        self.timed_out = False
+        self._queue: Optional["asyncio.Queue[Union[Prefetched, BaseException]]"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._items = self._iter_items()
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self
+
+    async def __anext__(self) -> T:
+        return await self._items.__anext__()
+
+    async def __aenter__(self) -> "AsyncPageIterator[T]":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def _iter_items(self) -> AsyncIterator[T]:
+        async for page in self.pages():
+            for item in page:
+                yield item
+
+    async def _prefetch(self, cursor: Optional[str]) -> None:
+        assert self._queue is not None
+        try:
+            while True:
+                raw, next_cursor = await self._fetch(cursor)
+                await self._queue.put((cursor, raw, next_cursor))
+                if next_cursor is None:
+                    return
+                cursor = next_cursor
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:  # pylint: disable=broad-except
+            await self._queue.put(e)
+
+    async def _next_raw(self) -> Prefetched:
+        if not self.prefetch:
+            raw, next_cursor = await self._fetch(self.cursor)
+            return self.cursor, raw, next_cursor
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.prefetch)
+            self._task = asyncio.ensure_future(self._prefetch(self.cursor))
+        assert self._queue is not None
+        item = await self._queue.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    async def pages(self) -> AsyncIterator[List[T]]:
+        """Yield the items of the endpoint one page at a time.
+
+        Yields:
+            List[T]: the items of the next page
+        """
+        while not self.exhausted:
+            try:
+                if self.deadline is not None and self.deadline.expired:
+                    raise DeadlineExceeded("deadline exceeded")
+                page_cursor, raw, next_cursor = await self._next_raw()
+            except DeadlineExceeded:
+                self.timed_out = True
+                break
+            self.page_cursor = page_cursor
+            self.cursor = next_cursor
+            self.exhausted = next_cursor is None
+            yield self._parse(raw)
+        await self.aclose()
+
+    async def take(self, limit: int) -> List[T]:
+        """Consume up to ``limit`` items, fetching no more pages than needed.
+
+        Args:
+            limit: The maximum number of items to return
+
+        Returns:
+            List[T]: the consumed items
+        """
+        items: List[T] = []
+        if limit <= 0:
+            return items
+        async for item in self:
+            items.append(item)
+            if len(items) >= limit:
+                break
+        return items
+
+    async def aclose(self) -> None:
+        """Stop prefetching, pages that were fetched ahead are discarded."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
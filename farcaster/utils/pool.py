@@ -0,0 +1,162 @@
+from typing import Any, Dict, Optional
+
+import queue
+import threading
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+
+class PoolStats:
+    """Thread-safe counters shared by the connection pools of a session."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.in_use = 0
+        self.max_in_use = 0
+
+    def checked_out(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def released(self, discarded: bool) -> None:
+        with self._lock:
+            self.in_use -= 1
+            self.discarded += discarded
+
+    def new_connection(self) -> None:
+        with self._lock:
+            self.created += 1
+
+
+class _StatsPoolMixin(HTTPConnectionPool):
+    stats: PoolStats
+    pool_timeout: Optional[float] = None
+
+    def _new_conn(self) -> Any:
+        self.stats.new_connection()
+        return super()._new_conn()  # type: ignore[misc]
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        conn = super()._get_conn(  # type: ignore[misc]
+            timeout=self.pool_timeout if timeout is None else timeout
+        )
+        self.stats.checked_out()
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        if self.pool is not None:
+            try:
+                self.pool.put(conn, block=False)
+                self.stats.released(discarded=False)
+                return
+            except queue.Full:
+                pass
+        self.stats.released(discarded=conn is not None)
+        # logs the full pool and closes the connection
+        super()._put_conn(conn)  # type: ignore[misc]
+
+    @property
+    def idle(self) -> int:
+        if self.pool is None:
+            return 0
+        return sum(conn is not None for conn in list(self.pool.queue))
+
+
+class StatsHTTPConnectionPool(_StatsPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class StatsHTTPSConnectionPool(_StatsPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class StatsPoolManager(PoolManager):
+    """A ``PoolManager`` whose pools report their usage to a :class:`.PoolStats`."""
+
+    def __init__(
+        self, stats: PoolStats, pool_timeout: Optional[float] = None, **kwargs: Any
+    ):
+        super().__init__(**kwargs)
+        self.stats = stats
+        self.pool_timeout = pool_timeout
+        self.pool_classes_by_scheme = {
+            "http": StatsHTTPConnectionPool,
+            "https": StatsHTTPSConnectionPool,
+        }
+
+    def _new_pool(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        request_context: Optional[Dict[str, Any]] = None,
+    ) -> HTTPConnectionPool:
+        pool: _StatsPoolMixin = super()._new_pool(  # type: ignore[misc]
+            scheme, host, port, request_context
+        )
+        pool.stats = self.stats
+        pool.pool_timeout = self.pool_timeout
+        return pool
+
+    def idle(self) -> int:
+        """Count the idle connections kept alive across every pool."""
+        pools = [self.pools.get(key) for key in self.pools.keys()]
+        return sum(getattr(pool, "idle", 0) for pool in pools)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """An ``HTTPAdapter`` that tracks the usage of its connection pools.
+
+    ``pool_timeout`` bounds how long a request waits for a free connection when
+    ``pool_block`` is set, instead of waiting forever.
+    """
+
+    def __init__(self, pool_timeout: Optional[float] = None, **kwargs: Any):
+        """Initialize a :class:`.PooledHTTPAdapter` instance.
+
+        Args:
+            pool_timeout: Seconds to wait for a free connection of a blocking pool
+            kwargs: The arguments of ``requests.adapters.HTTPAdapter``
+        """
+        self.stats = PoolStats()
+        self.pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = StatsPoolManager(
+            self.stats,
+            self.pool_timeout,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Return the usage counters of the connection pools.
+
+        Returns:
+            Dict[str, int]: connections ``in_use``, ``idle``, ``created`` and
+            ``discarded`` because the pool was full, plus ``checkouts`` and the peak
+            ``max_in_use``
+        """
+        return {
+            "in_use": self.stats.in_use,
+            "idle": self.poolmanager.idle(),
+            "created": self.stats.created,
+            "discarded": self.stats.discarded,
+            "checkouts": self.stats.checkouts,
+            "max_in_use": self.stats.max_in_use,
+        }
@@ -0,0 +1,224 @@
+from typing import Callable, Dict, Mapping, Optional
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# a reset header larger than this is an epoch timestamp rather than a delay
+EPOCH_THRESHOLD = 1_000_000_000
+
+
+class TokenBucket:
+    """A thread-safe token bucket handing out reservations.
+
+    ``reserve`` always takes a token, possibly driving the balance negative, and returns
+    how long the caller has to wait for it. Callers therefore queue up fairly without
+    polling, and the bucket can be shared between threads and event loops.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a :class:`.TokenBucket` instance, full.
+
+        Args:
+            rate: The number of tokens added per second
+            capacity: The maximum number of tokens, defaults to one second worth of rate
+            clock: A monotonic clock in seconds
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        # _updated is in the future while the bucket is paused
+        if now > self._updated:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` from the bucket.
+
+        Args:
+            tokens: The number of tokens to take
+
+        Returns:
+            float: the number of seconds to wait before using them
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= tokens
+            return max(self._updated - now, 0.0) + max(-self._tokens, 0.0) / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, tokens accumulated so far are kept.
+
+        Args:
+            rate: The number of tokens added per second
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = rate
+
+    def pause(self, seconds: float) -> None:
+        """Empty the bucket and stop refilling it for ``seconds``.
+
+        Args:
+            seconds: The duration of the pause
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + seconds)
+
+
+def _header_seconds(value: Optional[str], now: float) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - now, 0.0)
+        except (TypeError, ValueError):
+            return None
+    if seconds > EPOCH_THRESHOLD:
+        seconds -= now
+    return max(seconds, 0.0)
+
+
+class AdaptiveRateLimiter:
+    """A client-side rate limiter with a global token bucket and one per endpoint.
+
+    The global bucket is paced by the ``X-RateLimit-Remaining`` and
+    ``X-RateLimit-Reset`` headers, spreading the remaining budget over the rest of the
+    window with some headroom. Endpoint buckets follow AIMD: their rate is cut on every
+    429, paused for ``Retry-After``, and grows back slowly on successful responses.
+    One limiter can be shared by several clients using the same credentials.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        endpoint_rate: Optional[float] = None,
+        endpoint_rates: Optional[Dict[str, float]] = None,
+        max_rate: Optional[float] = None,
+        min_rate: float = 0.1,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        headroom: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an :class:`.AdaptiveRateLimiter` instance.
+
+        Args:
+            rate: The initial number of requests per second across all endpoints
+            burst: The number of requests allowed back to back, defaults to ``rate``
+            endpoint_rate: The maximum requests per second of a single endpoint,
+                defaults to ``rate``
+            endpoint_rates: Maximum requests per second of specific endpoint paths
+            max_rate: The upper bound of the global rate learned from the headers,
+                defaults to unbounded
+            min_rate: The lower bound of every rate
+            increase: Requests per second added to an endpoint after a success
+            decrease: The factor applied to the rate of an endpoint after a 429
+            headroom: The fraction of the advertised budget actually used
+            clock: A monotonic clock in seconds
+        """
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.headroom = headroom
+        self.endpoint_rate = endpoint_rate if endpoint_rate is not None else rate
+        self.endpoint_rates = dict(endpoint_rates or {})
+        self.throttled = 0
+        self._clock = clock
+        self.global_bucket = TokenBucket(rate, burst, clock=clock)
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _ceiling(self, path: str) -> float:
+        return self.endpoint_rates.get(path, self.endpoint_rate)
+
+    def bucket(self, path: str) -> TokenBucket:
+        """Return the bucket of an endpoint, creating it on first use.
+
+        Args:
+            path: The endpoint path
+
+        Returns:
+            TokenBucket: the bucket of the endpoint
+        """
+        with self._lock:
+            bucket = self.buckets.get(path)
+            if bucket is None:
+                bucket = self.buckets[path] = TokenBucket(
+                    self._ceiling(path), clock=self._clock
+                )
+            return bucket
+
+    def reserve(self, path: str) -> float:
+        """Reserve a request to ``path`` in both the global and the endpoint bucket.
+
+        Args:
+            path: The endpoint path
+
+        Returns:
+            float: the number of seconds to wait before sending the request
+        """
+        return max(self.global_bucket.reserve(), self.bucket(path).reserve())
+
+    def acquire(self, path: str) -> None:
+        """Block until a request to ``path`` may be sent.
+
+        Args:
+            path: The endpoint path
+        """
+        delay = self.reserve(path)
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, path: str, status: int, headers: Mapping[str, str]) -> None:
+        """Adjust the rates from the status and headers of a response.
+
+        Args:
+            path: The endpoint path
+            status: The HTTP status code
+            headers: The response headers
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        now = time.time()
+        bucket = self.bucket(path)
+        reset = _header_seconds(headers.get("x-ratelimit-reset"), now)
+        try:
+            remaining: Optional[float] = float(headers["x-ratelimit-remaining"])
+        except (KeyError, ValueError):
+            remaining = None
+
+        if remaining is not None and reset is not None:
+            if remaining <= 0:
+                self.global_bucket.pause(reset)
+            rate = self.headroom * max(remaining, 0.0) / max(reset, 1.0)
+            if self.max_rate is not None:
+                rate = min(rate, self.max_rate)
+            self.global_bucket.set_rate(max(rate, self.min_rate))
+
+        if status == 429:
+            self.throttled += 1
+            bucket.set_rate(max(bucket.rate * self.decrease, self.min_rate))
+            retry_after = _header_seconds(headers.get("retry-after"), now)
+            bucket.pause(retry_after if retry_after is not None else 1 / bucket.rate)
+        elif status < 400 and bucket.rate < self._ceiling(path):
+            bucket.set_rate(min(bucket.rate + self.increase, self._ceiling(path)))
@@ -0,0 +1,274 @@
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+)
+from typing_extensions import Literal
+
+import functools
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from humps import camelize
+from pydantic import BaseModel, RootModel
+
+from farcaster import records
+from farcaster.models import ApiUser
+from farcaster.utils.fast_json import loads, validate_json
+from farcaster.utils.interning import current_interner, intern_user
+
+M = TypeVar("M", bound=BaseModel)
+
+ResponseMode = Literal["validate", "construct", "raw", "record"]
+RESPONSE_MODES: Tuple[str, ...] = ("validate", "construct", "raw", "record")
+
+_current: ContextVar[Optional[str]] = ContextVar(
+    "farcaster_response_mode", default=None
+)
+
+
+@contextmanager
+def response_mode(mode: ResponseMode) -> Iterator[None]:
+    """Override the response mode of every client for the calls made in the block.
+
+    - ``validate``: responses are validated into their Pydantic models.
+    - ``construct``: models are built with ``model_construct`` all the way down,
+      without any validation.
+    - ``raw``: responses are returned as :class:`.RawDict`, plain dicts that also
+      support attribute access with the snake_case field names.
+    - ``record``: responses are built into the compact, immutable records of
+      :mod:`farcaster.records`, without validation.
+
+    Args:
+        mode: The response mode
+
+    Raises:
+        ValueError: The mode is unknown
+
+    Yields:
+        None
+    """
+    if mode not in RESPONSE_MODES:
+        raise ValueError(f"Unknown response mode {mode!r}")
+    token = _current.set(mode)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_response_mode(default: str = "validate") -> str:
+    """Return the response mode set with :func:`response_mode`, or ``default``."""
+    return _current.get() or default
+
+
+@functools.lru_cache(maxsize=None)
+def _camel(name: str) -> str:
+    return camelize(name)
+
+
+class RawDict(Dict[str, Any]):
+    """A decoded JSON object that also supports attribute access.
+
+    Attributes are looked up by name, then by their camelCase alias, so
+    ``cast.author.display_name`` reads ``cast["author"]["displayName"]``. Nested objects
+    are wrapped on first access, into copies so cached responses are left untouched.
+    Missing attributes read as ``None``, like the optional fields of the models.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        key = name if name in self else _camel(name)
+        value = self.get(key)
+        if type(value) is dict:
+            value = self[key] = RawDict(value)
+        elif type(value) is list and value and type(value[0]) is dict:
+            value = self[key] = [RawDict(item) for item in value]
+        return value
+
+
+@functools.lru_cache(maxsize=None)
+def _fields(model: Type[BaseModel]) -> List[Tuple[str, str, Any]]:
+    return [
+        (name, field.alias or name, field.annotation)
+        for name, field in model.model_fields.items()
+    ]
+
+
+def _required_keys(model: Type[BaseModel]) -> List[str]:
+    return [
+        field.alias or name
+        for name, field in model.model_fields.items()
+        if field.is_required()
+    ]
+
+
+def _construct_value(annotation: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    origin = get_origin(annotation)
+    if origin is Union:
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if isinstance(value, dict):
+            models = [
+                m for m in members if inspect.isclass(m) and issubclass(m, BaseModel)
+            ]
+            # the first model whose required fields are all present, like smart unions
+            for model in models:
+                if all(key in value for key in _required_keys(model)):
+                    return construct(model, value)
+            if models:
+                return construct(models[0], value)
+        return _construct_value(members[0], value) if len(members) == 1 else value
+    if origin in (list, List):
+        (item,) = get_args(annotation) or (Any,)
+        return [_construct_value(item, v) for v in value]
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return construct(annotation, value)
+    return value
+
+
+def construct(model: Type[M], data: Any) -> M:
+    """Build a model and its nested models from decoded JSON without validating it.
+
+    Unlike ``model_construct``, nested objects are turned into their models too, so
+    typed attribute access works all the way down.
+
+    Args:
+        model: The model to build
+        data: The decoded JSON
+
+    Returns:
+        M: the constructed model
+    """
+    if isinstance(data, model):
+        return data
+    if issubclass(model, ApiUser):
+        return intern_user(  # type: ignore[no-any-return]
+            model, data, functools.partial(_construct, model)
+        )
+    return _construct(model, data)
+
+
+def _construct(model: Type[M], data: Any) -> M:
+    if issubclass(model, RootModel):
+        annotation = model.model_fields["root"].annotation
+        root = model.model_construct(root=_construct_value(annotation, data))
+        return cast(M, root)
+    values = {}
+    for name, alias, annotation in _fields(model):
+        if alias in data:
+            values[name] = _construct_value(annotation, data[alias])
+        elif name in data:
+            values[name] = _construct_value(annotation, data[name])
+    return model.model_construct(**values)
+
+
+@functools.lru_cache(maxsize=None)
+def _holds_users(annotation: Any) -> bool:
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return issubclass(annotation, ApiUser) or bool(_user_fields(annotation))
+    return any(_holds_users(arg) for arg in get_args(annotation))
+
+
+@functools.lru_cache(maxsize=None)
+def _user_fields(model: Type[BaseModel]) -> List[Tuple[str, str, Any]]:
+    return [field for field in _fields(model) if _holds_users(field[2])]
+
+
+def _intern_value(annotation: Any, value: Any) -> Any:
+    if value is None or not _holds_users(annotation):
+        return value
+    origin = get_origin(annotation)
+    if origin is Union:
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if isinstance(value, dict):
+            for model in members:
+                if (
+                    inspect.isclass(model)
+                    and issubclass(model, BaseModel)
+                    and all(key in value for key in _required_keys(model))
+                ):
+                    return _intern_value(model, value)
+        return value
+    if origin in (list, List):
+        (item,) = get_args(annotation) or (Any,)
+        return [_intern_value(item, v) for v in value] if type(value) is list else value
+    if type(value) is not dict:
+        return value
+    if issubclass(annotation, ApiUser):
+        return intern_user(annotation, value, annotation.model_validate)
+    # copies, so cached responses are left untouched
+    values = dict(value)
+    for name, alias, field in _user_fields(annotation):
+        key = alias if alias in values else name
+        if key in values:
+            values[key] = _intern_value(field, values[key])
+    return values
+
+
+def parse_response(
+    response_model: Type[M], response: Union[bytes, str, Dict[Any, Any]], mode: str
+) -> M:
+    """Turn a raw or decoded response into ``response_model`` according to ``mode``.
+
+    Args:
+        response_model: The model of the response
+        response: The raw JSON response or the decoded one
+        mode: The response mode
+
+    Raises:
+        Exception: The API returned errors instead of a result
+
+    Returns:
+        M: the response, a :class:`.RawDict` in ``raw`` mode and a record in
+        ``record`` mode
+    """
+    if mode == "validate":
+        if current_interner() is not None:
+            # repeated users are validated once and then passed in as instances
+            data = response if isinstance(response, dict) else loads(response)
+            return response_model.model_validate(_intern_value(response_model, data))
+        if isinstance(response, dict):
+            return response_model(**response)
+        return validate_json(response_model, response)
+    data = response if isinstance(response, dict) else loads(response)
+    if "errors" in data and "result" not in data:
+        raise Exception(data["errors"])
+    if mode == "raw":
+        return RawDict(data)  # type: ignore[return-value]
+    if mode == "record":
+        return records.from_json(response_model, data)  # type: ignore[no-any-return]
+    return construct(response_model, data)
+
+
+def build_result(model: Type[M], mode: str, **fields: Any) -> M:
+    """Build a result model from items that were parsed in ``mode``.
+
+    Args:
+        model: The result model
+        mode: The response mode the items were parsed in
+        fields: The fields of the result
+
+    Returns:
+        M: the result, a :class:`.RawDict` in ``raw`` mode and a record in ``record``
+        mode
+    """
+    if mode == "validate":
+        return model(**fields)
+    if mode == "raw":
+        return RawDict(fields)  # type: ignore[return-value]
+    if mode == "record":
+        return records.make(model, **fields)  # type: ignore[no-any-return]
+    return model.model_construct(**fields)
@@ -0,0 +1,126 @@
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, TypeVar
+
+import asyncio
+import threading
+
+from farcaster.utils.deadline import Deadline, DeadlineExceeded
+
+R = TypeVar("R")
+
+
+class _Call(Generic[R]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[R] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[R]):
+    """De-duplicate concurrent calls sharing the same key across threads.
+
+    The first caller of a key runs the function while later callers wait for it and
+    receive the same result, or the same exception. Once the call completes the key is
+    forgotten, so results are never reused by calls that start afterwards.
+
+    Callers wait no longer than their own :class:`.Deadline`. When the shared call
+    runs out of the deadline of the caller that started it, the others run it again
+    under their own deadline instead of failing with it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call[R]] = {}
+
+    def do(self, key: str, function: Callable[[], R]) -> R:
+        """Run ``function``, or wait for the in-flight call of ``key``.
+
+        Args:
+            key: The key identifying identical calls
+            function: The function to run when no call of ``key`` is in flight
+
+        Raises:
+            DeadlineExceeded: The shared call did not complete before the deadline
+            BaseException: The error raised by the shared call
+
+        Returns:
+            R: the result of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+        if not leader:
+            deadline = Deadline.current()
+            timeout = None if deadline is None else deadline.clamp(None)
+            if not call.done.wait(timeout):
+                raise DeadlineExceeded("deadline exceeded waiting for the shared call")
+            if isinstance(call.error, DeadlineExceeded):
+                # the leader ran out of its own deadline, not of ours
+                return self.do(key, function)
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class AsyncSingleFlight(Generic[R]):
+    """The ``asyncio`` counterpart of :class:`.SingleFlight`.
+
+    The shared call runs in its own task, so cancelling one of the waiters, or its
+    deadline expiring, does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, "asyncio.Future[R]"] = {}
+
+    async def do(self, key: str, function: Callable[[], Awaitable[R]]) -> R:
+        """Await ``function()``, or the in-flight call of ``key``.
+
+        Args:
+            key: The key identifying identical calls
+            function: The coroutine function to run when no call of ``key`` is in flight
+
+        Raises:
+            DeadlineExceeded: The shared call did not complete before the deadline
+
+        Returns:
+            R: the result of the shared call
+        """
+        deadline = Deadline.current()
+        timeout = None if deadline is None else deadline.clamp(None)
+        task = self._calls.get(key)
+        leader = task is None
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(function())
+            task.add_done_callback(lambda _: self._forget(key, task))
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except DeadlineExceeded:
+            if leader:
+                raise
+            # the leader ran out of its own deadline, not of ours
+            return await self.do(key, function)
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded(
+                "deadline exceeded waiting for the shared call"
+            ) from e
+
+    def _forget(self, key: str, task: Any) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
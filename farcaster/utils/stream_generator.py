@@ -1,8 +1,23 @@
-from typing import Any, Callable, Iterator, List, Optional
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
 from typing import OrderedDict as OrderedDictType
-from typing import Union
+from typing import Tuple, Union
 
+import asyncio
 import logging
+import math
 import random
 import time
 from collections import OrderedDict
@@ -10,6 +25,8 @@ from collections import OrderedDict
 from pydantic import PositiveInt
 
 from farcaster.models import ApiCast, ApiUser, MentionNotification, ReplyNotification
+from farcaster.utils.checkpoint import StreamCheckpoint
+from farcaster.utils.dedup import DedupSet, RingSet
 
 Streamable = Union[
     List[Union[MentionNotification, ReplyNotification]],
@@ -17,6 +34,242 @@ Streamable = Union[
     List[ApiCast],
 ]
 
+Page = Tuple[List[Any], Optional[str]]
+
+
+class StreamPoller:
+    """The polling state of a stream, shared by :func:`stream_generator` and
+    :func:`async_stream_generator`.
+
+    It decides the page size of the next poll, filters the new items out of a page and
+    tells how long to wait before the next poll, the generators only do the I/O.
+    """
+
+    def __init__(
+        self,
+        attribute_name: str = "hash",
+        pause_after: Optional[int] = None,
+        skip_existing: bool = False,
+        max_counter: PositiveInt = 16,
+        limit: int = 50,
+        order_attribute_name: Optional[str] = None,
+        checkpoint: Optional[StreamCheckpoint] = None,
+        schedule: Optional["PollSchedule"] = None,
+        dedup: Optional[DedupSet] = None,
+    ):
+        """Initialize a :class:`.StreamPoller` instance, restoring its checkpoint.
+
+        Args:
+            attribute_name: The name of the attribute to use to determine if an item is
+                new
+            pause_after: The number of polls without a new item before pausing
+            skip_existing: If ``True``, skip items that existed before the stream was
+                created
+            max_counter: The maximum number of seconds to wait between polls
+            limit: The maximum number of items to request at a time
+            order_attribute_name: The name of an attribute growing with newer items,
+                saved with the checkpoint
+            checkpoint: Where to save the position of the stream, to resume it where it
+                stopped instead of honoring ``skip_existing``
+            schedule: How often to poll and how many items to request, a
+                :class:`.PollSchedule` built from ``limit`` and ``max_counter`` by
+                default
+            dedup: Where the attributes of the items seen are remembered, the last 301
+                by default, see :mod:`farcaster.utils.dedup`
+        """
+        self.attribute_name = attribute_name
+        self.pause_after = pause_after
+        self.skip_existing = skip_existing
+        self.limit = limit
+        self.order_attribute_name = order_attribute_name
+        self.checkpoint = checkpoint
+        self.seen_attributes = RingSet(301) if dedup is None else dedup
+        if checkpoint is not None and checkpoint.restore() is not None:
+            for attribute in checkpoint.seen:
+                self.seen_attributes.add(attribute)
+            self.skip_existing = False
+        self.schedule = (
+            PollSchedule(limit=limit, max_interval=max_counter)
+            if schedule is None
+            else schedule
+        )
+        self._responses_without_new = 0
+        self._had_poll = False
+        self._requested = 0
+        self._received = 0
+        self._new = 0
+        self._overlap = 0
+
+    def page_size(self, shrink: bool = True) -> int:
+        """Start a poll.
+
+        Args:
+            shrink: If ``False``, request ``limit`` items instead of the page size of
+                the schedule, for streams that cannot backfill a gap
+
+        Returns:
+            int: the number of items to request
+        """
+        self._requested = self.schedule.page_size if shrink else self.schedule.limit
+        self._received = self._new = self._overlap = 0
+        logging.debug(f"Limit: {self._requested}")
+        return self._requested
+
+    def disconnected(self, items: List[Any]) -> bool:
+        """Test if a page follows a gap, when items were seen before but none of it.
+
+        Args:
+            items: The page, newest first
+
+        Returns:
+            bool: ``True`` if older items may be missing between the page and the items
+            seen before
+        """
+        if not items or not len(self.seen_attributes):
+            return False
+        for item in items:
+            if getattr(item, self.attribute_name) in self.seen_attributes:
+                return False
+            order = (
+                getattr(item, self.order_attribute_name, None)
+                if self.order_attribute_name
+                else None
+            )
+            if self.checkpoint is not None and self.checkpoint.behind(order):
+                return False
+        return True
+
+    def fresh(self, items: Iterable[Any]) -> List[Tuple[Any, Any, Optional[int]]]:
+        """Filter the new items out of a page without handing them to the checkpoint.
+
+        Args:
+            items: The page, newest first
+
+        Returns:
+            List[Tuple[Any, Any, Optional[int]]]: the new items, oldest first, with
+            their attribute and order value for :meth:`handled`
+        """
+        items = list(items)
+        self._received = len(items)
+        entries = []
+        for item in reversed(items):
+            attribute = getattr(item, self.attribute_name)
+            if attribute in self.seen_attributes:
+                self._overlap += 1
+                continue
+            self.seen_attributes.add(attribute)
+            order = (
+                getattr(item, self.order_attribute_name, None)
+                if self.order_attribute_name
+                else None
+            )
+            if self.checkpoint is not None and self.checkpoint.behind(order):
+                self._overlap += 1
+                continue
+            self._new += 1
+            entries.append((item, attribute, order))
+        return entries
+
+    def handled(self, attribute: Any, order: Optional[int]) -> None:
+        """Hand an item to the checkpoint, if any.
+
+        Args:
+            attribute: The attribute of the item
+            order: The order value of the item
+        """
+        if self.checkpoint is not None:
+            self.checkpoint.handled(attribute, order)
+
+    def new_items(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Yield the new items of a page, oldest first.
+
+        An item is handed to the checkpoint once the next one is requested.
+
+        Args:
+            items: The page, newest first
+
+        Yields:
+            Any: the next new item
+        """
+        for item, attribute, order in self.fresh(items):
+            if not self.skip_existing:
+                yield item
+            self.handled(attribute, order)
+
+    def after_poll(self) -> Tuple[bool, float]:
+        """End a poll.
+
+        Returns:
+            Tuple[bool, float]: whether the stream pauses by yielding ``None``, and the
+            seconds to wait before the next poll
+        """
+        # the first page holds the items that existed before the stream, not arrivals
+        first = not self._had_poll
+        self._had_poll = True
+        self.skip_existing = False
+        delay = self.schedule.observe(
+            self._new, self._overlap, self._received, self._requested, first=first
+        )
+        if self.pause_after is not None and self.pause_after < 0:
+            return True, 0.0
+        if self._new:
+            self._responses_without_new = 0
+            return False, 0.0 if self.pause_after is not None else delay
+        self._responses_without_new += 1
+        if self.pause_after is None:
+            return False, delay
+        if self._responses_without_new > self.pause_after:
+            self._responses_without_new = 0
+            return True, 0.0
+        return False, 0.0
+
+    def close(self) -> None:
+        """Save the checkpoint, if any."""
+        if self.checkpoint is not None:
+            self.checkpoint.save()
+
+
+def _poll(
+    poller: StreamPoller,
+    function: Callable[[Optional[str], int], Streamable],
+    backfill: Optional[Callable[[Optional[str], int], Page]],
+    cursor: Optional[str],
+    max_backfill: int,
+) -> Page:
+    if backfill is None:
+        return function(cursor, poller.page_size(shrink=False)), cursor
+    items, older = backfill(cursor, poller.page_size())
+    pages = 0
+    page = items
+    while older and pages < max_backfill and poller.disconnected(page):
+        page, older = backfill(older, poller.schedule.limit)
+        items = [*items, *page]
+        pages += 1
+    if pages:
+        logging.info(f"Backfilled a gap with {pages} older pages")
+    return items, older
+
+
+async def _async_poll(
+    poller: StreamPoller,
+    function: Callable[[Optional[str], int], Awaitable[Streamable]],
+    backfill: Optional[Callable[[Optional[str], int], Awaitable[Page]]],
+    cursor: Optional[str],
+    max_backfill: int,
+) -> Page:
+    if backfill is None:
+        return await function(cursor, poller.page_size(shrink=False)), cursor
+    items, older = await backfill(cursor, poller.page_size())
+    pages = 0
+    page = items
+    while older and pages < max_backfill and poller.disconnected(page):
+        page, older = await backfill(older, poller.schedule.limit)
+        items = [*items, *page]
+        pages += 1
+    if pages:
+        logging.info(f"Backfilled a gap with {pages} older pages")
+    return items, older
+
 
 def stream_generator(
     function: Callable[
@@ -24,70 +277,353 @@ def stream_generator(
         Streamable,
     ],
     *,
-    attribute_name: str = "hash",
-    pause_after: Optional[int] = None,
-    skip_existing: bool = False,
-    max_counter: PositiveInt = 16,
-    limit: int = 50,
     cursor: Optional[str] = None,
-) -> Iterator[Any]:
+    backfill: Optional[Callable[[Optional[str], int], Page]] = None,
+    max_backfill: int = 10,
+    sleep: Callable[[float], Any] = time.sleep,
+    **options: Any,
+) -> Generator[Any, None, None]:
     """Yield new items from ``function`` as they become available.
 
+    With ``backfill``, a page without any item seen before is followed by older pages
+    until they reconnect with the items seen, and the items in between are yielded
+    too, oldest first: a stream polled less often than items arrive is lossless.
+
     Args:
         function: A function that returns a list of items.
-        attribute_name: The name of the attribute to use to determine if an item is new
-        pause_after: The number of times to call ``function`` without finding a new item
-        skip_existing: If ``True``, skip items that existed before the stream was created
-        max_counter: The maximum number of seconds to wait between calls to ``function``
-        limit: The maximum number of items to request from ``function`` at a time
         cursor: The cursor to use when calling ``function``
+        backfill: A function that returns a list of items and the cursor of the older
+            items, polled instead of ``function``
+        max_backfill: The maximum number of older pages requested to fill a gap
+        sleep: How to wait between two polls, e.g. on an event to be woken up early
+        options: The options of :class:`.StreamPoller`: ``attribute_name``,
+            ``pause_after``, ``skip_existing``, ``max_counter``, ``limit``,
+            ``order_attribute_name``, ``checkpoint``, ``schedule`` and ``dedup``, where
+            the attributes of the items seen are remembered, see
+            :mod:`farcaster.utils.dedup`
 
     Yields:
-        Iterator[Yieldable]: A generator that yields new items from ``function`` as they become available.
+        Iterator[Yieldable]: A generator that yields new items from ``function`` as
+        they become available.
     """
-    before_attribute = None
-    exponential_counter = ExponentialCounter(max_counter=max_counter)
-    seen_attributes = BoundedSet(301)
-    without_before_counter = 0
-    responses_without_new = 0
-    while True:
-        found = False
-        newest_attribute = None
-        dynamic_limit = limit
-        if before_attribute is None:
-            dynamic_limit -= without_before_counter
-            without_before_counter = (without_before_counter + 1) % int(limit / 2)
-        logging.debug(f"Limit: {dynamic_limit}")
-        for item in reversed(list(function(cursor, dynamic_limit))):
-            attribute = getattr(item, attribute_name)
-            if attribute in seen_attributes:
-                continue
-            found = True
-            seen_attributes.add(attribute)
-            newest_attribute = attribute
-            if not skip_existing:
+    poller = StreamPoller(**options)
+    try:
+        while True:
+            items, _ = _poll(poller, function, backfill, cursor, max_backfill)
+            yield from poller.new_items(items)
+            pause, delay = poller.after_poll()
+            if pause:
+                yield None
+            elif delay:
+                sleep(delay)
+    finally:
+        poller.close()
+
+
+async def async_stream_generator(
+    function: Callable[
+        [Optional[str], int],
+        Awaitable[Streamable],
+    ],
+    *,
+    cursor: Optional[str] = None,
+    backfill: Optional[Callable[[Optional[str], int], Awaitable[Page]]] = None,
+    max_backfill: int = 10,
+    **options: Any,
+) -> AsyncGenerator[Any, None]:
+    """Asynchronously yield new items from ``function`` as they become available.
+
+    This is the ``asyncio`` counterpart of :func:`stream_generator`, ``function`` is a
+    coroutine function and the stream waits with ``asyncio.sleep`` between polls, so
+    any number of streams can run in one event loop, see :func:`merge_streams`.
+
+    Args:
+        function: A coroutine function that returns a list of items.
+        cursor: The cursor to use when calling ``function``
+        backfill: A coroutine function that returns a list of items and the cursor of
+            the older items, polled instead of ``function``
+        max_backfill: The maximum number of older pages requested to fill a gap
+        options: The options of :class:`.StreamPoller`
+
+    Yields:
+        AsyncIterator[Yieldable]: An async generator that yields new items from
+        ``function`` as they become available.
+    """
+    poller = StreamPoller(**options)
+    try:
+        while True:
+            items, _ = await _async_poll(
+                poller, function, backfill, cursor, max_backfill
+            )
+            for item in poller.new_items(items):
                 yield item
-        before_attribute = newest_attribute
-        skip_existing = False
-        if pause_after is not None and pause_after < 0:
-            yield None
-        elif found:
-            exponential_counter.reset()
-            responses_without_new = 0
+            pause, delay = poller.after_poll()
+            if pause:
+                yield None
+            elif delay:
+                await asyncio.sleep(delay)
+    finally:
+        poller.close()
+
+
+class StreamBatch(NamedTuple):
+    """New items of a stream delivered together, with the polls that found them.
+
+    Attributes:
+        items: The new items, oldest first, empty when a batched stream pauses
+        polls: The number of polls since the previous batch
+        latency: The seconds spent waiting for the API in those polls
+        cursor: The cursor of the items older than the last poll, for streams with a
+            backfill
+    """
+
+    items: List[Any]
+    polls: int
+    latency: float
+    cursor: Optional[str]
+
+    @property
+    def size(self) -> int:
+        """The number of items."""
+        return len(self.items)
+
+
+Entry = Tuple[Any, Any, Optional[int]]
+
+
+class _Batcher:
+    def __init__(
+        self,
+        max_items: Optional[int],
+        max_wait: Optional[float],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self.pending: List[Entry] = []
+        self.polls = 0
+        self.latency = 0.0
+        self.cursor: Optional[str] = None
+        self._clock = clock
+        self._since: Optional[float] = None
+
+    def add(self, entries: List[Entry], latency: float, cursor: Optional[str]) -> None:
+        self.polls += 1
+        self.latency += latency
+        self.cursor = cursor
+        if entries and self._since is None:
+            self._since = self._clock()
+        self.pending.extend(entries)
+
+    def due(self) -> bool:
+        if not self.pending:
+            return False
+        if self.max_items is None and self.max_wait is None:
+            return True
+        if self.max_items is not None and len(self.pending) >= self.max_items:
+            return True
+        return self.max_wait is not None and self._waited() >= self.max_wait
+
+    def _waited(self) -> float:
+        return 0.0 if self._since is None else self._clock() - self._since
+
+    def take(self) -> Tuple[StreamBatch, List[Entry]]:
+        size = len(self.pending)
+        if self.max_items is not None:
+            size = min(size, self.max_items)
+        entries, self.pending = self.pending[:size], self.pending[size:]
+        batch = StreamBatch(
+            [item for item, _, _ in entries], self.polls, self.latency, self.cursor
+        )
+        self.polls = 0
+        self.latency = 0.0
+        self._since = self._clock() if self.pending else None
+        return batch, entries
+
+    def wait(self, delay: float) -> float:
+        if self.max_wait is None or self._since is None:
+            return delay
+        return max(min(delay, self.max_wait - self._waited()), 0.0)
+
+
+def batch_stream_generator(
+    function: Callable[
+        [Optional[str], int],
+        Streamable,
+    ],
+    *,
+    cursor: Optional[str] = None,
+    backfill: Optional[Callable[[Optional[str], int], Page]] = None,
+    max_backfill: int = 10,
+    max_items: Optional[int] = None,
+    max_wait: Optional[float] = None,
+    sleep: Callable[[float], Any] = time.sleep,
+    **options: Any,
+) -> Generator[StreamBatch, None, None]:
+    """Yield the new items from ``function`` in batches, for sinks that write in bulk.
+
+    By default a batch holds the new items of one poll. With ``max_items`` or
+    ``max_wait`` the items of several polls are gathered until there are ``max_items``
+    of them or the oldest one waited ``max_wait`` seconds, whichever comes first.
+    Instead of ``None``, a pausing stream yields the items gathered so far, in batches
+    of at most ``max_items``, or an empty batch.
+    The items of a batch are handed to the checkpoint once the next batch is requested.
+
+    Args:
+        function: A function that returns a list of items.
+        cursor: The cursor to use when calling ``function``
+        backfill: A function that returns a list of items and the cursor of the older
+            items, polled instead of ``function``
+        max_backfill: The maximum number of older pages requested to fill a gap
+        max_items: The maximum number of items per batch
+        max_wait: The maximum number of seconds an item waits for its batch
+        sleep: How to wait between two polls, e.g. on an event to be woken up early
+        options: The options of :class:`.StreamPoller`
+
+    Yields:
+        Iterator[StreamBatch]: the next batch
+    """
+    poller = StreamPoller(**options)
+    batcher = _Batcher(max_items, max_wait)
+    try:
+        while True:
+            started = time.monotonic()
+            items, older = _poll(poller, function, backfill, cursor, max_backfill)
+            batcher.add(_fresh(poller, items), time.monotonic() - started, older)
+            pause, delay = poller.after_poll()
+            while batcher.due() or pause:
+                batch, entries = batcher.take()
+                yield batch
+                for _, attribute, order in entries:
+                    poller.handled(attribute, order)
+                pause = pause and bool(batcher.pending)
+            delay = batcher.wait(delay)
+            if delay:
+                sleep(delay)
+    finally:
+        poller.close()
+
+
+async def async_batch_stream_generator(
+    function: Callable[
+        [Optional[str], int],
+        Awaitable[Streamable],
+    ],
+    *,
+    cursor: Optional[str] = None,
+    backfill: Optional[Callable[[Optional[str], int], Awaitable[Page]]] = None,
+    max_backfill: int = 10,
+    max_items: Optional[int] = None,
+    max_wait: Optional[float] = None,
+    **options: Any,
+) -> AsyncGenerator[StreamBatch, None]:
+    """The ``asyncio`` counterpart of :func:`batch_stream_generator`.
+
+    Args:
+        function: A coroutine function that returns a list of items.
+        cursor: The cursor to use when calling ``function``
+        backfill: A coroutine function that returns a list of items and the cursor of
+            the older items, polled instead of ``function``
+        max_backfill: The maximum number of older pages requested to fill a gap
+        max_items: The maximum number of items per batch
+        max_wait: The maximum number of seconds an item waits for its batch
+        options: The options of :class:`.StreamPoller`
+
+    Yields:
+        AsyncIterator[StreamBatch]: the next batch
+    """
+    poller = StreamPoller(**options)
+    batcher = _Batcher(max_items, max_wait)
+    try:
+        while True:
+            started = time.monotonic()
+            items, older = await _async_poll(
+                poller, function, backfill, cursor, max_backfill
+            )
+            batcher.add(_fresh(poller, items), time.monotonic() - started, older)
+            pause, delay = poller.after_poll()
+            while batcher.due() or pause:
+                batch, entries = batcher.take()
+                yield batch
+                for _, attribute, order in entries:
+                    poller.handled(attribute, order)
+                pause = pause and bool(batcher.pending)
+            delay = batcher.wait(delay)
+            if delay:
+                await asyncio.sleep(delay)
+    finally:
+        poller.close()
+
+
+def _fresh(poller: StreamPoller, items: List[Any]) -> List[Entry]:
+    entries = poller.fresh(items)
+    if not poller.skip_existing:
+        return entries
+    for _, attribute, order in entries:
+        poller.handled(attribute, order)
+    return []
+
+
+async def merge_streams(
+    streams: Dict[str, AsyncIterator[Any]], max_buffered: int = 100
+) -> AsyncGenerator[Tuple[str, Any], None]:
+    """Run several async streams together in the current event loop.
+
+    Every stream is consumed by its own task, at most ``max_buffered`` items are
+    buffered ahead of the consumer. The first error of a stream is raised, closing the
+    merged stream stops all the streams.
+
+    Args:
+        streams: The streams by name, like ``{"casts": client.stream_casts()}``
+        max_buffered: The maximum number of items buffered ahead of the consumer
+
+    Yields:
+        Tuple[str, Any]: the name of the stream and its next item, ``None`` items of
+        pausing streams included
+    """
+    queue: "asyncio.Queue[Tuple[str, Any, Optional[BaseException]]]" = asyncio.Queue(
+        maxsize=max(max_buffered, 1)
+    )
+    done = object()
+
+    async def pump(name: str, stream: AsyncIterator[Any]) -> None:
+        try:
+            async for item in stream:
+                await queue.put((name, item, None))
+                # let the other streams in, a stream may never block otherwise
+                await asyncio.sleep(0)
+        except Exception as e:  # pylint: disable=broad-except
+            await queue.put((name, None, e))
         else:
-            responses_without_new += 1
-            if pause_after is not None:
-                if responses_without_new > pause_after:
-                    exponential_counter.reset()
-                    responses_without_new = 0
-                    yield None
-            else:
-                time.sleep(exponential_counter.counter())
+            await queue.put((name, done, None))
+
+    tasks = [asyncio.ensure_future(pump(n, s)) for n, s in streams.items()]
+    running = len(tasks)
+    try:
+        while running:
+            name, item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is done:
+                running -= 1
+                continue
+            yield name, item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for stream in streams.values():
+            close = getattr(stream, "aclose", None)
+            if close is not None:
+                await close()
 
 
 class BoundedSet:
     """A set with a maximum size that evicts the oldest items when necessary.
     This class does not implement the complete set interface.
+
+    Streams now use :class:`~farcaster.utils.dedup.RingSet`, which does not reorder
+    items on lookups.
     """
 
     _set: OrderedDictType[Any, Any]
@@ -97,6 +633,9 @@ class BoundedSet:
         self._access(item)
         return item in self._set
 
+    def __len__(self) -> int:
+        return len(self._set)
+
     def __init__(self, max_items: int):
         """Initialize a :class:`.BoundedSet` instance."""
         self.max_items = max_items
@@ -114,6 +653,109 @@ class BoundedSet:
             self._set.popitem(last=False)
 
 
+class PollSchedule:
+    """Adapts the poll interval and the page size of a stream to the rate its items
+    arrive at.
+
+    The rate is a moving average of the new items per second seen by each poll. The
+    interval is set so a poll expects to find ``fill`` times ``limit`` new items,
+    leaving the rest of the page to overlap with items seen already: busy streams poll
+    more often, quiet ones less, between ``min_interval`` and ``max_interval``. A
+    stream waiting ``max_interval`` requests only twice the items it expects plus
+    ``overlap``, unless it cannot backfill a gap, then it always requests ``limit``.
+
+    A full page without any item seen before may follow items that arrived and left
+    the page between two polls. Such polls are counted in ``gaps``, the number of times
+    items may have been missed. The page cannot tell how many were, none when exactly
+    a page of items arrived, so no number of missed items is estimated.
+    """
+
+    def __init__(
+        self,
+        limit: int = 50,
+        min_interval: float = 0.0,
+        max_interval: float = 16.0,
+        fill: float = 0.5,
+        overlap: int = 5,
+        smoothing: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a :class:`.PollSchedule` instance.
+
+        Args:
+            limit: The maximum number of items to request at a time
+            min_interval: The minimum number of seconds between two polls
+            max_interval: The maximum number of seconds between two polls
+            fill: The share of a page expected to be new items
+            overlap: The number of seen items a reduced page keeps room for
+            smoothing: The weight of the last poll in the average rate, from 0 to 1
+            clock: A monotonic clock in seconds
+        """
+        self.limit = limit
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.fill = fill
+        self.overlap = overlap
+        self.smoothing = smoothing
+        self.rate: Optional[float] = None
+        self.interval = min(max(1.0, min_interval), max_interval)
+        self.page_size = limit
+        self.gaps = 0
+        self._clock = clock
+        self._polled_at: Optional[float] = None
+
+    def observe(
+        self, new: int, overlap: int, received: int, requested: int, first: bool = False
+    ) -> float:
+        """Update the rate, the interval and the page size with the result of a poll.
+
+        Args:
+            new: The number of new items of the page
+            overlap: The number of items of the page seen already
+            received: The number of items of the page
+            requested: The number of items requested
+            first: ``True`` for the first poll of the stream, its items existed already
+
+        Returns:
+            float: the seconds to wait before the next poll, with jitter
+        """
+        now = self._clock()
+        elapsed = None if self._polled_at is None else now - self._polled_at
+        self._polled_at = now
+        if first or not elapsed:
+            return self._jitter(self.interval)
+        arrived = new
+        if overlap == 0 and new and received >= requested:
+            self.gaps += 1
+            # the page may hold only part of the items, keep to what the rate predicts
+            arrived = max(round((self.rate or 0.0) * elapsed), new)
+            logging.warning(
+                "No overlap with the previous poll, items may have been missed"
+            )
+        sample = arrived / elapsed
+        self.rate = (
+            sample
+            if self.rate is None
+            else self.smoothing * sample + (1 - self.smoothing) * self.rate
+        )
+        expected_per_page = self.fill * self.limit
+        interval = expected_per_page / self.rate if self.rate else self.max_interval
+        self.interval = min(max(interval, self.min_interval), self.max_interval)
+        self.page_size = max(
+            min(math.ceil(2 * self.rate * self.interval) + self.overlap, self.limit), 1
+        )
+        logging.debug(
+            f"Rate: {self.rate:.3f}/s, interval: {self.interval:.3f}s, "
+            f"page size: {self.page_size}"
+        )
+        return self._jitter(self.interval)
+
+    @staticmethod
+    def _jitter(interval: float) -> float:
+        jitter = interval / 16.0
+        return interval + random.random() * jitter - jitter / 2
+
+
 class ExponentialCounter:
     """A class to provide an exponential counter with jitter."""
 
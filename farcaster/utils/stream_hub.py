@@ -0,0 +1,454 @@
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional
+from typing_extensions import Literal
+
+import asyncio
+import logging
+import queue
+import threading
+from collections import deque
+
+Policy = Literal["block", "drop_oldest", "drop_newest"]
+POLICIES = ("block", "drop_oldest", "drop_newest")
+
+STREAMS = {
+    "casts": "stream_casts",
+    "users": "stream_users",
+    "notifications": "stream_notifications",
+}
+
+
+class SubscriptionClosed(Exception):
+    """The subscription was closed, or its hub stopped."""
+
+
+class _Stopped(Exception):
+    """Wakes a poller up from the wait between two polls when it is stopped."""
+
+
+class _Buffer:
+    """The bounded queue of a subscriber and its backpressure policy."""
+
+    def __init__(self, maxsize: int, policy: str):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}")
+        self.maxsize = max(maxsize, 1)
+        self.policy = policy
+        self.dropped = 0
+        self.items: Deque[Any] = deque()
+        self.error: Optional[BaseException] = None
+        self.closed = False
+
+    def offer(self, item: Any) -> bool:
+        """Add an item unless the queue is full, applying the drop policies.
+
+        Returns:
+            bool: ``False`` when a ``block`` subscriber is full and the caller must wait
+        """
+        if len(self.items) >= self.maxsize:
+            if self.policy == "block":
+                return False
+            self.dropped += 1
+            if self.policy == "drop_newest":
+                return True
+            self.items.popleft()
+        self.items.append(item)
+        return True
+
+    def take(self) -> Any:
+        if self.items:
+            return self.items.popleft()
+        if self.error is not None:
+            raise self.error
+        raise SubscriptionClosed()
+
+
+class Subscription:
+    """The items of a hub stream for one subscriber, read with :meth:`get` or by
+    iterating over the subscription.
+
+    ``drop_oldest`` and ``drop_newest`` subscribers lose items when they fall more than
+    ``maxsize`` items behind and count them in ``dropped``. A full ``block`` subscriber
+    holds up the poller, and so every subscriber of the stream, until it catches up.
+    """
+
+    def __init__(self, hub: "StreamHub", stream: str, maxsize: int, policy: str):
+        """Initialize a :class:`.Subscription` instance.
+
+        Args:
+            hub: The hub delivering the items
+            stream: The name of the stream
+            maxsize: The maximum number of items waiting in the queue
+            policy: What to do when the queue is full
+        """
+        self.hub = hub
+        self.stream = stream
+        self._buffer = _Buffer(maxsize, policy)
+        self._condition = threading.Condition()
+
+    @property
+    def dropped(self) -> int:
+        """The number of items dropped because the queue was full."""
+        return self._buffer.dropped
+
+    def __len__(self) -> int:
+        return len(self._buffer.items)
+
+    def _put(self, item: Any, stop: threading.Event) -> None:
+        with self._condition:
+            while not self._buffer.closed and not self._buffer.offer(item):
+                if stop.is_set():
+                    return
+                self._condition.wait(0.1)
+            self._condition.notify_all()
+
+    def _fail(self, error: Optional[BaseException]) -> None:
+        with self._condition:
+            self._buffer.error = error
+            self._buffer.closed = True
+            self._condition.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Get the next item, waiting for it.
+
+        Args:
+            timeout: Seconds to wait, forever by default
+
+        Raises:
+            queue.Empty: No item arrived in time
+            SubscriptionClosed: The subscription was closed and its queue is drained
+
+        Returns:
+            Any: the next item
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._buffer.items or self._buffer.closed, timeout
+            ):
+                raise queue.Empty()
+            item = self._buffer.take()
+            self._condition.notify_all()
+            return item
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                yield self.get()
+            except SubscriptionClosed:
+                return
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unsubscribe, the poller of the stream stops with its last subscriber."""
+        self._fail(None)
+        self.hub._unsubscribe(self)
+
+
+class StreamHub:
+    """Runs a single poller per stream and fans its items out to any number of
+    subscribers, so N consumers of a stream cost one poll instead of N.
+
+    Pollers are threads driving the stream methods of the client (``stream_casts``,
+    ``stream_users`` and ``stream_notifications``), which wait between two polls as
+    long as their :class:`~farcaster.utils.stream_generator.PollSchedule` says. A
+    poller starts with the first subscriber of its stream and stops with the last one.
+    An error of a stream is raised to all its subscribers.
+    """
+
+    def __init__(self, client: Any, max_counter: int = 16, **stream_options: Any):
+        """Initialize a :class:`.StreamHub` instance.
+
+        Args:
+            client: The :class:`~farcaster.client.Warpcast` client to poll with
+            max_counter: The maximum number of seconds to wait between two polls
+            stream_options: Options of the streams, like ``skip_existing``
+        """
+        self.client = client
+        self.max_counter = max_counter
+        self.stream_options = stream_options
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._pollers: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "StreamHub":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def subscribe(
+        self, stream: str = "casts", maxsize: int = 1000, policy: Policy = "block"
+    ) -> Subscription:
+        """Subscribe to a stream.
+
+        Args:
+            stream: ``casts``, ``users`` or ``notifications``
+            maxsize: The maximum number of items waiting for the subscriber
+            policy: What to do when the subscriber is full, ``block`` the poller, drop
+                the oldest waiting item with ``drop_oldest`` or the new one with
+                ``drop_newest``
+
+        Raises:
+            ValueError: The stream is unknown
+
+        Returns:
+            Subscription: the subscription, close it when done
+        """
+        if stream not in STREAMS:
+            raise ValueError(
+                f"Unknown stream {stream!r}, expected one of {list(STREAMS)}"
+            )
+        subscription = Subscription(self, stream, maxsize, policy)
+        with self._lock:
+            self._subscribers.setdefault(stream, []).append(subscription)
+            if stream not in self._pollers:
+                stop = self._pollers[stream] = threading.Event()
+                threading.Thread(
+                    target=self._poll, args=(stream, stop), daemon=True
+                ).start()
+        return subscription
+
+    def subscribers(self, stream: str) -> int:
+        """Get the number of subscribers of a stream."""
+        with self._lock:
+            return len(self._subscribers.get(stream, []))
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.stream, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers and subscription.stream in self._pollers:
+                self._pollers.pop(subscription.stream).set()
+
+    def _poll(self, stream: str, stop: threading.Event) -> None:
+        def sleep(seconds: float) -> None:
+            if stop.wait(seconds):
+                raise _Stopped()
+
+        items = getattr(self.client, STREAMS[stream])(
+            **{
+                "max_counter": self.max_counter,
+                **self.stream_options,
+                "pause_after": None,
+                "sleep": sleep,
+            }
+        )
+        error: Optional[BaseException] = None
+        try:
+            while not stop.is_set():
+                item = next(items)
+                with self._lock:
+                    subscribers = list(self._subscribers.get(stream, []))
+                for subscription in subscribers:
+                    subscription._put(item, stop)
+        except _Stopped:
+            pass
+        except BaseException as e:  # pylint: disable=broad-except
+            logging.warning(f"Stream {stream} failed: {e!r}")
+            error = e
+        finally:
+            items.close()
+        subscribers = []
+        with self._lock:
+            # a poller stopped by its last subscriber may have been replaced already
+            if self._pollers.get(stream) is stop:
+                del self._pollers[stream]
+                subscribers = self._subscribers.pop(stream, [])
+        for subscription in subscribers:
+            subscription._fail(error)
+
+    def close(self) -> None:
+        """Stop every poller and close every subscription."""
+        with self._lock:
+            subscribers = [s for group in self._subscribers.values() for s in group]
+            self._subscribers.clear()
+            for stop in self._pollers.values():
+                stop.set()
+            self._pollers.clear()
+        for subscription in subscribers:
+            subscription._fail(None)
+
+
+class AsyncSubscription:
+    """The ``asyncio`` counterpart of :class:`.Subscription`."""
+
+    def __init__(self, hub: "AsyncStreamHub", stream: str, maxsize: int, policy: str):
+        """Initialize an :class:`.AsyncSubscription` instance.
+
+        Args:
+            hub: The hub delivering the items
+            stream: The name of the stream
+            maxsize: The maximum number of items waiting in the queue
+            policy: What to do when the queue is full
+        """
+        self.hub = hub
+        self.stream = stream
+        self._buffer = _Buffer(maxsize, policy)
+        self._changed = asyncio.Event()
+
+    @property
+    def dropped(self) -> int:
+        """The number of items dropped because the queue was full."""
+        return self._buffer.dropped
+
+    def __len__(self) -> int:
+        return len(self._buffer.items)
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _put(self, item: Any) -> None:
+        while not self._buffer.closed and not self._buffer.offer(item):
+            await self._changed.wait()
+        self._notify()
+
+    def _fail(self, error: Optional[BaseException]) -> None:
+        self._buffer.error = error
+        self._buffer.closed = True
+        self._notify()
+
+    async def get(self) -> Any:
+        """Get the next item, waiting for it.
+
+        Raises:
+            SubscriptionClosed: The subscription was closed and its queue is drained
+
+        Returns:
+            Any: the next item
+        """
+        while not self._buffer.items and not self._buffer.closed:
+            await self._changed.wait()
+        item = self._buffer.take()
+        self._notify()
+        return item
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while True:
+            try:
+                yield await self.get()
+            except SubscriptionClosed:
+                return
+
+    async def __aenter__(self) -> "AsyncSubscription":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Unsubscribe, the poller of the stream stops with its last subscriber."""
+        self._fail(None)
+        await self.hub._unsubscribe(self)
+
+
+class AsyncStreamHub:
+    """The ``asyncio`` counterpart of :class:`.StreamHub`, pollers are tasks driving
+    the streams of an :class:`~farcaster.async_client.AsyncWarpcast` client.
+    """
+
+    def __init__(self, client: Any, max_counter: int = 16, **stream_options: Any):
+        """Initialize an :class:`.AsyncStreamHub` instance.
+
+        Args:
+            client: The :class:`~farcaster.async_client.AsyncWarpcast` client to poll
+                with
+            max_counter: The maximum number of seconds to wait between two polls
+            stream_options: Options of the streams, like ``skip_existing``
+        """
+        self.client = client
+        self.max_counter = max_counter
+        self.stream_options = stream_options
+        self._subscribers: Dict[str, List[AsyncSubscription]] = {}
+        self._pollers: Dict[str, "asyncio.Task[None]"] = {}
+
+    async def __aenter__(self) -> "AsyncStreamHub":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def subscribe(
+        self, stream: str = "casts", maxsize: int = 1000, policy: Policy = "block"
+    ) -> AsyncSubscription:
+        """Subscribe to a stream, see :meth:`.StreamHub.subscribe`.
+
+        Args:
+            stream: ``casts``, ``users`` or ``notifications``
+            maxsize: The maximum number of items waiting for the subscriber
+            policy: ``block``, ``drop_oldest`` or ``drop_newest``
+
+        Raises:
+            ValueError: The stream is unknown
+
+        Returns:
+            AsyncSubscription: the subscription, close it when done
+        """
+        if stream not in STREAMS:
+            raise ValueError(
+                f"Unknown stream {stream!r}, expected one of {list(STREAMS)}"
+            )
+        subscription = AsyncSubscription(self, stream, maxsize, policy)
+        self._subscribers.setdefault(stream, []).append(subscription)
+        if stream not in self._pollers:
+            self._pollers[stream] = asyncio.ensure_future(self._poll(stream))
+        return subscription
+
+    def subscribers(self, stream: str) -> int:
+        """Get the number of subscribers of a stream."""
+        return len(self._subscribers.get(stream, []))
+
+    async def _unsubscribe(self, subscription: AsyncSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.stream, [])
+        if subscription in subscribers:
+            subscribers.remove(subscription)
+        if not subscribers and subscription.stream in self._pollers:
+            await _cancel(self._pollers.pop(subscription.stream))
+
+    async def _poll(self, stream: str) -> None:
+        # the stream sleeps on its schedule, and is cancelled with the poller
+        items = getattr(self.client, STREAMS[stream])(
+            **{
+                "max_counter": self.max_counter,
+                **self.stream_options,
+                "pause_after": None,
+            }
+        )
+        error: Optional[BaseException] = None
+        try:
+            async for item in items:
+                for subscription in list(self._subscribers.get(stream, [])):
+                    await subscription._put(item)
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning(f"Stream {stream} failed: {e!r}")
+            error = e
+        finally:
+            await items.aclose()
+            if self._pollers.get(stream) is asyncio.current_task():
+                del self._pollers[stream]
+                for subscription in self._subscribers.pop(stream, []):
+                    subscription._fail(error)
+
+    async def close(self) -> None:
+        """Stop every poller and close every subscription."""
+        pollers = list(self._pollers.values())
+        self._pollers.clear()
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription._fail(None)
+        self._subscribers.clear()
+        for poller in pollers:
+            await _cancel(poller)
+
+
+async def _cancel(task: "asyncio.Task[None]") -> None:
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -3,7 +3,7 @@ import os
 import pytest
 from dotenv import load_dotenv
 
-from farcaster import Warpcast
+from farcaster import AsyncWarpcast, Warpcast
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -17,3 +17,10 @@ def client() -> Warpcast:
 @pytest.fixture(scope="module")
 def vcr_config():
     return {"filter_headers": ["authorization", "DUMMY"]}
+
+
+@pytest.fixture()
+def async_client() -> AsyncWarpcast:
+    access_token = os.getenv("AUTH")
+    assert access_token, "AUTH env var not set"
+    return AsyncWarpcast(access_token=access_token)
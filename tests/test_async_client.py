@@ -0,0 +1,228 @@
+from typing import Any, List
+
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from farcaster import AsyncWarpcast, models
+from farcaster.utils.cache import SQLiteCache
+
+
+@pytest.fixture(scope="module")
+def vcr_cassette_dir() -> str:
+    # the async client replays the cassettes recorded for the sync client
+    return os.path.join(os.path.dirname(__file__), "cassettes", "test_farcaster")
+
+
+@pytest.mark.vcr
+def test_get_cast(async_client: AsyncWarpcast) -> None:
+    """Unit test that gets cast with the async client
+
+    Args:
+        async_client: fixture
+
+    Returns:
+        None
+    """
+
+    async def run() -> models.CastContent:
+        async with async_client:
+            return await async_client.get_cast(
+                "0x321712dc8eccc5d2be38e38c1ef0c8916c49949a80ffe20ec5752bb23ea4d86f"
+            )
+
+    response = asyncio.run(run())
+    assert response.cast.author.fid == 3
+
+
+@pytest.mark.vcr
+def test_get_casts(async_client: AsyncWarpcast) -> None:
+    """Unit test that gets a user's recent casts with the async client
+
+    Args:
+        async_client: fixture
+
+    Returns:
+        None
+    """
+
+    async def run() -> List[models.IterableCastsResult]:
+        async with async_client:
+            return list(
+                await asyncio.gather(
+                    async_client.get_casts(fid=50),
+                    async_client.get_casts(fid=3, limit=150),
+                )
+            )
+
+    response1, response2 = asyncio.run(run())
+    assert len(response1.casts) == 25
+    assert len(response2.casts) == 150
+
+
+@pytest.mark.vcr
+def test_get_user_by_username(async_client: AsyncWarpcast) -> None:
+    """Unit test that gets user by username with the async client
+
+    Args:
+        async_client: fixture
+
+    Returns:
+        None
+    """
+
+    async def run() -> models.ApiUser:
+        async with async_client:
+            return await async_client.get_user_by_username(username="mason")
+
+    user = asyncio.run(run())
+    assert user.username == "mason"
+    assert user.fid == 50
+
+
+@pytest.mark.vcr
+def test_stream_casts(async_client: AsyncWarpcast) -> None:
+    """Unit test that tests streaming casts with the async client
+
+    Args:
+        async_client: fixture
+
+    Returns:
+        None
+    """
+
+    async def run() -> List[models.ApiCast]:
+        casts: List[models.ApiCast] = []
+        async with async_client:
+            async for cast in async_client.stream_casts(pause_after=-1):
+                if cast is None:
+                    break
+                casts.append(cast)
+        return casts
+
+    assert len(asyncio.run(run())) == 50
+
+
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_user")
+def test_get_users(async_client: AsyncWarpcast) -> None:
+    """Unit test that gets many users with the async client
+
+    Args:
+        async_client: fixture
+
+    Returns:
+        None
+    """
+
+    async def run() -> models.UserLookupsResult:
+        async with async_client:
+            return await async_client.get_users([50, 50], concurrency=2)
+
+    response = asyncio.run(run())
+    assert len(response.results) == 2
+    for result in response.results:
+        assert result.user is not None
+        assert result.user.fid == 50
+
+
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_user")
+def test_get_user_coalesced(async_client: AsyncWarpcast) -> None:
+    """Unit test that shares one request between identical concurrent lookups
+
+    Args:
+        async_client: fixture
+
+    Returns:
+        None
+    """
+
+    async def run() -> List[models.ApiUser]:
+        async with async_client:
+            return list(
+                await asyncio.gather(*(async_client.get_user(50) for _ in range(3)))
+            )
+
+    # the cassette holds a single response and refuses repeated playbacks
+    assert [user.username for user in asyncio.run(run())] == ["mason"] * 3
+
+
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_user")
+def test_get_user_cached(async_client: AsyncWarpcast, tmp_path: Any) -> None:
+    """Unit test that serves repeated user lookups from an on-disk cache
+
+    Args:
+        async_client: fixture
+        tmp_path: fixture
+
+    Returns:
+        None
+    """
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    cached_client = AsyncWarpcast(access_token=async_client.access_token, cache=cache)
+
+    async def run() -> List[models.ApiUser]:
+        async with cached_client:
+            return [await cached_client.get_user(50) for _ in range(2)]
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+def test_pool_config(async_client: AsyncWarpcast) -> None:
+    """Unit test that sizes the connection pool from the configuration
+
+    Args:
+        async_client: fixture
+
+    Returns:
+        None
+    """
+    pooled_client = AsyncWarpcast(
+        access_token=async_client.access_token,
+        pool_maxsize=4,
+        pool_block=True,
+        pool_timeout=5.0,
+    )
+    pool = pooled_client.session._transport._pool  # type: ignore[attr-defined]
+    assert (pool._max_connections, pool._max_keepalive_connections) == (40, 4)
+    assert pooled_client.session.timeout.pool == 5.0
+    unpooled_client = AsyncWarpcast(
+        access_token=async_client.access_token, keep_alive=False
+    )
+    pool = unpooled_client.session._transport._pool  # type: ignore[attr-defined]
+    assert pool._max_keepalive_connections == 0
+    asyncio.run(pooled_client.aclose())
+    asyncio.run(unpooled_client.aclose())
+
+
+def test_post_not_retried(async_client: AsyncWarpcast) -> None:
+    """Unit test that never sends a cast twice on a retryable status
+
+    Args:
+        async_client: fixture
+
+    Returns:
+        None
+    """
+    methods: List[str] = []
+
+    def unavailable(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        return httpx.Response(503, json={"errors": [{"message": "unavailable"}]})
+
+    async_client.session = httpx.AsyncClient(transport=httpx.MockTransport(unavailable))
+
+    async def run() -> None:
+        async with async_client:
+            await async_client.post_cast("hello")
+
+    with pytest.raises(Exception, match="unavailable"):
+        asyncio.run(run())
+    assert methods == ["POST"]
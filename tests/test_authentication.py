@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List
 
 import time
 
@@ -8,6 +8,7 @@ import requests
 from farcaster import Warpcast
 from farcaster.client import now_ms
 from farcaster.models import *
+from farcaster.utils.deadline import Deadline, DeadlineExceeded
 
 
 # custom class to be the mock return value
@@ -18,6 +19,9 @@ class MockResponse:
     def json():
         return {"result": {"success": "true"}}
 
+    # the client decodes the raw body itself
+    content = b'{"result": {"success": "true"}}'
+
 
 class MockResponsePut:
     # mock json() method always returns a specific testing dictionary
@@ -97,13 +101,16 @@ def test_put_auth(monkeypatch: Any, client: Warpcast) -> None:
         None
     """
 
+    timeouts: List[Any] = []
+
     def mock_put(*args: Any, **kwargs: Any) -> MockResponsePut:
+        timeouts.append(kwargs["timeout"])
         return MockResponsePut()
 
     def mock_header(*args: Any, **kwargs: Any) -> str:
         return "eip191:V5Opo6K5M6JECBNurxHDtbts3Uqh/QpisEwm0ZSPqQdXrnTBvBZDZSME3HPeq/1pGP7ISwKJocGeWZESMxxxxxx"
 
-    monkeypatch.setattr(requests, "put", mock_put)
+    monkeypatch.setattr(requests.Session, "put", mock_put)
     monkeypatch.setattr(Warpcast, "generate_custody_auth_header", mock_header)
 
     now = int(time.time())
@@ -111,3 +118,6 @@ def test_put_auth(monkeypatch: Any, client: Warpcast) -> None:
     ap = AuthParams(**obj)
     response = client.put_auth(auth_params=ap)
     assert response.token.secret
+    assert timeouts == [(client.config.connect_timeout, client.config.read_timeout)]
+    with Deadline(0), pytest.raises(DeadlineExceeded):
+        client.put_auth(auth_params=ap)
@@ -1,10 +1,16 @@
-from typing import Any, List
+from typing import Any, Dict, List, cast
 
+import itertools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from farcaster import Warpcast, models
+from farcaster import Warpcast, models, records
+from farcaster.utils.cache import MemoryCache
+from farcaster.utils.interning import interning
+from farcaster.utils.rate_limit import AdaptiveRateLimiter
+from farcaster.utils.response_mode import RawDict, response_mode
 
 
 @pytest.mark.vcr
@@ -59,6 +65,28 @@ def test_get_all_casts_in_thread(client: Warpcast) -> None:
     assert response.casts[0].author.fid == 3
 
 
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_all_casts_in_thread")
+def test_get_all_casts_in_thread_interned(client: Warpcast) -> None:
+    """Unit test that shares one instance per user across a thread
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    with interning() as interner:
+        casts = client.get_all_casts_in_thread(
+            "0x321712dc8eccc5d2be38e38c1ef0c8916c49949a80ffe20ec5752bb23ea4d86f"
+        ).casts
+    authors: Dict[int, models.ApiUser] = {}
+    for cast in casts:
+        assert authors.setdefault(cast.author.fid, cast.author) is cast.author
+    assert interner.hits > 0
+    assert len(interner) >= len(authors)
+
+
 @pytest.mark.vcr
 def test_get_casts(client: Warpcast) -> None:
     """Unit test that gets a user's recent casts
@@ -92,6 +120,27 @@ def test_get_cast_likes(client: Warpcast) -> None:
     assert len(response.likes) > 50
 
 
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_cast_likes")
+def test_iter_cast_likes_prefetch(client: Warpcast) -> None:
+    """Unit test that iterates over cast likes while prefetching pages
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    with client.iter_cast_likes(
+        cast_hash="0x5fbc51755100112aaecbc0b5f5fbdc07bc4aa311afb10bfe2436f5fa6824cfd1",
+        prefetch=1,
+    ) as pages:
+        likes = [next(pages)]
+        assert pages._prefetcher is not None
+        likes.extend(itertools.islice(pages, 149))
+    assert len(likes) > 50
+
+
 @pytest.mark.vcr
 def test_get_cast_recasters(client: Warpcast) -> None:
     """Unit test that gets cast recasters
@@ -215,6 +264,55 @@ def test_get_all_followers(client: Warpcast) -> None:
     assert len(response.users) >= 200
 
 
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_all_followers")
+def test_get_all_followers_deadline(client: Warpcast) -> None:
+    """Unit test that gets everyone who follows a user within a deadline
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    response = client.get_all_followers(fid=50, deadline=60)
+    assert len(response.users) >= 200
+    assert response.cursor is None
+
+
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_all_followers")
+def test_get_all_followers_prefetch(client: Warpcast) -> None:
+    """Unit test that gets everyone who follows a user while prefetching pages
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    response = client.get_all_followers(fid=50, prefetch=2)
+    assert len(response.users) >= 200
+
+
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_all_followers")
+def test_iter_followers(client: Warpcast) -> None:
+    """Unit test that lazily iterates over everyone who follows a user
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    pages = client.iter_followers(fid=50)
+    assert next(pages).fid
+    assert pages.cursor
+    assert len(list(pages)) >= 199
+    assert pages.cursor is None
+
+
 @pytest.mark.vcr
 def test_get_user(client: Warpcast) -> None:
     """Unit test that gets user
@@ -229,6 +327,134 @@ def test_get_user(client: Warpcast) -> None:
     assert user.username == "mason"
 
 
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_user")
+def test_get_user_cached(client: Warpcast) -> None:
+    """Unit test that serves repeated user lookups from the cache
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    cache = MemoryCache()
+    cached_client = Warpcast(access_token=client.access_token, cache=cache)
+    assert cached_client.get_user(fid=50) == cached_client.get_user(fid=50)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_user")
+def test_get_user_rate_limited(client: Warpcast) -> None:
+    """Unit test that paces requests from the rate limit headers
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    limiter = AdaptiveRateLimiter(rate=5)
+    limited_client = Warpcast(access_token=client.access_token, rate_limiter=limiter)
+    assert limited_client.get_user(fid=50).username == "mason"
+    # 2493 requests left in the next 3 seconds
+    assert limiter.global_bucket.rate == pytest.approx(0.9 * 2493 / 3)
+    assert limiter.throttled == 0
+
+
+@pytest.mark.vcr(allow_playback_repeats=True)
+@pytest.mark.default_cassette("test_get_user")
+def test_pool_stats(client: Warpcast) -> None:
+    """Unit test that reports the usage of the connection pool
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    pooled_client = Warpcast(
+        access_token=client.access_token, pool_maxsize=2, pool_block=True
+    )
+    pooled_client.get_user(fid=50)
+    stats = pooled_client.pool_stats()
+    assert stats["checkouts"] == stats["created"] == 1
+    assert stats["in_use"] == 0 and stats["idle"] == 1
+    assert stats["discarded"] == 0
+
+    # concurrent requests share at most pool_maxsize connections
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: pooled_client.get_user(fid=50), range(8)))
+    stats = pooled_client.pool_stats()
+    assert stats["checkouts"] > 1
+    assert stats["created"] <= 2 and stats["max_in_use"] <= 2
+    assert stats["in_use"] == 0 and stats["discarded"] == 0
+
+
+@pytest.mark.vcr(allow_playback_repeats=True)
+@pytest.mark.default_cassette("test_get_casts")
+def test_validate_json(client: Warpcast) -> None:
+    """Unit test that validates raw responses like decoded ones
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    dict_client = Warpcast(access_token=client.access_token, validate_json=False)
+    assert client.get_casts(fid=50) == dict_client.get_casts(fid=50)
+
+
+@pytest.mark.vcr(allow_playback_repeats=True)
+@pytest.mark.default_cassette("test_get_casts")
+def test_response_mode(client: Warpcast) -> None:
+    """Unit test that builds and returns responses without validating them
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    validated = client.get_casts(fid=50)
+    constructed = Warpcast(
+        access_token=client.access_token, response_mode="construct"
+    ).get_casts(fid=50)
+    assert isinstance(constructed.casts[0].author, models.ApiUser)
+    assert constructed.model_dump() == validated.model_dump()
+    with response_mode("raw"):
+        raw = cast(RawDict, client.get_casts(fid=50))
+    assert raw.casts[0].author.display_name == validated.casts[0].author.display_name
+    assert raw.cursor == validated.cursor
+    assert raw["casts"][0]["author"]["fid"] == 50
+
+
+@pytest.mark.vcr(allow_playback_repeats=True)
+@pytest.mark.default_cassette("test_get_casts")
+def test_record_response_mode(client: Warpcast) -> None:
+    """Unit test that builds casts into records
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    validated = client.get_casts(fid=50)
+    with response_mode("record"):
+        result = client.get_casts(fid=50)
+    cast = result.casts[0]
+    assert isinstance(cast, records.ApiCast)
+    assert isinstance(cast.author, records.ApiUser)
+    assert cast.author.display_name == validated.casts[0].author.display_name
+    assert result.cursor == validated.cursor
+    assert records.from_model(validated.casts[0]) == cast
+    with pytest.raises(AttributeError):
+        cast.text = "edited"
+
+
 @pytest.mark.vcr
 def test_get_user_by_username(client: Warpcast) -> None:
     """Unit test that gets user by username
@@ -244,6 +470,49 @@ def test_get_user_by_username(client: Warpcast) -> None:
     assert user.fid == 50
 
 
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_user")
+def test_get_users(client: Warpcast) -> None:
+    """Unit test that gets many users, duplicates are looked up once
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    response = client.get_users([50, 50, 50], concurrency=4)
+    assert [result.key for result in response.results] == [50, 50, 50]
+    for result in response.results:
+        assert result.user is not None
+        assert result.user.username == "mason"
+
+
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_user_by_verification")
+def test_get_users_by_verification(client: Warpcast) -> None:
+    """Unit test that gets many users by verification, failures are kept per item
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    response = client.get_users_by_verification(
+        [
+            "0xDC40CbF86727093c52582405703e5b97D5C64B66",
+            "0x000000000877cb2a6cbce87a34f0d2fd7cb4ad3e",
+            "0xdc40cbf86727093c52582405703e5b97d5c64b66",
+        ]
+    )
+    found, missing, duplicate = response.results
+    assert found.user is not None
+    assert found.user.username == "mason" and found.error is None
+    assert missing.user is None and missing.error
+    assert duplicate.user == found.user
+
+
 @pytest.mark.vcr
 def test_get_user_cast_likes(client: Warpcast) -> None:
     """Unit test that gets user cast likes
@@ -261,6 +530,33 @@ def test_get_user_cast_likes(client: Warpcast) -> None:
     assert len(response.likes) == 200
 
 
+@pytest.mark.vcr(allow_playback_repeats=True)
+@pytest.mark.default_cassette("test_get_user_cast_likes")
+def test_user_cast_likes_response_mode(client: Warpcast) -> None:
+    """Unit test that builds user cast likes in every response mode
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    validated = client.get_user_cast_likes(fid=50)
+    with response_mode("construct"):
+        constructed = client.get_user_cast_likes(fid=50)
+    assert isinstance(constructed.likes[0].reactor, models.ApiUser)
+    assert constructed.model_dump() == validated.model_dump()
+    with response_mode("raw"):
+        raw = cast(RawDict, client.get_user_cast_likes(fid=50))
+    assert raw.likes[0].cast_hash == validated.likes[0].cast_hash
+    assert raw["likes"][0]["castHash"] == validated.likes[0].cast_hash
+    assert raw.cursor == validated.cursor
+    with response_mode("record"):
+        result = client.get_user_cast_likes(fid=50)
+    assert isinstance(result.likes[0], records.ApiCastReaction)
+    assert records.from_model(validated.likes[0]) == result.likes[0]
+
+
 @pytest.mark.vcr
 def test_get_custody_address(client: Warpcast) -> None:
     """Unit test that gets custody address
@@ -363,6 +659,26 @@ def test_stream_casts(client: Warpcast) -> None:
     assert len(casts) == 50
 
 
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_stream_casts")
+def test_stream_batches(client: Warpcast) -> None:
+    """Unit test that streams casts in batches
+
+    Args:
+        client: fixture
+
+    Returns:
+        None
+    """
+    batches = client.stream_batches("casts", pause_after=-1)
+    batch = next(batches)
+    assert batch.size == 50 and batch.polls == 1 and batch.latency > 0
+    assert batch.cursor
+    batches.close()
+    with pytest.raises(ValueError):
+        client.stream_batches("reactions")
+
+
 @pytest.mark.vcr
 def test_stream_casts_skip_existing(client: Warpcast) -> None:
     """Unit test that tests streaming casts
@@ -546,3 +862,29 @@ class TestRW:
         logging.debug(self.__class__.cast_hash)
         response = client.delete_cast(self.__class__.cast_hash)
         assert response.success
+
+
+@pytest.mark.vcr
+@pytest.mark.default_cassette("test_get_casts")
+def test_write_parquet(client: Warpcast, tmp_path: Any) -> None:
+    """Unit test that streams paginated casts into a Parquet file in batches
+
+    Args:
+        client: fixture
+        tmp_path: fixture
+
+    Returns:
+        None
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+    from farcaster.utils.columnar import CAST_COLUMNS, write_parquet
+
+    path = tmp_path / "casts.parquet"
+    casts = itertools.islice(client.iter_casts(fid=50, page_size=25), 25)
+    written = write_parquet(casts, path, batch_size=10)
+    table = pq.read_table(path)
+    assert written == table.num_rows == 25
+    assert pq.ParquetFile(path).num_row_groups == 3
+    assert table.column_names == [name for name, _, _ in CAST_COLUMNS]
+    assert table.column("author_fid").null_count == 0
+    assert str(table.schema.field("timestamp").type) == "timestamp[ms]"
@@ -0,0 +1,40 @@
+from farcaster import models, records
+
+
+def test_from_json() -> None:
+    """Unit test that builds records from decoded JSON
+
+    Returns:
+        None
+    """
+    user = {
+        "fid": 3,
+        "displayName": "Dan",
+        "profile": {"bio": {"text": "hi", "mentions": ["v"]}},
+        "followerCount": 1,
+        "followingCount": 2,
+    }
+    record = records.from_json(models.ApiUser, user)
+    assert record.display_name == "Dan"
+    assert record.profile.bio.mentions == ("v",)
+    assert record.pfp is None
+    assert not hasattr(record, "__dict__")
+    notification = records.from_json(
+        models.MentionAndReplyNotificationsGetResponse,
+        {
+            "result": {
+                "notifications": [
+                    {
+                        "type": "cast-mention",
+                        "id": "1",
+                        "timestamp": 1,
+                        "actor": user,
+                        "content": {"cast": None},
+                    }
+                ]
+            }
+        },
+    ).result.notifications[0]
+    assert isinstance(notification, records.MentionNotification)
+    assert notification.actor == record
+    assert records.make(models.Next).cursor is None
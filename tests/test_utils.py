@@ -1,12 +1,78 @@
-# import pytest
-from typing import List, Optional, Union
+from types import SimpleNamespace
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import asyncio
+import itertools
+import queue
+import threading
+import time
 
-from farcaster.models import ApiCast, ApiUser, MentionNotification, ReplyNotification
+import pytest
+
+from farcaster import records
+from farcaster.models import (
+    ApiCast,
+    ApiUser,
+    MentionNotification,
+    Next,
+    ReplyNotification,
+    UserGetResponse,
+)
+from farcaster.utils.cache import MemoryCache, ResponseCache, SQLiteCache, cache_key
+from farcaster.utils.checkpoint import (
+    CheckpointStore,
+    FileCheckpointStore,
+    SQLiteCheckpointStore,
+    StreamCheckpoint,
+)
+from farcaster.utils.concurrency import fan_out
+from farcaster.utils.crawler import (
+    CrawlStore,
+    EdgeListCrawlStore,
+    GraphCrawler,
+    SQLiteCrawlStore,
+)
+from farcaster.utils.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    request_timeouts,
+    within,
+)
+from farcaster.utils.dedup import BloomWindow, DedupSet, RingSet
+from farcaster.utils.fast_json import loads, validate_json
+from farcaster.utils.interning import UserInterner, current_interner, interning
+from farcaster.utils.pagination import PageIterator
+from farcaster.utils.pool import PooledHTTPAdapter
+from farcaster.utils.rate_limit import AdaptiveRateLimiter, TokenBucket
+from farcaster.utils.response_mode import (
+    RawDict,
+    construct,
+    current_response_mode,
+    parse_response,
+    response_mode,
+)
+from farcaster.utils.singleflight import AsyncSingleFlight, SingleFlight
 from farcaster.utils.stream_generator import (
     BoundedSet,
     ExponentialCounter,
+    PollSchedule,
+    StreamPoller,
+    async_batch_stream_generator,
+    async_stream_generator,
+    batch_stream_generator,
+    merge_streams,
     stream_generator,
 )
+from farcaster.utils.stream_hub import AsyncStreamHub, StreamHub, SubscriptionClosed
 
 
 def mock_get_recent_users(cursor: Optional[str], limit: int) -> List[ApiUser]:
@@ -341,6 +407,208 @@ def test_bounded_set():
     assert 1 not in b_set
 
 
+def test_poll_schedule():
+    now = [0.0]
+    schedule = PollSchedule(limit=50, max_interval=16, clock=lambda: now[0])
+    schedule.observe(0, 0, 50, 50, first=True)
+    # 100 new items per second, a poll should find 25
+    now[0] += 0.1
+    schedule.observe(10, 40, 50, 50)
+    assert schedule.rate == 100
+    assert schedule.interval == pytest.approx(0.25)
+    assert schedule.page_size == 50
+    # the feed quietens down, polls are spread out and pages shrink
+    for _ in range(10):
+        now[0] += schedule.interval
+        schedule.observe(0, 50, 50, 50)
+    assert schedule.interval == 16
+    assert schedule.page_size < 10
+    assert 14 < schedule.observe(0, 50, 50, 50) < 18
+    assert schedule.gaps == 0
+
+
+def test_poll_schedule_gaps():
+    now = [0.0]
+    feed = [SimpleNamespace(hash=str(i)) for i in range(10)]
+
+    def poll(cursor: Optional[str], limit: int) -> List[SimpleNamespace]:
+        return list(reversed(feed))[:limit]
+
+    schedule = PollSchedule(limit=10, clock=lambda: now[0])
+    poller = StreamPoller(schedule=schedule)
+    assert len(list(poller.new_items(poll(None, poller.page_size())))) == 10
+    poller.after_poll()
+    feed.extend(SimpleNamespace(hash=str(i)) for i in range(10, 14))
+    now[0] += 1
+    assert len(list(poller.new_items(poll(None, poller.page_size())))) == 4
+    poller.after_poll()
+    assert (schedule.rate, schedule.gaps) == (4, 0)
+    # 30 items arrive in 2 seconds, 20 of them never make it into a page: the poll is
+    # counted as a gap, the page cannot tell how many items were missed
+    feed.extend(SimpleNamespace(hash=str(i)) for i in range(14, 44))
+    now[0] += 2
+    assert len(list(poller.new_items(poll(None, poller.page_size())))) == 10
+    poller.after_poll()
+    assert schedule.gaps == 1
+    assert schedule.interval < 1.25
+    # exactly a page of new items fills it without overlap either, also a gap
+    feed.extend(SimpleNamespace(hash=str(i)) for i in range(44, 54))
+    now[0] += 1
+    assert len(list(poller.new_items(poll(None, poller.page_size())))) == 10
+    poller.after_poll()
+    assert schedule.gaps == 2
+
+
+def test_stream_generator_full_pages_without_backfill():
+    requested: List[int] = []
+
+    def poll(cursor: Optional[str], limit: int) -> List[Any]:
+        requested.append(limit)
+        return []
+
+    clock = itertools.count()
+    schedule = PollSchedule(limit=10, clock=lambda: float(next(clock)))
+    stream = stream_generator(poll, pause_after=0, schedule=schedule)
+    assert list(itertools.islice(stream, 3)) == [None] * 3
+    # the quiet stream has no backfill to recover a burst, its pages do not shrink
+    assert schedule.page_size < 10
+    assert requested == [10] * 3
+
+
+def test_stream_generator_backfill():
+    feed = [SimpleNamespace(hash=str(i), timestamp=i) for i in range(5)]
+    requests = []
+
+    def page(
+        cursor: Optional[str], limit: int
+    ) -> Tuple[List[SimpleNamespace], Optional[str]]:
+        requests.append(cursor)
+        start = int(cursor or 0)
+        newest_first = list(reversed(feed))
+        older = str(start + limit) if start + limit < len(feed) else None
+        return newest_first[start : start + limit], older
+
+    def poll(cursor: Optional[str], limit: int) -> List[Any]:
+        return page(cursor, limit)[0]  # pragma: no cover
+
+    stream = stream_generator(poll, backfill=page, limit=10, pause_after=0)
+    assert [cast.hash for cast in itertools.islice(stream, 5)] == list("01234")
+    assert next(stream) is None
+    # 25 casts arrive between two polls of 10
+    feed.extend(SimpleNamespace(hash=str(i), timestamp=i) for i in range(5, 30))
+    requests.clear()
+    hashes = [cast.hash for cast in itertools.islice(stream, 25)]
+    assert hashes == [str(i) for i in range(5, 30)]
+    # a quiet stream polls 5 casts, then pages back until it reconnects
+    assert requests == [None, "5", "15", "25"]
+    assert next(stream) is None
+
+    # without enough backfill pages the oldest casts of the gap are lost
+    schedule = PollSchedule(limit=10)
+    stream = stream_generator(
+        poll, backfill=page, max_backfill=1, pause_after=0, schedule=schedule
+    )
+    assert len(list(itertools.takewhile(lambda cast: cast is not None, stream))) == 10
+    feed.extend(SimpleNamespace(hash=str(i), timestamp=i) for i in range(30, 60))
+    hashes = [cast.hash for cast in itertools.takewhile(bool, stream)]
+    assert hashes == [str(i) for i in range(45, 60)]
+    assert schedule.gaps == 1
+
+
+def test_ring_set():
+    ring = RingSet(3)
+    for item in "abca":
+        ring.add(item)
+    assert "a" in ring and len(ring) == 3
+    ring.add("d")
+    # lookups do not refresh items, the oldest one is evicted
+    assert "a" not in ring
+    assert [item in ring for item in "bcd"] == [True, True, True]
+    with pytest.raises(TypeError):
+        DedupSet()  # type: ignore[abstract]
+
+
+def test_bloom_window():
+    now = [0.0]
+    bloom = BloomWindow(capacity=1000, error_rate=0.01, clock=lambda: now[0])
+    for i in range(3000):
+        bloom.add(f"0x{i}")
+    # the last ``capacity`` items are always found
+    assert all(f"0x{i}" in bloom for i in range(2000, 3000))
+    assert "0x0" not in bloom
+    false_positives = sum(f"0y{i}" in bloom for i in range(20_000))
+    assert false_positives / 20_000 < 0.02
+    assert bloom.false_positive_rate < 0.01
+    assert len(bloom) <= 2000 and bloom.nbytes < 3000
+
+    timed = BloomWindow(capacity=1000, window=60, clock=lambda: now[0])
+    timed.add("0x1")
+    now[0] += 61
+    timed.add("0x2")
+    assert "0x1" in timed
+    now[0] += 61
+    timed.add("0x3")
+    assert "0x1" not in timed and "0x2" in timed
+
+    with pytest.raises(ValueError):
+        BloomWindow(error_rate=0)
+
+    stream = stream_generator(
+        mock_get_recent_casts, pause_after=-1, dedup=BloomWindow(1000)
+    )
+    assert len(list(itertools.takewhile(bool, stream))) == 3
+
+
+def test_batch_stream_generator(tmp_path):
+    feed = [SimpleNamespace(hash=str(i), timestamp=i) for i in range(3)]
+
+    def poll(cursor: Optional[str], limit: int) -> List[Any]:
+        return list(reversed(feed))[:limit]
+
+    store = FileCheckpointStore(str(tmp_path))
+    checkpoint = StreamCheckpoint(store, "casts", interval=0)
+    batches = batch_stream_generator(
+        poll, pause_after=1, order_attribute_name="timestamp", checkpoint=checkpoint
+    )
+    batch = next(batches)
+    assert [cast.hash for cast in batch.items] == ["0", "1", "2"]
+    assert (batch.polls, batch.size, batch.cursor) == (1, 3, None)
+    # handed to the checkpoint once the next batch is requested
+    assert checkpoint.seen == []
+    # pausing after two polls without new casts
+    paused = next(batches)
+    assert (paused.items, paused.polls, paused.cursor) == ([], 2, None)
+    assert paused.latency == pytest.approx(0, abs=0.1)
+    assert checkpoint.seen == ["0", "1", "2"]
+
+    # batches of at most 2 casts, gathered over polls
+    batches = batch_stream_generator(poll, max_items=2, pause_after=0)
+    assert [len(next(batches).items) for _ in range(3)] == [2, 1, 0]
+    feed.append(SimpleNamespace(hash="3", timestamp=3))
+    assert [cast.hash for cast in next(batches).items] == ["3"]
+
+    # batches of the casts gathered for 0.05 seconds, waiting at most that long
+    delays: List[float] = []
+    batches = batch_stream_generator(
+        poll, max_wait=0.05, max_counter=1, sleep=delays.append
+    )
+    assert len(next(batches).items) == 4
+    assert delays and all(0 < delay <= 0.05 for delay in delays)
+
+
+def test_async_batch_stream_generator():
+    async def poll(cursor: Optional[str], limit: int) -> List[Any]:
+        return [SimpleNamespace(hash="1"), SimpleNamespace(hash="0")]
+
+    async def main() -> List[int]:
+        batches = async_batch_stream_generator(poll, max_items=1, pause_after=-1)
+        sizes = [len((await batches.__anext__()).items) for _ in range(3)]
+        await batches.aclose()
+        return sizes
+
+    assert asyncio.run(main()) == [1, 1, 0]
+
+
 def test_exponential_counter():
     counter = ExponentialCounter(5)
     count1 = counter.counter()
@@ -355,3 +623,911 @@ def test_exponential_counter_reset():
     assert counter.counter() > 4
     counter.reset()
     assert counter.counter() < 2
+
+
+def mock_fetch_page(cursor: Optional[str]) -> Tuple[List[int], Optional[str]]:
+    page = int(cursor or 0)
+    next_cursor = str(page + 1) if page < 2 else None
+    return [page * 10 + i for i in range(10)], next_cursor
+
+
+def test_page_iterator():
+    pages: PageIterator[int] = PageIterator(mock_fetch_page)
+    assert next(pages) == 0
+    assert pages.page_cursor is None
+    assert pages.cursor == "1"
+    assert len(list(pages)) == 29
+    assert pages.exhausted
+    assert pages.cursor is None
+
+
+def test_page_iterator_take():
+    pages: PageIterator[int] = PageIterator(mock_fetch_page)
+    assert pages.take(10) == list(range(10))
+    # a full page was consumed so the next page has not been fetched yet
+    assert pages.cursor == "1"
+    assert pages.take(15) == list(range(10, 25))
+    assert pages.page_cursor == "2"
+    assert PageIterator(mock_fetch_page, cursor="2").take(100) == list(range(20, 30))
+
+
+def test_page_iterator_pages():
+    pages: PageIterator[int] = PageIterator(mock_fetch_page, cursor="1")
+    assert [len(page) for page in pages.pages()] == [10, 10]
+
+
+def test_page_iterator_prefetch():
+    assert list(PageIterator(mock_fetch_page, prefetch=2)) == list(range(30))
+
+    fetched: List[Optional[str]] = []
+
+    def fetch_forever(cursor: Optional[str]) -> Tuple[List[int], Optional[str]]:
+        fetched.append(cursor)
+        page = int(cursor or 0)
+        return [page], str(page + 1)
+
+    pages: PageIterator[int]
+    with PageIterator(fetch_forever, prefetch=1) as pages:
+        assert next(pages) == 0
+        prefetcher = pages._prefetcher
+        assert prefetcher is not None
+    assert pages._prefetcher is None
+    prefetcher._thread.join(timeout=5)
+    assert not prefetcher._thread.is_alive()
+    # one page consumed, one buffered and one waiting for room in the buffer
+    assert len(fetched) <= 3
+
+
+def test_page_iterator_prefetch_error():
+    def fetch(cursor: Optional[str]) -> Tuple[List[int], Optional[str]]:
+        if cursor == "1":
+            raise ValueError("boom")
+        return mock_fetch_page(cursor)
+
+    pages: PageIterator[int] = PageIterator(fetch, prefetch=2)
+    assert pages.take(10) == list(range(10))
+    with pytest.raises(ValueError):
+        next(pages)
+
+
+def test_fan_out():
+    calls: List[int] = []
+
+    def lookup(key: int) -> int:
+        calls.append(key)
+        if key < 0:
+            raise ValueError(key)
+        return key * 2
+
+    outcomes = fan_out(lookup, [3, 1, 3, -1, 2], concurrency=2)
+    assert [key for key, _, _ in outcomes] == [3, 1, 3, -1, 2]
+    assert [result for _, result, _ in outcomes] == [6, 2, 6, None, 4]
+    assert isinstance(outcomes[3][2], ValueError)
+    assert sorted(calls) == [-1, 1, 2, 3]
+    assert fan_out(lookup, []) == []
+
+
+def test_cache_key():
+    assert cache_key("user", {"fid": 50, "cursor": None}) == cache_key(
+        "user", {"fid": 50}
+    )
+    assert cache_key("casts", {"fid": 1, "limit": 2}) == cache_key(
+        "casts", {"limit": 2, "fid": 1}
+    )
+    assert cache_key("user", {"fid": 50}) != cache_key("user", {"fid": 51})
+
+
+def test_memory_cache():
+    cache = MemoryCache(max_items=2, ttls={"cast": 60, "user": 0.01})
+    assert not cache.caches("me")
+    assert cache.get("cast", {"hash": "0x1"}) is None
+    cache.set("cast", {"hash": "0x1"}, {"result": 1})
+    cache.set("me", {}, {"result": 2})
+    assert cache.get("cast", {"hash": "0x1"}) == {"result": 1}
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.set("user", {"fid": 1}, {"result": 3})
+    time.sleep(0.02)
+    assert cache.get("user", {"fid": 1}) is None
+    assert len(cache) == 1
+
+    cache.set("cast", {"hash": "0x2"}, {"result": 4})
+    cache.get("cast", {"hash": "0x1"})
+    cache.set("cast", {"hash": "0x3"}, {"result": 5})
+    # 0x2 is the least recently used entry
+    assert cache.get("cast", {"hash": "0x2"}) is None
+    assert cache.get("cast", {"hash": "0x1"}) == {"result": 1}
+    assert cache.evictions == 1
+
+    cache.invalidate("cast", {"hash": "0x1"})
+    assert cache.get("cast", {"hash": "0x1"}) is None
+    cache.clear()
+    assert len(cache) == 0
+
+    class PartialCache(ResponseCache):
+        def _load(self, key: str, now: float) -> None:
+            return None
+
+    # a backend missing part of the storage fails when it is built
+    with pytest.raises(TypeError):
+        PartialCache()  # type: ignore[abstract]
+
+
+def test_sqlite_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ttls = {"cast": 60, "user": 0.01}
+    with SQLiteCache(path, max_items=2, ttls=ttls, compact_interval=None) as cache:
+        cache.set("cast", {"hash": "0x1"}, {"result": {"text": "gm"}})
+        cache.set("user", {"fid": 1}, {"result": 1})
+        cache.set("me", {}, {"result": 2})
+        assert len(cache) == 2
+
+    # entries survive a restart
+    with SQLiteCache(path, max_items=2, ttls=ttls, compact_interval=None) as cache:
+        assert cache.get("cast", {"hash": "0x1"}) == {"result": {"text": "gm"}}
+        time.sleep(0.02)
+        assert cache.get("user", {"fid": 1}) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.compact() == 1
+        assert len(cache) == 1
+
+        cache.set("cast", {"hash": "0x2"}, {"result": 2})
+        cache.set("cast", {"hash": "0x3"}, {"result": 3})
+        assert cache.compact() == 1 and cache.evictions == 1
+        cache.invalidate("cast", {"hash": "0x3"})
+        assert len(cache) == 1
+
+        # threads share the pooled connections to the same database
+        results: List[Optional[Dict[Any, Any]]] = []
+        thread = threading.Thread(
+            target=lambda: results.append(cache.get("cast", {"hash": "0x2"}))
+        )
+        thread.start()
+        thread.join()
+        assert results == [{"result": 2}]
+
+        # short-lived threads do not leave connections open behind them
+        for _ in range(10):
+            fan_out(lambda key: cache.get("cast", {"hash": key}), ["0x2"] * 8 + ["0x4"])
+        assert len(cache._idle) <= cache.pool_size
+        assert (cache.hits, cache.misses) == (12, 11)
+        cache.clear()
+        assert len(cache) == 0
+
+
+def test_sqlite_cache_background_compaction(tmp_path):
+    cache = SQLiteCache(
+        str(tmp_path / "cache.db"), ttls={"user": 0.01}, compact_interval=0.02
+    )
+    cache.set("user", {"fid": 1}, {"result": 1})
+    deadline = time.time() + 5
+    while len(cache) and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_single_flight():
+    flights: SingleFlight[int] = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls: List[str] = []
+
+    def slow() -> int:
+        calls.append("slow")
+        started.set()
+        release.wait(5)
+        return 42
+
+    results: List[int] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flights.do("key", slow)))
+        for _ in range(4)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == [42] * 4
+    assert calls == ["slow"]
+    assert len(flights) == 0
+
+    def fail() -> int:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flights.do("key", fail)
+    assert flights.do("key", lambda: 1) == 1
+
+
+def test_async_single_flight():
+    calls: List[int] = []
+
+    async def slow() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def run() -> List[int]:
+        flights: AsyncSingleFlight[int] = AsyncSingleFlight()
+        results = await asyncio.gather(*(flights.do("key", slow) for _ in range(4)))
+        assert len(flights) == 0
+        return list(results) + [await flights.do("key", slow)]
+
+    assert asyncio.run(run()) == [42] * 5
+    assert len(calls) == 2
+
+
+def test_single_flight_deadline():
+    flights: SingleFlight[int] = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    deadlines: List[Optional[Deadline]] = []
+
+    def fetch() -> int:
+        deadline = Deadline.current()
+        deadlines.append(deadline)
+        started.set()
+        if deadline is not None:
+            time.sleep(deadline.remaining())
+            raise DeadlineExceeded("leader timed out")
+        return 42
+
+    errors: List[BaseException] = []
+
+    def lead() -> None:
+        with Deadline(0.1):
+            try:
+                flights.do("key", fetch)
+            except DeadlineExceeded as e:
+                errors.append(e)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    assert started.wait(5)
+    # the follower has no deadline, it runs the call again once the leader timed out
+    assert flights.do("key", fetch) == 42
+    leader.join()
+    assert len(errors) == 1 and len(deadlines) == 2 and deadlines[1] is None
+
+    def slow() -> int:
+        started.set()
+        release.wait(5)
+        return 42
+
+    started.clear()
+    leader = threading.Thread(target=lambda: flights.do("key", slow))
+    leader.start()
+    assert started.wait(5)
+    # a follower waits no longer than its own deadline
+    began = time.monotonic()
+    with Deadline(0.05), pytest.raises(DeadlineExceeded):
+        flights.do("key", slow)
+    assert time.monotonic() - began < 1
+    release.set()
+    leader.join()
+
+
+def test_async_single_flight_deadline():
+    async def fetch() -> int:
+        deadline = Deadline.current()
+        if deadline is not None:
+            await asyncio.sleep(deadline.remaining())
+            raise DeadlineExceeded("leader timed out")
+        return 42
+
+    async def lead(flights: AsyncSingleFlight[int]) -> int:
+        with Deadline(0.1):
+            return await flights.do("key", fetch)
+
+    async def run() -> Tuple[List[Any], float]:
+        flights: AsyncSingleFlight[int] = AsyncSingleFlight()
+        leader = asyncio.ensure_future(lead(flights))
+        await asyncio.sleep(0)
+        # the follower has no deadline, it runs the call again once the leader timed out
+        results = await asyncio.gather(
+            leader, flights.do("key", fetch), return_exceptions=True
+        )
+        release = asyncio.Event()
+
+        async def slow() -> int:
+            await release.wait()
+            return 42
+
+        slow_leader = asyncio.ensure_future(flights.do("key", slow))
+        await asyncio.sleep(0)
+        began = time.monotonic()
+        with Deadline(0.05):
+            # a follower waits no longer than its own deadline
+            with pytest.raises(DeadlineExceeded):
+                await flights.do("key", slow)
+        waited = time.monotonic() - began
+        release.set()
+        assert await slow_leader == 42
+        return list(results), waited
+
+    (leader_result, follower_result), waited = asyncio.run(run())
+    assert isinstance(leader_result, DeadlineExceeded) and follower_result == 42
+    assert waited < 1
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.now = 10
+    # refills up to capacity only
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+    bucket.set_rate(4)
+    assert bucket.reserve() == 0.5
+    clock.now = 20
+    bucket.pause(3)
+    assert bucket.reserve() == 3.25
+
+
+def test_adaptive_rate_limiter():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=10, endpoint_rate=4, min_rate=1, clock=clock)
+    assert limiter.reserve("user") == 0.0
+    assert limiter.bucket("user").rate == 4
+
+    limiter.update("user", 429, {"Retry-After": "2"})
+    assert limiter.throttled == 1
+    assert limiter.bucket("user").rate == 2
+    assert limiter.reserve("user") >= 2.0
+    # other endpoints are not slowed down
+    assert limiter.reserve("cast") == 0.0
+
+    limiter.update("user", 200, {})
+    assert limiter.bucket("user").rate == 2.5
+
+    headers = {"X-RateLimit-Remaining": "90", "X-RateLimit-Reset": "10"}
+    limiter.update("cast", 200, headers)
+    assert limiter.global_bucket.rate == 0.9 * 90 / 10
+
+    clock.now = 100
+    limiter.update(
+        "cast", 200, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "5"}
+    )
+    assert limiter.global_bucket.rate == 1
+    assert limiter.reserve("cast") >= 5.0
+
+
+def test_pooled_http_adapter():
+    adapter = PooledHTTPAdapter(pool_maxsize=1)
+    pool = adapter.poolmanager.connection_from_url("http://localhost")
+    first, second = pool._get_conn(), pool._get_conn()
+    assert adapter.pool_stats()["in_use"] == 2
+    pool._put_conn(first)
+    # the pool only keeps one idle connection
+    pool._put_conn(second)
+    stats = adapter.pool_stats()
+    assert stats["in_use"] == 0 and stats["idle"] == 1
+    assert stats["created"] == 2 and stats["discarded"] == 1
+    assert stats["max_in_use"] == 2
+
+
+def test_deadline():
+    assert Deadline.current() is None
+    assert request_timeouts(10, 30) == (10, 30)
+    with Deadline(60) as outer:
+        assert Deadline.current() is outer
+        connect, read = request_timeouts(10, None)
+        assert connect == 10 and read is not None and 59 < read <= 60
+        # an inner deadline never outlives the outer one
+        with Deadline(120) as inner:
+            assert inner.expires_at == outer.expires_at
+        with Deadline() as inherited:
+            assert inherited.expires_at == outer.expires_at
+        with pytest.raises(DeadlineExceeded):
+            outer.wait(61)
+    assert Deadline.current() is None
+    with Deadline():
+        # an unbounded timeout stays unbounded without a deadline to clamp it
+        assert request_timeouts(None, 30) == (None, 30)
+    with within(None) as unbounded:
+        assert unbounded is None and Deadline.current() is None
+    assert not Deadline().expired
+
+    expired = Deadline(0)
+    assert expired.expired
+    with pytest.raises(DeadlineExceeded):
+        expired.clamp(10)
+
+
+def test_page_iterator_deadline():
+    def slow_fetch(cursor: Optional[str]) -> Tuple[List[int], Optional[str]]:
+        assert Deadline.current() is not None
+        time.sleep(0.05)
+        return mock_fetch_page(cursor)
+
+    for prefetch in (0, 2):
+        with Deadline(0.07):
+            pages: PageIterator[int] = PageIterator(slow_fetch, prefetch=prefetch)
+        items = list(pages)
+        assert pages.timed_out and not pages.exhausted
+        # the cursor resumes right after the last page
+        assert items == list(range(len(items))) and len(items) % 10 == 0
+        assert pages.cursor == str(len(items) // 10)
+        assert list(PageIterator(mock_fetch_page, pages.cursor)) == list(
+            range(len(items), 30)
+        )
+
+    def failing_fetch(cursor: Optional[str]) -> Tuple[List[int], Optional[str]]:
+        raise DeadlineExceeded("too slow")
+
+    pages = PageIterator(failing_fetch)
+    assert pages.take(5) == [] and pages.timed_out and pages.cursor is None
+
+
+def test_fast_json():
+    assert loads(b'{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+    assert validate_json(Next, b'{"cursor": "abc"}').cursor == "abc"
+    with pytest.raises(Exception, match="not found"):
+        validate_json(UserGetResponse, b'{"errors": [{"message": "not found"}]}')
+
+
+def test_response_mode_construct():
+    data = {
+        "result": {"user": {"fid": 3, "username": "dwr", "displayName": "Dan"}},
+        "next": None,
+    }
+    with pytest.raises(ValueError):
+        with response_mode("strict"):  # type: ignore[arg-type]
+            pass
+    with response_mode("construct"):
+        assert current_response_mode() == "construct"
+        response = parse_response(UserGetResponse, data, current_response_mode())
+    assert current_response_mode() == "validate"
+    assert isinstance(response.result.user, ApiUser)
+    assert response.result.user.display_name == "Dan"
+    assert construct(Next, {"cursor": "abc"}).cursor == "abc"
+    with pytest.raises(Exception, match="not found"):
+        parse_response(UserGetResponse, b'{"errors": ["not found"]}', "raw")
+
+
+def test_raw_dict():
+    cached: Dict[str, Any] = {
+        "user": {"displayName": "Dan", "pfp": {"url": "x"}},
+        "casts": [{"a": 1}],
+    }
+    raw = RawDict(cached)
+    assert raw.user.display_name == "Dan"
+    assert raw.user.pfp.url == "x"
+    assert raw.casts[0].a == 1
+    assert raw.missing is None
+    assert type(cached["user"]) is dict and type(cached["casts"][0]) is dict
+    with pytest.raises(AttributeError):
+        raw._private
+
+
+def test_user_interner():
+    user = {
+        "fid": 3,
+        "profile": {"bio": {"text": "hi", "mentions": []}},
+        "followerCount": 1,
+        "followingCount": 2,
+    }
+    assert parse_response(ApiUser, user, "validate") is not parse_response(
+        ApiUser, user, "validate"
+    )
+    with interning() as interner:
+        first = parse_response(ApiUser, user, "validate")
+        assert (
+            parse_response(ApiUser, {**user, "followerCount": 5}, "validate") is first
+        )
+        assert construct(ApiUser, user) is first
+        assert records.from_json(ApiUser, user) is records.from_json(ApiUser, user)
+    assert (interner.hits, interner.misses, len(interner)) == (3, 2, 2)
+    assert current_interner() is None
+
+    bounded = UserInterner(max_users=1)
+    with interning(bounded):
+        parse_response(ApiUser, user, "validate")
+        parse_response(ApiUser, {**user, "fid": 4}, "validate")
+    assert len(bounded) == 1
+
+
+def test_record_batches():
+    pytest.importorskip("pyarrow")
+    from farcaster.utils.columnar import USER_COLUMNS, record_batches, to_table
+
+    users = [
+        records.from_json(
+            ApiUser,
+            {
+                "fid": fid,
+                "username": f"user{fid}",
+                "pfp": {"url": "x", "verified": False},
+                "profile": {"bio": {"text": "hi", "mentions": []}},
+                "followerCount": fid * 10,
+                "followingCount": 0,
+            },
+        )
+        for fid in range(1, 6)
+    ]
+    # a pausing stream flushes the rows gathered so far
+    batches = list(record_batches([*users[:2], None, *users[2:]], USER_COLUMNS, 2))
+    assert [batch.num_rows for batch in batches] == [2, 2, 1]
+    table = to_table(users, USER_COLUMNS)
+    assert table.column("follower_count").to_pylist() == [10, 20, 30, 40, 50]
+    assert table.column("bio").to_pylist() == ["hi"] * 5
+    assert table.column("registered_at").null_count == 5
+
+
+def test_cast_metrics():
+    pytest.importorskip("numpy")
+    from farcaster.utils.metrics import CastMetrics
+
+    count = lambda n: {"count": n}  # noqa: E731
+    casts = [
+        records.from_json(
+            ApiCast,
+            {
+                "hash": str(i),
+                "text": "",
+                "timestamp": 3_600_000 * (i // 2) + 1,
+                "replies": count(i),
+                "reactions": count(10 * i),
+                "recasts": count(0),
+                "watches": count(1),
+            },
+        )
+        for i in range(6)
+    ]
+    metrics = CastMetrics(casts)
+    assert len(metrics) == 6
+    assert metrics.reactions.tolist() == [0, 10, 20, 30, 40, 50]
+    scores = metrics.score(weights={"reactions": 1, "replies": 2})
+    assert scores.tolist() == [0, 12, 24, 36, 48, 60]
+    assert [cast.hash for cast in metrics.top_k(2, scores)] == ["5", "4"]
+    assert metrics.top_k(10, scores)[-1].hash == "0"
+    decayed = metrics.score(weights={"watches": 1}, half_life=3600, now=3600 * 3)
+    assert decayed.tolist() == pytest.approx([0.125, 0.125, 0.25, 0.25, 0.5, 0.5])
+    assert metrics.percentiles("reactions", (0, 50, 100)) == {0: 0, 50: 25, 100: 50}
+    starts, counts, sums = metrics.buckets(3600, "reactions")
+    assert starts.tolist() == [0, 3_600_000, 7_200_000]
+    assert counts.tolist() == [2, 2, 2]
+    assert sums.tolist() == [10, 50, 90]
+    with pytest.raises(ValueError):
+        metrics.field("likes")
+    assert CastMetrics([]).top_k(3) == []
+
+
+def test_stream_checkpoint(tmp_path):
+    feed = [SimpleNamespace(hash=str(i), timestamp=i) for i in range(1, 6)]
+    late = SimpleNamespace(hash="0", timestamp=0)
+
+    # the fakes stand in for casts, they only have the attributes the stream reads
+    def poll(cursor: Optional[str], limit: int) -> List[Any]:
+        return feed[::-1]
+
+    def poll_with_late(cursor: Optional[str], limit: int) -> List[Any]:
+        return [*feed[::-1], late]
+
+    for store in (
+        FileCheckpointStore(str(tmp_path / "checkpoints")),
+        SQLiteCheckpointStore(str(tmp_path / "checkpoints.db")),
+    ):
+        checkpoint = StreamCheckpoint(store, "casts", interval=3600)
+        stream = stream_generator(
+            poll,
+            pause_after=-1,
+            order_attribute_name="timestamp",
+            checkpoint=checkpoint,
+        )
+        assert [next(stream).hash for _ in range(3)] == ["1", "2", "3"]
+        assert checkpoint.saves == 0
+        stream.close()
+        state = store.load("casts")
+        assert state is not None and checkpoint.saves == 1
+        assert state.seen == [("1", 1), ("2", 2)]
+        assert (state.high_water, state.floor) == (2, 1)
+
+        # resumes after the handled items, older unseen items were handled before
+        checkpoint = StreamCheckpoint(store, "casts", interval=0)
+        stream = stream_generator(
+            poll_with_late,
+            pause_after=-1,
+            skip_existing=True,
+            order_attribute_name="timestamp",
+            checkpoint=checkpoint,
+        )
+        assert [item.hash for item in itertools.islice(stream, 3)] == ["3", "4", "5"]
+        assert next(stream) is None
+        assert checkpoint.high_water == 5 and checkpoint.saves == 3
+        stream.close()
+        state = store.load("casts")
+        assert state is not None and state.seen[-1] == ("5", 5)
+    assert store.load("users") is None
+    with pytest.raises(TypeError):
+        CheckpointStore()  # type: ignore[abstract]
+
+
+def test_merge_streams():
+    async def main() -> List[Tuple[str, object]]:
+        polled = asyncio.Event()
+
+        async def casts(cursor: Optional[str], limit: int) -> List[Any]:
+            # only returns once the other stream polled, in the same event loop
+            await polled.wait()
+            return [SimpleNamespace(hash="0x1")]
+
+        async def users(cursor: Optional[str], limit: int) -> List[Any]:
+            polled.set()
+            return [SimpleNamespace(fid=1)]
+
+        merged = merge_streams(
+            {
+                "casts": async_stream_generator(casts, pause_after=-1),
+                "users": async_stream_generator(
+                    users, attribute_name="fid", pause_after=-1
+                ),
+            }
+        )
+        items = []
+        async for name, item in merged:
+            if item is not None:
+                items.append((name, item))
+            if len(items) == 2:
+                break
+        await merged.aclose()
+        return sorted((name, vars(item)) for name, item in items)
+
+    assert asyncio.run(main()) == [("casts", {"hash": "0x1"}), ("users", {"fid": 1})]
+
+    async def failing(cursor: Optional[str], limit: int) -> List[Any]:
+        raise ValueError("boom")
+
+    async def consume() -> None:
+        async for _ in merge_streams({"casts": async_stream_generator(failing)}):
+            pass  # pragma: no cover
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(consume())
+
+
+class FeedClient:
+    """A client whose cast stream pages through a growing feed."""
+
+    def __init__(self) -> None:
+        self.feed: List[SimpleNamespace] = []
+        self.polls = 0
+
+    # pages of Any, like the client methods the streams poll
+    def poll(self, cursor: Optional[str], limit: int) -> List[Any]:
+        self.polls += 1
+        return list(reversed(self.feed))[:limit]
+
+    async def async_poll(self, cursor: Optional[str], limit: int) -> List[Any]:
+        return self.poll(cursor, limit)
+
+    def stream_casts(self, **options: Any) -> Generator[Any, None, None]:
+        return stream_generator(self.poll, **options)
+
+    def async_stream_casts(self, **options: Any) -> AsyncGenerator[Any, None]:
+        return async_stream_generator(self.async_poll, **options)
+
+
+def test_stream_hub():
+    client = FeedClient()
+    client.feed = [SimpleNamespace(hash=str(i)) for i in range(5)]
+    subscribed = threading.Event()
+    poll = client.poll
+
+    def first_poll(cursor: Optional[str], limit: int) -> List[Any]:
+        subscribed.wait(5)  # until every subscriber has joined
+        return poll(cursor, limit)
+
+    client.poll = first_poll  # type: ignore[method-assign]
+    with StreamHub(client, max_counter=1) as hub:
+        blocking = hub.subscribe("casts", maxsize=2)
+        oldest = hub.subscribe("casts", maxsize=2, policy="drop_oldest")
+        newest = hub.subscribe("casts", maxsize=2, policy="drop_newest")
+        assert hub.subscribers("casts") == 3
+        subscribed.set()
+        # the blocking subscriber holds up the poller until it catches up
+        assert [blocking.get(timeout=5).hash for _ in range(5)] == list("01234")
+        while client.polls < 2:  # the page is fanned out to everyone
+            time.sleep(0.01)
+        assert [oldest.get(timeout=5).hash for _ in range(2)] == ["3", "4"]
+        assert [newest.get(timeout=5).hash for _ in range(2)] == ["0", "1"]
+        assert (oldest.dropped, newest.dropped, blocking.dropped) == (3, 3, 0)
+        with pytest.raises(queue.Empty):
+            blocking.get(timeout=0.01)
+        newest.close()
+        with pytest.raises(SubscriptionClosed):
+            newest.get()
+        assert hub.subscribers("casts") == 2
+    assert list(blocking) == []
+
+    with pytest.raises(ValueError):
+        StreamHub(client).subscribe("reactions")
+    with pytest.raises(ValueError):
+        StreamHub(client).subscribe(
+            "casts", policy="drop_random"  # type: ignore[arg-type]
+        )
+
+
+def test_stream_hub_errors():
+    client = FeedClient()
+
+    def failing(cursor: Optional[str], limit: int) -> List[Any]:
+        raise ZeroDivisionError("division by zero")
+
+    client.poll = failing  # type: ignore[method-assign]
+    subscription = StreamHub(client).subscribe("casts")
+    with pytest.raises(ZeroDivisionError):
+        subscription.get(timeout=5)
+
+
+def test_stream_hub_schedule():
+    client = FeedClient()
+    # a quiet stream is polled every max_interval, without backing off further
+    with StreamHub(client, schedule=PollSchedule(max_interval=0.01)) as hub:
+        hub.subscribe("casts")
+        deadline = time.monotonic() + 5
+        while client.polls < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert client.polls >= 10
+
+
+def test_stream_hub_resubscribe():
+    client = FeedClient()
+    client.feed = [SimpleNamespace(hash="0")]
+    polling, release = threading.Event(), threading.Event()
+    pollers: List[threading.Thread] = []
+    poll = client.poll
+
+    def slow_poll(cursor: Optional[str], limit: int) -> List[Any]:
+        if threading.current_thread() not in pollers:
+            pollers.append(threading.current_thread())
+        if client.polls:
+            polling.set()
+            release.wait(5)
+        return poll(cursor, limit)
+
+    client.poll = slow_poll  # type: ignore[method-assign]
+    with StreamHub(client, max_counter=1) as hub:
+        first = hub.subscribe("casts")
+        assert first.get(timeout=5).hash == "0"
+        assert polling.wait(5)
+        # the last subscriber leaves and a new one joins while the poller is mid-poll
+        first.close()
+        second = hub.subscribe("casts")
+        release.set()
+        pollers[0].join(timeout=5)
+        assert not pollers[0].is_alive()
+        assert hub.subscribers("casts") == 1
+        assert second.get(timeout=5).hash == "0"
+
+
+def test_async_stream_hub():
+    async def main() -> Tuple[List[str], List[str], int]:
+        client = FeedClient()
+        client.feed = [SimpleNamespace(hash=str(i)) for i in range(5)]
+        stream_casts: Any = client.async_stream_casts
+        client.stream_casts = stream_casts  # type: ignore[method-assign]
+        async with AsyncStreamHub(client, max_counter=1) as hub:
+            blocking = hub.subscribe("casts", maxsize=2)
+            oldest = hub.subscribe("casts", maxsize=2, policy="drop_oldest")
+            received = [(await blocking.get()).hash for _ in range(5)]
+            while client.polls < 2:
+                await asyncio.sleep(0.01)
+            kept = [(await oldest.get()).hash for _ in range(2)]
+            await blocking.close()
+            await oldest.close()
+            assert hub.subscribers("casts") == 0
+            return received, kept, oldest.dropped
+
+    assert asyncio.run(main()) == (list("01234"), ["3", "4"], 3)
+
+
+class GraphClient:
+    """A client over a follower graph, paging 2 users at a time."""
+
+    def __init__(
+        self, followers: Dict[int, List[int]], fail_after: Optional[int] = None
+    ) -> None:
+        self.followers = followers
+        self.following: Dict[int, List[int]] = {}
+        for fid, others in followers.items():
+            for other in others:
+                self.following.setdefault(other, []).append(fid)
+        self.requests = 0
+        self.fail_after = fail_after
+
+    def _iter(
+        self,
+        graph: Dict[int, List[int]],
+        fid: int,
+        cursor: Optional[str],
+        page_size: int,
+    ) -> PageIterator[SimpleNamespace]:
+        def fetch(cursor: Optional[str]) -> Tuple[List[SimpleNamespace], Optional[str]]:
+            self.requests += 1
+            if self.fail_after is not None and self.requests > self.fail_after:
+                raise ConnectionError("interrupted")
+            start = int(cursor or 0)
+            users = graph.get(fid, [])
+            end = start + 2
+            page = [SimpleNamespace(fid=other) for other in users[start:end]]
+            return page, str(end) if end < len(users) else None
+
+        return PageIterator(fetch, cursor=cursor)
+
+    def iter_followers(
+        self, fid: int, cursor: Optional[str] = None, page_size: int = 100
+    ) -> PageIterator[SimpleNamespace]:
+        return self._iter(self.followers, fid, cursor, page_size)
+
+    def iter_following(
+        self, fid: int, cursor: Optional[str] = None, page_size: int = 100
+    ) -> PageIterator[SimpleNamespace]:
+        return self._iter(self.following, fid, cursor, page_size)
+
+
+GRAPH = {1: [2, 3, 4, 5, 6], 2: [1, 7], 3: [8], 7: [9, 10, 11]}
+GRAPH_EDGES = {(other, fid) for fid, others in GRAPH.items() for other in others}
+
+
+@pytest.mark.parametrize("store_type", ["sqlite", "edge_list"])
+def test_graph_crawler(tmp_path, store_type):
+    def open_store():
+        if store_type == "sqlite":
+            return SQLiteCrawlStore(str(tmp_path / "graph.db"))
+        return EdgeListCrawlStore(str(tmp_path / "graph"))
+
+    # interrupted after 6 requests, then resumed
+    store = open_store()
+    crawler = GraphCrawler(GraphClient(GRAPH, fail_after=6), store, [1], concurrency=4)
+    crawler.run()
+    assert crawler.failed
+    store.close()
+
+    store = open_store()
+    client = GraphClient(GRAPH)
+    crawler = GraphCrawler(client, store, [1], concurrency=4)
+    assert crawler.queued
+    crawler.run()
+    assert crawler.failed == 0 and crawler.queued == 0
+    # every edge is found from both of its ends, and saved once
+    edges = list(store.edges())
+    assert len(edges) == len(GRAPH_EDGES) and set(edges) == GRAPH_EDGES
+    # the pages saved before the interruption are not requested again
+    fresh = GraphClient(GRAPH)
+    with SQLiteCrawlStore(str(tmp_path / "fresh.db")) as fresh_store:
+        GraphCrawler(fresh, fresh_store, [1]).run()
+    assert client.requests < fresh.requests
+    # a finished crawl has nothing left to do
+    requests = client.requests
+    assert GraphCrawler(client, store, [1]).run() == 0
+    assert client.requests == requests
+    store.close()
+
+
+def test_graph_crawler_depth(tmp_path):
+    with SQLiteCrawlStore(str(tmp_path / "graph.db")) as store:
+        crawler = GraphCrawler(
+            GraphClient(GRAPH), store, [1], max_depth=1, directions=["followers"]
+        )
+        assert crawler.run() == 6
+        assert set(store.edges()) == {e for e in GRAPH_EDGES if e[1] in (1, 2, 3)}
+        # fids 4, 5 and 6 have one empty page each
+        assert crawler.edges == 8 and crawler.pages == 3 + 1 + 1 + 3
+
+    with pytest.raises(ValueError):
+        GraphCrawler(GraphClient(GRAPH), store, directions=["likes"])
+    with pytest.raises(TypeError):
+        CrawlStore()  # type: ignore[abstract]